@@ -1,3 +1,5 @@
 from .etsy_api import EtsyAPI, ExpiredToken, BadRequest
+from .async_etsy_api import AsyncEtsyAPI
+from .client_pool import EtsyClientPool
 
-__all__ = ["EtsyAPI"]
+__all__ = ["EtsyAPI", "AsyncEtsyAPI", "EtsyClientPool"]
@@ -0,0 +1,333 @@
+import asyncio
+import sys
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+from etsyv3.etsy_api import ETSY_OAUTH_TOKEN_URL, EtsyAPI, Method
+from etsyv3.models import Request
+from etsyv3.models.file_request import FileRequest
+from etsyv3.models.listing_request import UpdateListingInventoryRequest
+from etsyv3.util.cache import ResponseCache
+from etsyv3.util.codec import JSON_CONTENT_TYPE
+from etsyv3.util.instrumentation import RequestTimer
+from etsyv3.util.inventory import InventoryDiff, diff_inventory
+from etsyv3.util.pagination import (
+    DEFAULT_CHUNK_CONCURRENCY,
+    MAX_PAGE_SIZE,
+    apaginate,
+    apaginate_parallel,
+    chunk_ids,
+    merge_pages,
+)
+from etsyv3.util.rate_limiter import RateLimiter
+from etsyv3.util.retry import RetryPolicy
+from etsyv3.util.token_store import TokenStore
+
+# event loop -> token store -> a lock that clients on that loop take turns
+# with before waiting for the store's own lock
+_STORE_LOCKS: MutableMapping[
+    asyncio.AbstractEventLoop, MutableMapping[TokenStore, asyncio.Lock]
+] = weakref.WeakKeyDictionary()
+
+
+def _store_lock(store: TokenStore) -> asyncio.Lock:
+    locks = _STORE_LOCKS.setdefault(
+        asyncio.get_running_loop(), weakref.WeakKeyDictionary()
+    )
+    lock = locks.get(store)
+    if lock is None:
+        lock = locks[store] = asyncio.Lock()
+    return lock
+
+
+class AsyncEtsyAPI(EtsyAPI):
+    # every endpoint method is inherited from EtsyAPI, so here they return
+    # coroutines from _issue_request and have to be awaited
+    session: "httpx.AsyncClient"  # type: ignore[assignment]
+    _async_refresh_lock: Optional[asyncio.Lock] = None
+    _background_refresh_task: Optional["asyncio.Future[None]"] = None
+
+    def _create_session(self) -> "httpx.AsyncClient":  # type: ignore[override]
+        if httpx is None:
+            raise ImportError(
+                "AsyncEtsyAPI requires httpx, install it with `pip install etsyv3[async]`"
+            )
+        return httpx.AsyncClient(timeout=None)
+
+    async def __aenter__(self) -> "AsyncEtsyAPI":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+
+    async def _issue_chunked_request(
+        self,
+        uri: str,
+        ids_key: str,
+        ids: Optional[List[int]],
+        concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+        **kwargs: Dict[str, Any],
+    ) -> Any:
+        chunks = chunk_ids(ids)
+        if len(chunks) == 1:
+            rkw: Dict[str, Any] = {ids_key: chunks[0], **kwargs}
+            return await self._issue_request(uri, **rkw)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def issue_chunk(chunk: Optional[str]) -> Any:
+            chunk_kw: Dict[str, Any] = {ids_key: chunk, **kwargs}
+            async with semaphore:
+                return await self._issue_request(uri, **chunk_kw)
+
+        pages = await asyncio.gather(*[issue_chunk(chunk) for chunk in chunks])
+        return merge_pages(list(pages))
+
+    async def update_listing_inventory_if_changed(  # type: ignore[override]
+        self,
+        listing_id: int,
+        listing_inventory: UpdateListingInventoryRequest,
+        current: Optional[Dict[str, Any]] = None,
+    ) -> InventoryDiff:
+        if current is None:
+            current = await self.get_listing_inventory(listing_id)
+        diff = diff_inventory(current, listing_inventory)
+        if diff.has_changes:
+            response = await self.update_listing_inventory(
+                listing_id, listing_inventory
+            )
+            diff = diff._replace(response=response)
+        return diff
+
+    def _paginate(
+        self,
+        fetch_page: Callable[[int, int], Awaitable[Any]],
+        limit: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> Any:
+        # the inherited iter_* methods become async iterators
+        if concurrency > 1:
+            return apaginate_parallel(fetch_page, limit, concurrency, ordered)
+        return apaginate(fetch_page, limit)
+
+    async def _send(  # type: ignore[override]
+        self,
+        uri: str,
+        method: Method,
+        request_payload: Optional[Request],
+        headers: Optional[Dict[str, str]] = None,
+        timer: Optional[RequestTimer] = None,
+    ) -> "httpx.Response":
+        await self.rate_limiter.acquire_async()
+        # httpx can say how long was spent connecting, but only if asked
+        kwargs: Dict[str, Any] = {}
+        if timer is not None:
+            timer.queued()
+            if timer.trace_connect:
+                kwargs["extensions"] = {"trace": timer.trace}
+        sent_bytes = 0
+        if method == Method.GET:
+            return_val = await self.session.get(uri, headers=headers, **kwargs)
+        elif method == Method.PUT and isinstance(request_payload, Request):
+            data = self._encode(request_payload)
+            sent_bytes = len(data)
+            return_val = await self.session.put(
+                uri, content=data, headers=JSON_CONTENT_TYPE, **kwargs
+            )
+        elif method == Method.POST and isinstance(request_payload, FileRequest):
+            body = request_payload.multipart()
+            sent_bytes = len(body)
+            return_val = await self.session.post(
+                uri, content=body.__aiter__(), headers=body.headers, **kwargs
+            )
+        elif method == Method.POST and isinstance(request_payload, Request):
+            data = self._encode(request_payload)
+            sent_bytes = len(data)
+            return_val = await self.session.post(
+                uri, content=data, headers=JSON_CONTENT_TYPE, **kwargs
+            )
+        elif method == Method.PATCH and isinstance(request_payload, Request):
+            data = self._encode(request_payload)
+            sent_bytes = len(data)
+            return_val = await self.session.patch(
+                uri, content=data, headers=JSON_CONTENT_TYPE, **kwargs
+            )
+        elif method == Method.DELETE:
+            return_val = await self.session.delete(uri, **kwargs)
+        else:
+            raise Exception()
+        if timer is not None:
+            timer.sent(sent_bytes, return_val)
+        self.rate_limiter.update_from_headers(return_val.headers)
+        return return_val
+
+    async def _issue_request(
+        self,
+        uri: str,
+        method: Method = Method.GET,
+        request_payload: Optional[Request] = None,
+        **kwargs: Dict[str, Any],
+    ) -> Any:
+        self._check_request(method, request_payload)
+        if method == Method.GET:
+            uri = EtsyAPI._generate_get_uri(uri, **kwargs)
+        cached = self._cache_lookup(uri, method)
+        if cached is not None and self.cache is not None:
+            if self.cache.is_fresh(cached):
+                return self._cached_response(uri, method, cached)
+            headers = self.cache.conditional_headers(cached)
+        else:
+            headers = None
+        started = self.retry_policy.clock()
+        attempt = 0
+        retry_delay = 0.0
+        timer = RequestTimer(trace_connect=bool(self.request_hooks))
+        while True:
+            timer.refreshed |= await self._ensure_token()
+            try:
+                return_val = await self._send(
+                    uri, method, request_payload, headers, timer
+                )
+            except (httpx.NetworkError, httpx.RemoteProtocolError):
+                timer.sent(0)
+                delay = self.retry_policy.next_delay(method.name, attempt, started)
+                if delay is None:
+                    self.retry_policy.stats.record(attempt, retry_delay)
+                    self._emit(timer, uri, method, None, attempt)
+                    raise
+            else:
+                delay = self.retry_policy.next_delay(
+                    method.name,
+                    attempt,
+                    started,
+                    return_val.status_code,
+                    return_val.headers.get("retry-after"),
+                )
+                if delay is None:
+                    self.retry_policy.stats.record(attempt, retry_delay)
+                    return self._finish_request(
+                        uri, method, return_val, cached, timer, attempt
+                    )
+            await asyncio.sleep(delay)
+            attempt += 1
+            retry_delay += delay
+
+    async def _ensure_token(self) -> bool:  # type: ignore[override]
+        expiry = self.expiry
+        now = datetime.now(expiry.tzinfo)
+        if now >= expiry:
+            await self._refresh_if_unchanged(expiry)
+            return True
+        if now >= expiry - self.refresh_margin:
+            if (
+                self._background_refresh_task is None
+                or self._background_refresh_task.done()
+            ):
+                self._background_refresh_task = asyncio.ensure_future(
+                    self._background_refresh_target(expiry)
+                )
+        return False
+
+    async def _refresh_if_unchanged(  # type: ignore[override]
+        self, seen_expiry: datetime
+    ) -> None:
+        async with self._get_async_refresh_lock():
+            if self.expiry != seen_expiry:
+                return
+            # loading and saving tokens still block, but they're quick and
+            # only happen while refreshing, about once an hour
+            async with self._async_token_store_lock():
+                if self._adopt_stored_token() and not self._needs_refresh():
+                    return
+                await self._refresh_locked()
+
+    async def _background_refresh_target(  # type: ignore[override]
+        self, seen_expiry: datetime
+    ) -> None:
+        try:
+            await self._refresh_if_unchanged(seen_expiry)
+        except Exception:
+            # the current token is still valid, and if refreshing keeps
+            # failing the refresh made once it has expired will raise
+            pass
+
+    def _get_async_refresh_lock(self) -> asyncio.Lock:
+        # created on first use so that it belongs to the running event loop
+        if self._async_refresh_lock is None:
+            self._async_refresh_lock = asyncio.Lock()
+        return self._async_refresh_lock
+
+    @asynccontextmanager
+    async def _async_token_store_lock(self) -> AsyncIterator[None]:
+        # the store's lock blocks until it's free, so it's waited for on
+        # another thread rather than on the event loop
+        if self.token_store is None:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        async with _store_lock(self.token_store):
+            lock = self.token_store.lock(self.token_store_key)
+            acquired = loop.run_in_executor(None, lock.__enter__)
+            try:
+                await asyncio.shield(acquired)
+            except asyncio.CancelledError:
+                # nothing will use the lock once it's been taken, so it's
+                # let go straight away
+                acquired.add_done_callback(
+                    lambda f: f.cancelled()
+                    or f.exception() is not None
+                    or lock.__exit__(None, None, None)
+                )
+                raise
+            try:
+                yield
+            except BaseException:
+                exc_info = sys.exc_info()
+                await loop.run_in_executor(None, lock.__exit__, *exc_info)
+                raise
+            await loop.run_in_executor(None, lock.__exit__, None, None, None)
+
+    async def refresh(self) -> Tuple[str, str, datetime]:  # type: ignore[override]
+        async with self._get_async_refresh_lock():
+            async with self._async_token_store_lock():
+                self._adopt_stored_token()
+                return await self._refresh_locked()
+
+    async def _refresh_locked(  # type: ignore[override]
+        self,
+    ) -> Tuple[str, str, datetime]:
+        request = self.session.build_request(
+            "POST", ETSY_OAUTH_TOKEN_URL, json=self._refresh_data()
+        )
+        # dropped from this request only, so that requests being sent
+        # meanwhile still carry the current token
+        del request.headers["Authorization"]
+        r = await self.session.send(request)
+        return self._apply_refresh(r.json())
@@ -0,0 +1,193 @@
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from etsyv3.etsy_api import EtsyAPI
+from etsyv3.util.cache import ResponseCache
+from etsyv3.util.instrumentation import RequestHook
+from etsyv3.util.rate_limiter import RateLimiter
+from etsyv3.util.retry import RetryPolicy
+from etsyv3.util.token_store import TokenStore
+
+DEFAULT_POOL_MAXSIZE = 32
+DEFAULT_MAX_CLIENTS = 256
+DEFAULT_KEEPALIVE_IDLE = 60
+
+Credentials = Tuple[str, str, datetime]
+
+
+def keepalive_socket_options(idle: int = DEFAULT_KEEPALIVE_IDLE) -> List[Any]:
+    # TCP keep-alive probes after `idle` seconds of quiet, so that pooled
+    # connections to Etsy aren't silently dropped by NAT or load balancers
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):  # pragma: no cover
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    def __init__(
+        self,
+        keepalive_idle: Optional[int] = DEFAULT_KEEPALIVE_IDLE,
+        **kwargs: Any,
+    ) -> None:
+        self.keepalive_idle = keepalive_idle
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self.keepalive_idle is not None:
+            kwargs["socket_options"] = keepalive_socket_options(self.keepalive_idle)
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _Tenant(NamedTuple):
+    client: EtsyAPI
+    last_used: float
+
+
+class EtsyClientPool:
+    def __init__(
+        self,
+        keystring: str,
+        shared_secret: str,
+        credentials: Optional[Callable[[str], Credentials]] = None,
+        refresh_save: Optional[Callable[[str, str, str, datetime], None]] = None,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        idle_timeout: Optional[float] = None,
+        pool_connections: int = 1,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keepalive_idle: Optional[int] = DEFAULT_KEEPALIVE_IDLE,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        token_store: Optional[TokenStore] = None,
+        cache_factory: Optional[Callable[[], ResponseCache]] = None,
+        request_hooks: Sequence[RequestHook] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # hands out one EtsyAPI per tenant (usually a shop), each with its own
+        # token and refresh state, but all sending through the same adapter
+        # and so the same connection pool. Rate limits belong to the app
+        # keystring rather than the shop, so the rate limiter is shared too.
+        # Tenants unused for idle_timeout seconds, or beyond max_clients, are
+        # dropped least recently used first, and recreated from
+        # credentials(tenant) the next time they're asked for
+        self.keystring = keystring
+        self.shared_secret = shared_secret
+        self.credentials = credentials
+        self.refresh_save = refresh_save
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.token_store = token_store
+        self.cache_factory = cache_factory
+        self.request_hooks = list(request_hooks)
+        self.clock = clock
+        self.adapter = KeepAliveAdapter(
+            keepalive_idle=keepalive_idle,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self._tenants: "OrderedDict[str, _Tenant]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, tenant: object) -> bool:
+        return tenant in self._tenants
+
+    def _create_client(
+        self, tenant: str, token: str, refresh_token: str, expiry: datetime
+    ) -> EtsyAPI:
+        refresh_save = None
+        if self.refresh_save is not None:
+            save = self.refresh_save
+
+            def refresh_save(t: str, r: str, e: datetime) -> None:
+                save(tenant, t, r, e)
+
+        client = EtsyAPI(
+            self.keystring,
+            self.shared_secret,
+            token,
+            refresh_token,
+            expiry,
+            refresh_save=refresh_save,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache_factory() if self.cache_factory is not None else None,
+            token_store=self.token_store,
+            request_hooks=self.request_hooks,
+        )
+        client.session.mount("https://", self.adapter)
+        client.session.mount("http://", self.adapter)
+        return client
+
+    def add(
+        self, tenant: str, token: str, refresh_token: str, expiry: datetime
+    ) -> EtsyAPI:
+        client = self._create_client(tenant, token, refresh_token, expiry)
+        with self._lock:
+            self._tenants[tenant] = _Tenant(client, self.clock())
+            self._tenants.move_to_end(tenant)
+            self._evict()
+        return client
+
+    def get(self, tenant: str) -> EtsyAPI:
+        with self._lock:
+            self._evict()
+            entry = self._tenants.get(tenant)
+            if entry is not None:
+                self._tenants[tenant] = entry._replace(last_used=self.clock())
+                self._tenants.move_to_end(tenant)
+                return entry.client
+        if self.credentials is None:
+            raise KeyError(tenant)
+        # another thread may have added the same tenant meanwhile, in which
+        # case theirs is kept so that there's only one refresh state
+        client = self._create_client(tenant, *self.credentials(tenant))
+        with self._lock:
+            entry = self._tenants.get(tenant)
+            if entry is not None:
+                client = entry.client
+            self._tenants[tenant] = _Tenant(client, self.clock())
+            self._tenants.move_to_end(tenant)
+            self._evict()
+        return client
+
+    def remove(self, tenant: str) -> None:
+        with self._lock:
+            self._tenants.pop(tenant, None)
+
+    def _evict(self) -> None:
+        # called with the lock held. The evicted clients' sessions aren't
+        # closed, as that would close the shared adapter
+        if self.idle_timeout is not None:
+            cutoff = self.clock() - self.idle_timeout
+            while self._tenants:
+                oldest = next(iter(self._tenants.values()))
+                if oldest.last_used > cutoff:
+                    break
+                self._tenants.popitem(last=False)
+        while len(self._tenants) > self.max_clients:
+            self._tenants.popitem(last=False)
+
+    def evict_idle(self) -> None:
+        with self._lock:
+            self._evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._tenants.clear()
+        self.adapter.close()
@@ -53,3 +53,11 @@ class ListingType(Enum):
     PHYSICAL = "physical"
     DOWNLOAD = "download"
     BOTH = "both"
+
+
+class ListingState(Enum):
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+    SOLD_OUT = "sold_out"
+    DRAFT = "draft"
+    EXPIRED = "expired"
@@ -1,10 +1,24 @@
 import enum
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import requests
 
+from etsyv3.enums import ListingState
 from etsyv3.models import Request, UpdateListingRequest
 from etsyv3.models.file_request import (
     FileRequest,
@@ -30,9 +44,26 @@ from etsyv3.models.shop_request import (
     UpdateShopRequest,
     UpdateShopSectionRequest,
 )
+from etsyv3.util.token_store import Token, TokenStore
+from etsyv3.util.cache import CacheEntry, ResponseCache
+from etsyv3.util.codec import JSON_CONTENT_TYPE, JSONCodec, get_codec
+from etsyv3.util.instrumentation import RequestHook, RequestTimer, emit
+from etsyv3.util.inventory import InventoryDiff, diff_inventory
+from etsyv3.util.pagination import (
+    DEFAULT_CHUNK_CONCURRENCY,
+    MAX_PAGE_SIZE,
+    chunk_ids,
+    merge_pages,
+    paginate,
+    paginate_parallel,
+)
+from etsyv3.util.rate_limiter import RateLimiter
+from etsyv3.util.retry import RetryPolicy
 
 # From spec at https://developers.etsy.com/documentation/essentials/urlsyntax
 ETSY_API_BASEURL = "https://api.etsy.com/v3/application"
+ETSY_OAUTH_TOKEN_URL = "https://api.etsy.com/v3/public/oauth/token"
+DEFAULT_REFRESH_MARGIN = timedelta(minutes=5)
 
 
 class ExpiredToken(Exception):
@@ -63,6 +94,14 @@ class Conflict(Exception):
     pass
 
 
+class TooManyRequests(Exception):
+    pass
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
 class SortOn(Enum):
     CREATED = "created"
     PRICE = "price"
@@ -88,14 +127,6 @@ class Includes(Enum):
     INVENTORY = "Inventory"
 
 
-class ListingState(Enum):
-    ACTIVE = "active"
-    INACTIVE = "inactive"
-    SOLD_OUT = "sold_out"
-    DRAFT = "draft"
-    EXPIRED = "expired"
-
-
 class Method(Enum):
     GET = enum.auto()
     POST = enum.auto()
@@ -113,8 +144,16 @@ class EtsyAPI:
         refresh_token: str,
         expiry: datetime,
         refresh_save: Optional[Callable[[str, str, datetime], None]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        refresh_margin: timedelta = DEFAULT_REFRESH_MARGIN,
+        token_store: Optional[TokenStore] = None,
+        token_store_key: Optional[str] = None,
+        codec: Optional[JSONCodec] = None,
+        request_hooks: Sequence[RequestHook] = (),
     ):
-        self.session = requests.Session()
+        self.session = self._create_session()
         self.token = token
         self.user_id = token.split(".")[0]
         self.refresh_token = refresh_token
@@ -126,6 +165,27 @@ class EtsyAPI:
         }
         self.expiry = expiry
         self.refresh_save = refresh_save
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        # tokens are renewed in the background once they're within
+        # refresh_margin of expiry, and only ever by one thread at a time
+        self.refresh_margin = refresh_margin
+        self._refresh_lock = threading.RLock()
+        self._background_refresh_lock = threading.Lock()
+        self._background_refresh: Optional[threading.Thread] = None
+        # shared with other processes using the same token, keyed by the
+        # token's user id unless told otherwise
+        self.token_store = token_store
+        self.token_store_key = (
+            token_store_key if token_store_key is not None else self.user_id
+        )
+        self.codec = codec if codec is not None else get_codec()
+        # called with a RequestEvent after every request that's sent
+        self.request_hooks = list(request_hooks)
+
+    def _create_session(self) -> requests.Session:
+        return requests.Session()
 
     @staticmethod
     def _generate_get_uri(uri: str, **kwargs: Dict[str, Any]) -> str:
@@ -137,6 +197,234 @@ class EtsyAPI:
         uri = f"{uri}?{params}" if params != "" else uri
         return uri
 
+    def _check_request(
+        self, method: Method, request_payload: Optional[Request]
+    ) -> None:
+        if (
+            method != Method.GET and method != Method.DELETE
+        ) and request_payload is None:
+            raise ValueError
+
+    def _token_valid(self) -> bool:
+        return datetime.now(self.expiry.tzinfo) < self.expiry
+
+    def _ensure_token(self) -> bool:
+        # returns whether the request had to wait for a refresh
+        expiry = self.expiry
+        now = datetime.now(expiry.tzinfo)
+        if now >= expiry:
+            self._refresh_if_unchanged(expiry)
+            return True
+        if now >= expiry - self.refresh_margin:
+            self._refresh_in_background(expiry)
+        return False
+
+    def _needs_refresh(self) -> bool:
+        return datetime.now(self.expiry.tzinfo) >= self.expiry - self.refresh_margin
+
+    def _refresh_if_unchanged(self, seen_expiry: datetime) -> None:
+        # whoever gets the lock first refreshes, everyone else waiting on it
+        # then finds the expiry has moved on and uses the new token
+        with self._refresh_lock:
+            if self.expiry != seen_expiry:
+                return
+            with self._token_store_lock():
+                if self._adopt_stored_token() and not self._needs_refresh():
+                    return
+                self._refresh_locked()
+
+    def _token_store_lock(self) -> ContextManager[None]:
+        if self.token_store is None:
+            return nullcontext()
+        return self.token_store.lock(self.token_store_key)
+
+    def _adopt_stored_token(self) -> bool:
+        # another process may already have refreshed the token, in which case
+        # the refresh token we hold has been used up and theirs is the one to
+        # have. Called with the token store lock held
+        if self.token_store is None:
+            return False
+        stored = self.token_store.load(self.token_store_key)
+        if stored is None:
+            return False
+        if self.expiry.tzinfo is None:
+            expiry = stored.expires_at.astimezone().replace(tzinfo=None)
+        else:
+            expiry = stored.expires_at.astimezone(self.expiry.tzinfo)
+        if expiry <= self.expiry:
+            return False
+        self._set_token(stored.access_token, stored.refresh_token, expiry)
+        return True
+
+    def _set_token(self, token: str, refresh_token: str, expiry: datetime) -> None:
+        self.token = token
+        self.refresh_token = refresh_token
+        self.expiry = expiry
+        self.session.headers["Authorization"] = "Bearer " + self.token
+
+    def _refresh_in_background(self, seen_expiry: datetime) -> None:
+        with self._background_refresh_lock:
+            if (
+                self._background_refresh is not None
+                and self._background_refresh.is_alive()
+            ):
+                return
+            self._background_refresh = threading.Thread(
+                target=self._background_refresh_target, args=(seen_expiry,)
+            )
+            self._background_refresh.daemon = True
+            self._background_refresh.start()
+
+    def _background_refresh_target(self, seen_expiry: datetime) -> None:
+        try:
+            self._refresh_if_unchanged(seen_expiry)
+        except Exception:
+            # the current token is still valid, and if refreshing keeps
+            # failing the refresh made once it has expired will raise
+            pass
+
+    @staticmethod
+    def _process_response(
+        status_code: int, json: Callable[[], Any], content: bytes = b""
+    ) -> Any:
+        def error_body() -> Any:
+            # Etsy's edge answers some errors with an HTML page or nothing at
+            # all, which mustn't stop the right exception being raised
+            try:
+                return json()
+            except ValueError:
+                return content.decode("utf-8", "replace") if content else {}
+
+        if status_code == 400:
+            raise BadRequest(json())
+        elif status_code == 401:
+            raise Unauthorised(json())
+        elif status_code == 403:
+            raise Forbidden(json())
+        elif status_code == 409:
+            raise Conflict(json())
+        elif status_code == 404:
+            raise NotFound(json())
+        elif status_code == 429:
+            raise TooManyRequests(error_body())
+        elif status_code == 500:
+            raise InternalError(error_body())
+        elif status_code in (502, 503, 504):
+            raise ServiceUnavailable(error_body())
+        elif status_code == 204:
+            return {"status": "OK"}
+        return json()
+
+    def _send(
+        self,
+        uri: str,
+        method: Method,
+        request_payload: Optional[Request],
+        headers: Optional[Dict[str, str]] = None,
+        timer: Optional[RequestTimer] = None,
+    ) -> requests.Response:
+        self.rate_limiter.acquire()
+        if timer is not None:
+            timer.queued()
+        sent_bytes = 0
+        if method == Method.GET:
+            return_val = self.session.get(uri, headers=headers)
+        elif method == Method.PUT and isinstance(request_payload, Request):
+            data = self._encode(request_payload)
+            sent_bytes = len(data)
+            return_val = self.session.put(uri, data=data, headers=JSON_CONTENT_TYPE)
+        elif method == Method.POST and isinstance(request_payload, FileRequest):
+            # streamed from the files as it's sent, rather than read into
+            # memory first
+            body = request_payload.multipart()
+            sent_bytes = len(body)
+            return_val = self.session.post(uri, data=body, headers=body.headers)
+        elif method == Method.POST and isinstance(request_payload, Request):
+            data = self._encode(request_payload)
+            sent_bytes = len(data)
+            return_val = self.session.post(uri, data=data, headers=JSON_CONTENT_TYPE)
+        elif method == Method.PATCH and isinstance(request_payload, Request):
+            data = self._encode(request_payload)
+            sent_bytes = len(data)
+            return_val = self.session.patch(uri, data=data, headers=JSON_CONTENT_TYPE)
+        elif method == Method.DELETE:
+            return_val = self.session.delete(uri)
+        else:
+            raise Exception()
+        if timer is not None:
+            timer.sent(sent_bytes, return_val)
+        self.rate_limiter.update_from_headers(return_val.headers)
+        return return_val
+
+    def _encode(self, request_payload: Request) -> bytes:
+        return self.codec.encode(request_payload.get_dict())
+
+    def _decode(self, content: bytes) -> Any:
+        return self.codec.decode(content)
+
+    def _cache_lookup(self, uri: str, method: Method) -> Optional[CacheEntry]:
+        if self.cache is None or method != Method.GET:
+            return None
+        return self.cache.get(uri)
+
+    def _handle_response(
+        self, uri: str, method: Method, return_val: Any, cached: Optional[CacheEntry]
+    ) -> Any:
+        if return_val.status_code == 304 and cached is not None:
+            if self.cache is not None:
+                self.cache.refresh(uri)
+            return self._decode(cached.content)
+        result = EtsyAPI._process_response(
+            return_val.status_code,
+            lambda: self._decode(return_val.content),
+            return_val.content,
+        )
+        if self.cache is not None:
+            if method == Method.GET and return_val.status_code == 200:
+                self.cache.store(uri, return_val.content, return_val.headers)
+            elif method != Method.GET and return_val.status_code < 400:
+                self.cache.invalidate_for_write(method.name, uri)
+        return result
+
+    def _emit(
+        self,
+        timer: RequestTimer,
+        uri: str,
+        method: Method,
+        status: Optional[int],
+        retries: int,
+    ) -> None:
+        if self.request_hooks:
+            emit(self.request_hooks, timer.event(method.name, uri, status, retries))
+
+    def _cached_response(self, uri: str, method: Method, cached: CacheEntry) -> Any:
+        # answered without sending anything, but still reported to the hooks
+        timer = RequestTimer()
+        timer.cached = True
+        try:
+            return self._decode(cached.content)
+        finally:
+            timer.decoded()
+            self._emit(timer, uri, method, 200, 0)
+
+    def _finish_request(
+        self,
+        uri: str,
+        method: Method,
+        return_val: Any,
+        cached: Optional[CacheEntry],
+        timer: RequestTimer,
+        retries: int,
+    ) -> Any:
+        # the event is emitted for error statuses too, once they've been
+        # decoded into the exception that's raised
+        timer.cached = return_val.status_code == 304 and cached is not None
+        try:
+            return self._handle_response(uri, method, return_val, cached)
+        finally:
+            timer.decoded()
+            self._emit(timer, uri, method, return_val.status_code, retries)
+
     def _issue_request(
         self,
         uri: str,
@@ -144,48 +432,79 @@ class EtsyAPI:
         request_payload: Optional[Request] = None,
         **kwargs: Dict[str, Any],
     ) -> Any:
-        if (
-            method != Method.GET and method != Method.DELETE
-        ) and request_payload is None:
-            raise ValueError
-        if datetime.now(self.expiry.tzinfo) < self.expiry:
-            if method == Method.GET:
-                uri_full = EtsyAPI._generate_get_uri(uri, **kwargs)
-                return_val = self.session.get(uri_full)
-            elif method == Method.PUT and isinstance(request_payload, Request):
-                return_val = self.session.put(uri, json=request_payload.get_dict())
-            elif method == Method.POST and isinstance(request_payload, FileRequest):
-                return_val = self.session.post(
-                    uri, files=request_payload.file, data=request_payload.data
-                )
-            elif method == Method.POST and isinstance(request_payload, Request):
-                return_val = self.session.post(uri, json=request_payload.get_dict())
-            elif method == Method.PATCH and isinstance(request_payload, Request):
-                return_val = self.session.patch(uri, json=request_payload.get_dict())
-            elif method == Method.DELETE:
-                return_val = self.session.delete(uri)
+        self._check_request(method, request_payload)
+        if method == Method.GET:
+            uri = EtsyAPI._generate_get_uri(uri, **kwargs)
+        cached = self._cache_lookup(uri, method)
+        if cached is not None and self.cache is not None:
+            if self.cache.is_fresh(cached):
+                return self._cached_response(uri, method, cached)
+            headers = self.cache.conditional_headers(cached)
+        else:
+            headers = None
+        started = self.retry_policy.clock()
+        attempt = 0
+        retry_delay = 0.0
+        timer = RequestTimer()
+        while True:
+            timer.refreshed |= self._ensure_token()
+            try:
+                return_val = self._send(uri, method, request_payload, headers, timer)
+            except requests.ConnectionError:
+                timer.sent(0)
+                delay = self.retry_policy.next_delay(method.name, attempt, started)
+                if delay is None:
+                    self.retry_policy.stats.record(attempt, retry_delay)
+                    self._emit(timer, uri, method, None, attempt)
+                    raise
             else:
-                raise Exception()
-            if return_val.status_code == 400:
-                raise BadRequest(return_val.json())
-            elif return_val.status_code == 401:
-                raise Unauthorised(return_val.json())
-            elif return_val.status_code == 403:
-                raise Forbidden(return_val.json())
-            elif return_val.status_code == 409:
-                raise Conflict(return_val.json())
-            elif return_val.status_code == 404:
-                raise NotFound(return_val.json())
-            elif return_val.status_code == 500:
-                raise InternalError(return_val.json())
-            elif return_val.status_code == 204:
-                return {"status": "OK"}
-            return return_val.json()
+                delay = self.retry_policy.next_delay(
+                    method.name,
+                    attempt,
+                    started,
+                    return_val.status_code,
+                    return_val.headers.get("retry-after"),
+                )
+                if delay is None:
+                    self.retry_policy.stats.record(attempt, retry_delay)
+                    return self._finish_request(
+                        uri, method, return_val, cached, timer, attempt
+                    )
+            time.sleep(delay)
+            attempt += 1
+            retry_delay += delay
+
+    def _issue_chunked_request(
+        self,
+        uri: str,
+        ids_key: str,
+        ids: Optional[List[int]],
+        concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+        **kwargs: Dict[str, Any],
+    ) -> Any:
+        # Etsy caps how many IDs a single call can take, so longer lists are
+        # split up, fetched concurrently and merged back into one response
+        chunks = chunk_ids(ids)
+        if len(chunks) == 1:
+            rkw: Dict[str, Any] = {ids_key: chunks[0], **kwargs}
+            return self._issue_request(uri, **rkw)
+        chunk_kws: List[Dict[str, Any]] = [{ids_key: c, **kwargs} for c in chunks]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pages = list(
+                executor.map(lambda ckw: self._issue_request(uri, **ckw), chunk_kws)
+            )
+        return merge_pages(pages)
 
-        else:
-            self.refresh()
-            rkw: Dict[str, Any] = kwargs
-            return self._issue_request(uri, method=method, request_payload=request_payload, **rkw)
+    def _paginate(
+        self,
+        fetch_page: Callable[[int, int], Any],
+        limit: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> Any:
+        if concurrency > 1:
+            return paginate_parallel(fetch_page, limit, concurrency, ordered)
+        return paginate(fetch_page, limit)
 
     def get_buyer_taxonomy_nodes(self) -> Any:
         uri = f"{ETSY_API_BASEURL}/buyer-taxonomy/nodes"
@@ -232,6 +551,32 @@ class EtsyAPI:
         }
         return self._issue_request(uri, **kwargs)
 
+    def iter_listings_by_shop(
+        self,
+        shop_id: int,
+        state: Optional[ListingState] = None,
+        sort_on: Optional[SortOn] = None,
+        sort_order: Optional[SortOrder] = None,
+        includes: Optional[List[Includes]] = None,
+        limit: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_listings_by_shop(
+                shop_id=shop_id,
+                state=state,
+                sort_on=sort_on,
+                sort_order=sort_order,
+                includes=includes,
+                limit=limit,
+                offset=offset,
+            ),
+            limit,
+            concurrency,
+            ordered,
+        )
+
     def delete_listing(self, listing_id: int) -> Any:
         uri = f"{ETSY_API_BASEURL}/listings/{listing_id}"
         return self._issue_request(uri, method=Method.DELETE)
@@ -272,6 +617,30 @@ class EtsyAPI:
         }
         return self._issue_request(uri, **kwargs)
 
+    def iter_all_listings_active(
+        self,
+        keywords: Optional[str] = None,
+        sort_on: Optional[SortOn] = None,
+        sort_order: Optional[SortOrder] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        shop_location: Optional[str] = None,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.find_all_listings_active(
+                keywords=keywords,
+                sort_on=sort_on,
+                sort_order=sort_order,
+                min_price=min_price,
+                max_price=max_price,
+                shop_location=shop_location,
+                limit=limit,
+                offset=offset,
+            ),
+            limit,
+        )
+
     def find_all_active_listings_by_shop(
         self,
         shop_id: int,
@@ -291,21 +660,41 @@ class EtsyAPI:
         }
         return self._issue_request(uri, **kwargs)
 
+    def iter_all_active_listings_by_shop(
+        self,
+        shop_id: int,
+        sort_on: Optional[SortOn] = None,
+        sort_order: Optional[SortOrder] = None,
+        keywords: Optional[str] = None,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.find_all_active_listings_by_shop(
+                shop_id=shop_id,
+                sort_on=sort_on,
+                sort_order=sort_order,
+                keywords=keywords,
+                limit=limit,
+                offset=offset,
+            ),
+            limit,
+        )
+
     def get_listings_by_listing_ids(
-        self, listing_ids: List[int], includes: Optional[List[Includes]] = None
+        self,
+        listing_ids: List[int],
+        includes: Optional[List[Includes]] = None,
+        concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
     ) -> Any:
         uri = f"{ETSY_API_BASEURL}/listings/batch"
         kwargs: Dict[str, Any] = {
-            "listing_ids": (
-                ",".join([str(x) for x in listing_ids])
-                if listing_ids is not None
-                else None
-            ),
             "includes": (
                 ",".join([x.value for x in includes]) if includes is not None else None
             ),
         }
-        return self._issue_request(uri, **kwargs)
+        return self._issue_chunked_request(
+            uri, "listing_ids", listing_ids, concurrency, **kwargs
+        )
 
     def get_featured_listings_by_shop(
         self, shop_id: int, limit: Optional[int] = None, offset: Optional[int] = None
@@ -314,6 +703,18 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
+    def iter_featured_listings_by_shop(
+        self,
+        shop_id: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_featured_listings_by_shop(
+                shop_id=shop_id, limit=limit, offset=offset
+            ),
+            limit,
+        )
+
     def delete_listing_property(
         self, shop_id: int, listing_id: int, property_id: int
     ) -> Any:
@@ -358,6 +759,19 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
+    def iter_listings_by_shop_receipt(
+        self,
+        shop_id: int,
+        receipt_id: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_listings_by_shop_receipt(
+                shop_id=shop_id, receipt_id=receipt_id, limit=limit, offset=offset
+            ),
+            limit,
+        )
+
     def get_listings_by_shop_section_id(
         self,
         shop_id: int,
@@ -381,6 +795,26 @@ class EtsyAPI:
         }
         return self._issue_request(uri, **kwargs)
 
+    def iter_listings_by_shop_section_id(
+        self,
+        shop_id: int,
+        shop_section_ids: List[int],
+        sort_on: Optional[SortOn] = None,
+        sort_order: Optional[SortOrder] = None,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_listings_by_shop_section_id(
+                shop_id=shop_id,
+                shop_section_ids=shop_section_ids,
+                sort_on=sort_on,
+                sort_order=sort_order,
+                limit=limit,
+                offset=offset,
+            ),
+            limit,
+        )
+
     def delete_listing_file(
         self, shop_id: int, listing_id: int, listing_file_id: int
     ) -> Any:
@@ -470,6 +904,23 @@ class EtsyAPI:
         uri = f"{ETSY_API_BASEURL}/listings/{listing_id}/inventory"
         return self._issue_request(uri, Method.PUT, listing_inventory)
 
+    def update_listing_inventory_if_changed(
+        self,
+        listing_id: int,
+        listing_inventory: UpdateListingInventoryRequest,
+        current: Optional[Dict[str, Any]] = None,
+    ) -> InventoryDiff:
+        # only PUTs the inventory if it differs from what the listing has.
+        # `current` saves fetching it, eg from listings got with the
+        # Inventory include
+        if current is None:
+            current = self.get_listing_inventory(listing_id)
+        diff = diff_inventory(current, listing_inventory)
+        if diff.has_changes:
+            response = self.update_listing_inventory(listing_id, listing_inventory)
+            diff = diff._replace(response=response)
+        return diff
+
     def get_listing_offering(
         self, listing_id: int, product_id: int, product_offering_id: int
     ) -> Any:
@@ -562,33 +1013,47 @@ class EtsyAPI:
         }
         return self._issue_request(uri, **kwargs)
 
+    def iter_shop_payment_account_ledger_entries(
+        self,
+        shop_id: int,
+        min_created: int,
+        max_created: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_shop_payment_account_ledger_entries(
+                shop_id=shop_id,
+                min_created=min_created,
+                max_created=max_created,
+                limit=limit,
+                offset=offset,
+            ),
+            limit,
+        )
+
     def get_payment_account_ledger_entry_payments(
-        self, shop_id: int, ledger_entry_ids: List[int]
+        self,
+        shop_id: int,
+        ledger_entry_ids: List[int],
+        concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
     ) -> Any:
         uri = f"{ETSY_API_BASEURL}/shops/{shop_id}/payment-account/ledger-entries/payments"
-        kwargs: Dict[str, Any] = {
-            "ledger_entry_ids": (
-                ",".join([str(x) for x in ledger_entry_ids])
-                if ledger_entry_ids is not None
-                else None
-            )
-        }
-        return self._issue_request(uri, **kwargs)
+        return self._issue_chunked_request(
+            uri, "ledger_entry_ids", ledger_entry_ids, concurrency
+        )
 
     def get_shop_payment_by_receipt_id(self, shop_id: int, receipt_id: int) -> Any:
         uri = f"{ETSY_API_BASEURL}/shops/{shop_id}/receipts/{receipt_id}/payments"
         return self._issue_request(uri)
 
-    def get_payments(self, shop_id: int, payment_ids: List[int]) -> Any:
+    def get_payments(
+        self,
+        shop_id: int,
+        payment_ids: List[int],
+        concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+    ) -> Any:
         uri = f"{ETSY_API_BASEURL}/shops/{shop_id}/payments"
-        kwargs: Dict[str, Any] = {
-            "payment_ids": (
-                ",".join([str(x) for x in payment_ids])
-                if payment_ids is not None
-                else None
-            )
-        }
-        return self._issue_request(uri, **kwargs)
+        return self._issue_chunked_request(uri, "payment_ids", payment_ids, concurrency)
 
     def get_shop_receipt(self, shop_id: int, receipt_id: int) -> Any:
         uri = f"{ETSY_API_BASEURL}/shops/{shop_id}/receipts/{receipt_id}"
@@ -610,8 +1075,8 @@ class EtsyAPI:
         shop_id: int,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
-        was_paid: bool = True,
-        was_shipped: bool = False,
+        was_paid: Optional[bool] = True,
+        was_shipped: Optional[bool] = False,
         was_canceled: Optional[bool] = None,
         min_created: Optional[int] = None,
         max_created: Optional[int] = None,
@@ -638,6 +1103,44 @@ class EtsyAPI:
         }
         return self._issue_request(uri, **kwargs)
 
+    def iter_shop_receipts(
+        self,
+        shop_id: int,
+        was_paid: Optional[bool] = True,
+        was_shipped: Optional[bool] = False,
+        was_canceled: Optional[bool] = None,
+        min_created: Optional[int] = None,
+        max_created: Optional[int] = None,
+        min_last_modified: Optional[int] = None,
+        max_last_modified: Optional[int] = None,
+        sort_on: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        was_delivered: Optional[bool] = None,
+        limit: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_shop_receipts(
+                shop_id=shop_id,
+                was_paid=was_paid,
+                was_shipped=was_shipped,
+                was_canceled=was_canceled,
+                min_created=min_created,
+                max_created=max_created,
+                min_last_modified=min_last_modified,
+                max_last_modified=max_last_modified,
+                sort_on=sort_on,
+                sort_order=sort_order,
+                was_delivered=was_delivered,
+                limit=limit,
+                offset=offset,
+            ),
+            limit,
+            concurrency,
+            ordered,
+        )
+
     def create_receipt_shipment(
         self,
         shop_id: int,
@@ -660,6 +1163,19 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
+    def iter_shop_receipt_transactions_by_listing(
+        self,
+        shop_id: int,
+        listing_id: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_shop_receipt_transactions_by_listing(
+                shop_id=shop_id, listing_id=listing_id, limit=limit, offset=offset
+            ),
+            limit,
+        )
+
     def get_shop_receipt_transactions_by_receipt(
         self, shop_id: int, receipt_id: int
     ) -> Any:
@@ -677,6 +1193,18 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
+    def iter_shop_receipt_transactions_by_shop(
+        self,
+        shop_id: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_shop_receipt_transactions_by_shop(
+                shop_id=shop_id, limit=limit, offset=offset
+            ),
+            limit,
+        )
+
     def get_reviews_by_listing(
         self, listing_id: int, limit: Optional[int] = None, offset: Optional[int] = None
     ) -> Any:
@@ -684,6 +1212,18 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
+    def iter_reviews_by_listing(
+        self,
+        listing_id: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_reviews_by_listing(
+                listing_id=listing_id, limit=limit, offset=offset
+            ),
+            limit,
+        )
+
     def get_reviews_by_shop(
         self, shop_id: int, limit: Optional[int] = None, offset: Optional[int] = None
     ) -> Any:
@@ -691,6 +1231,18 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
+    def iter_reviews_by_shop(
+        self,
+        shop_id: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_reviews_by_shop(
+                shop_id=shop_id, limit=limit, offset=offset
+            ),
+            limit,
+        )
+
     def get_shipping_carriers(self, origin_country_iso: str) -> Any:
         uri = f"{ETSY_API_BASEURL}/shipping-carriers"
         kwargs: Dict[str, Any] = {"origin_country_iso": origin_country_iso}
@@ -730,6 +1282,22 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
+    def iter_shop_shipping_profile_destinations_by_shipping_profile(
+        self,
+        shop_id: int,
+        shipping_profile_id: int,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_shop_shipping_profile_destinations_by_shipping_profile(
+                shop_id=shop_id,
+                shipping_profile_id=shipping_profile_id,
+                limit=limit,
+                offset=offset,
+            ),
+            limit,
+        )
+
     def delete_shop_shipping_profile_destination(
         self,
         shop_id: int,
@@ -787,6 +1355,18 @@ class EtsyAPI:
         }
         return self._issue_request(uri, **kwargs)
 
+    def iter_shops(
+        self,
+        shop_name: str,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.find_shops(
+                shop_name=shop_name, limit=limit, offset=offset
+            ),
+            limit,
+        )
+
     def get_shop_production_partners(self, shop_id: int) -> Any:
         uri = f"{ETSY_API_BASEURL}/shops/{shop_id}/production-partners"
         return self._issue_request(uri)
@@ -843,22 +1423,48 @@ class EtsyAPI:
         kwargs: Dict[str, Any] = {"limit": limit, "offset": offset}
         return self._issue_request(uri, **kwargs)
 
-    def refresh(self) -> Tuple[str, str, datetime]:
-        data = {
+    def iter_user_addresses(
+        self,
+        limit: int = MAX_PAGE_SIZE,
+    ) -> Any:
+        return self._paginate(
+            lambda limit, offset: self.get_user_addresses(limit=limit, offset=offset),
+            limit,
+        )
+
+    def _refresh_data(self) -> Dict[str, Any]:
+        return {
             "grant_type": "refresh_token",
             "client_id": self.keystring,
             "refresh_token": self.refresh_token,
         }
-        del self.session.headers["Authorization"]
-        r = self.session.post("https://api.etsy.com/v3/public/oauth/token", json=data)
-        refreshed = r.json()
-        self.token = refreshed["access_token"]
-        self.refresh_token = refreshed["refresh_token"]
+
+    def _apply_refresh(self, refreshed: Dict[str, Any]) -> Tuple[str, str, datetime]:
         tmp_expiry = datetime.now(self.expiry.tzinfo) + timedelta(
             seconds=refreshed["expires_in"]
         )
-        self.expiry = tmp_expiry
-        self.session.headers["Authorization"] = "Bearer " + self.token
+        self._set_token(
+            refreshed["access_token"], refreshed["refresh_token"], tmp_expiry
+        )
+        if self.token_store is not None:
+            self.token_store.save(
+                self.token_store_key,
+                Token(self.token, self.refresh_token, self.expiry),
+            )
         if self.refresh_save is not None:
             self.refresh_save(self.token, self.refresh_token, self.expiry)
         return self.token, self.refresh_token, self.expiry
+
+    def refresh(self) -> Tuple[str, str, datetime]:
+        with self._refresh_lock, self._token_store_lock():
+            self._adopt_stored_token()
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> Tuple[str, str, datetime]:
+        data = self._refresh_data()
+        # dropped from this request only, so that requests being sent
+        # meanwhile still carry the current token
+        r = self.session.post(
+            ETSY_OAUTH_TOKEN_URL, json=data, headers={"Authorization": None}
+        )
+        return self._apply_refresh(r.json())
@@ -1,11 +1,26 @@
-from .listing_inventory import ListingInventory
+from .ledger_entry import LedgerEntry
+from .listing import Listing, ListingImage
+from .listing_inventory import InventoryProduct, ListingInventory, Offering
 from .listing_property import ListingProperty
 from .listing_request import Request, UpdateListingRequest, UpdateVariationImagesRequest
+from .receipt import Receipt, ReceiptShipment, Transaction
+from .response import Money, ResponseView, ViewList
 
 __all__ = [
+    "InventoryProduct",
+    "LedgerEntry",
+    "Listing",
+    "ListingImage",
     "ListingInventory",
     "ListingProperty",
+    "Money",
+    "Offering",
+    "Receipt",
+    "ReceiptShipment",
     "Request",
+    "ResponseView",
+    "Transaction",
     "UpdateListingRequest",
     "UpdateVariationImagesRequest",
+    "ViewList",
 ]
@@ -1,9 +1,12 @@
 from typing import Any, Dict, List, Optional
 
 from etsyv3.models import Request
+from etsyv3.util.multipart import FileSource, MultipartStream
 
 
 class FileRequest(Request):
+    __slots__ = ("file", "data")
+
     def __init__(
         self,
         nullable: Optional[List[str]] = None,
@@ -13,8 +16,12 @@ class FileRequest(Request):
         self.data: Dict[str, Any] = self.data if self.data is not None else None
         super().__init__(nullable=nullable, mandatory=mandatory)
 
+    def multipart(self) -> MultipartStream:
+        return MultipartStream(self.data, self.file)
+
     @staticmethod
     def generate_bytes_from_file(file: str) -> bytes:
+        # not needed any more, as the file's path can be given instead
         with open(file, "rb") as f:
             f_bytes = f.read()
         return f_bytes
@@ -24,9 +31,11 @@ class UploadListingImageRequest(FileRequest):
     nullable: List[str] = ["file"]
     mandatory: List[str] = []
 
+    __slots__ = ()
+
     def __init__(
         self,
-        image_bytes: bytes,
+        image_bytes: FileSource,
         listing_image_id: Optional[int] = None,
         rank: Optional[int] = None,
         overwrite: Optional[bool] = None,
@@ -52,9 +61,11 @@ class UploadListingFileRequest(FileRequest):
     nullable: List[str] = ["file"]
     mandatory: List[str] = []
 
+    __slots__ = ()
+
     def __init__(
         self,
-        file_bytes: bytes,
+        file_bytes: FileSource,
         listing_file_id: Optional[int] = None,
         name: Optional[str] = None,
         rank: Optional[int] = None,
@@ -72,9 +83,11 @@ class UploadListingVideoRequest(FileRequest):
     nullable: List[str] = ["video"]
     mandatory: List[str] = []
 
+    __slots__ = ()
+
     def __init__(
         self,
-        video_bytes: bytes,
+        video_bytes: FileSource,
         listing_video_id: Optional[int] = None,
         name: Optional[str] = None,
     ) -> None:
@@ -0,0 +1,21 @@
+from etsyv3.models.response import Field, ResponseView, TimestampField
+
+
+class LedgerEntry(ResponseView):
+    # from get_shop_payment_account_ledger_entries. amount and balance are in
+    # the currency's smallest unit, eg pence
+    __slots__ = ()
+
+    entry_id = Field()
+    ledger_id = Field()
+    sequence_number = Field()
+    amount = Field()
+    currency = Field()
+    description = Field()
+    balance = Field()
+    create_date = TimestampField()
+    created_timestamp = TimestampField()
+    ledger_type = Field()
+    reference_type = Field()
+    reference_id = Field()
+    payment_adjustments = Field()
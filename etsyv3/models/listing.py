@@ -0,0 +1,110 @@
+from etsyv3.enums import (
+    ItemDimensionsUnit,
+    ItemWeightUnit,
+    ListingState,
+    ListingType,
+    WhenMade,
+    WhoMade,
+)
+from etsyv3.models.listing_inventory import ListingInventory
+from etsyv3.models.response import (
+    EnumField,
+    Field,
+    MoneyField,
+    ResponseView,
+    TimestampField,
+    ViewField,
+    ViewListField,
+)
+
+
+class ListingImage(ResponseView):
+    __slots__ = ()
+
+    listing_id = Field()
+    listing_image_id = Field()
+    hex_code = Field()
+    red = Field()
+    green = Field()
+    blue = Field()
+    hue = Field()
+    saturation = Field()
+    brightness = Field()
+    is_black_and_white = Field()
+    creation_tsz = TimestampField()
+    created_timestamp = TimestampField()
+    rank = Field()
+    url_75x75 = Field()
+    url_170x135 = Field()
+    url_570xN = Field()
+    url_fullxfull = Field()
+    full_height = Field()
+    full_width = Field()
+    alt_text = Field()
+
+
+class Listing(ResponseView):
+    # from get_listing and the other listing endpoints, wrapped as
+    # Listing(response) or Listing.from_results(response)
+    __slots__ = ()
+
+    listing_id = Field()
+    user_id = Field()
+    shop_id = Field()
+    title = Field()
+    description = Field()
+    state = EnumField(ListingState)
+    creation_timestamp = TimestampField()
+    created_timestamp = TimestampField()
+    ending_timestamp = TimestampField()
+    original_creation_timestamp = TimestampField()
+    last_modified_timestamp = TimestampField()
+    updated_timestamp = TimestampField()
+    state_timestamp = TimestampField()
+    quantity = Field()
+    shop_section_id = Field()
+    featured_rank = Field()
+    url = Field()
+    num_favorers = Field()
+    non_taxable = Field()
+    is_taxable = Field()
+    is_customizable = Field()
+    is_personalizable = Field()
+    personalization_is_required = Field()
+    personalization_char_count_max = Field()
+    personalization_instructions = Field()
+    listing_type = EnumField(ListingType)
+    tags = Field()
+    materials = Field()
+    shipping_profile_id = Field()
+    return_policy_id = Field()
+    processing_min = Field()
+    processing_max = Field()
+    who_made = EnumField(WhoMade)
+    when_made = EnumField(WhenMade)
+    is_supply = Field()
+    item_weight = Field()
+    item_weight_unit = EnumField(ItemWeightUnit)
+    item_length = Field()
+    item_width = Field()
+    item_height = Field()
+    item_dimensions_unit = EnumField(ItemDimensionsUnit)
+    is_private = Field()
+    style = Field()
+    file_data = Field()
+    has_variations = Field()
+    should_auto_renew = Field()
+    language = Field()
+    price = MoneyField()
+    taxonomy_id = Field()
+    skus = Field()
+    views = Field()
+    # only there when asked for with includes
+    shipping_profile = Field()
+    user = Field()
+    shop = Field()
+    images = ViewListField(ListingImage)
+    videos = Field()
+    inventory = ViewField(ListingInventory)
+    production_partners = Field()
+    translations = Field()
@@ -1,3 +1,38 @@
-class ListingInventory:
-    def __init__(self) -> None:
-        pass
+from etsyv3.models.listing_property import ListingProperty
+from etsyv3.models.response import (
+    Field,
+    MoneyField,
+    ResponseView,
+    ViewListField,
+)
+
+
+class Offering(ResponseView):
+    __slots__ = ()
+
+    offering_id = Field()
+    quantity = Field()
+    is_enabled = Field()
+    is_deleted = Field()
+    price = MoneyField()
+
+
+class InventoryProduct(ResponseView):
+    __slots__ = ()
+
+    product_id = Field()
+    sku = Field()
+    is_deleted = Field()
+    offerings = ViewListField(Offering)
+    property_values = ViewListField(ListingProperty)
+
+
+class ListingInventory(ResponseView):
+    # from get_listing_inventory, or a listing fetched with the Inventory
+    # include
+    __slots__ = ()
+
+    products = ViewListField(InventoryProduct)
+    price_on_property = Field()
+    quantity_on_property = Field()
+    sku_on_property = Field()
@@ -1,3 +1,14 @@
-class ListingProperty:
-    def __init__(self) -> None:
-        pass
+from etsyv3.models.response import Field, ResponseView
+
+
+class ListingProperty(ResponseView):
+    # one of a listing's property values, from get_listing_properties or an
+    # inventory product's property_values
+    __slots__ = ()
+
+    property_id = Field()
+    property_name = Field()
+    scale_id = Field()
+    scale_name = Field()
+    value_ids = Field()
+    values = Field()
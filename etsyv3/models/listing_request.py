@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from etsyv3.enums import (
     ItemDimensionsUnit,
@@ -12,40 +12,44 @@ from etsyv3.enums import (
     WhoMade,
 )
 from etsyv3.models.product import Product
-from etsyv3.util import todict
+from etsyv3.util.serializer import serializer_for
+from etsyv3.util.todict import attributes
 
 
 class Request:
+    # subclasses declare __slots__ for their fields, and pass their class-level
+    # nullable and mandatory lists in rather than copies, so that an instance
+    # is no bigger than its fields
+    __slots__ = ("_nullable", "_mandatory")
+
     def __init__(
         self,
-        nullable: Optional[List[str]] = None,
-        mandatory: Optional[List[str]] = None,
+        nullable: Optional[Sequence[str]] = None,
+        mandatory: Optional[Sequence[str]] = None,
     ):
-        self._nullable = nullable if nullable is not None else []
-        self._mandatory = mandatory if mandatory is not None else []
+        self._nullable = nullable if nullable is not None else ()
+        self._mandatory = mandatory if mandatory is not None else ()
         if not self.check_mandatory():
             raise ValueError
 
     def check_mandatory(self) -> bool:
         if self._mandatory is not None:
             for key in self._mandatory:
-                try:
-                    if self.__dict__[key] is None:
-                        return False
-                except Exception:
+                if getattr(self, key, None) is None:
                     return False
         return True
 
     def get_nulled(self) -> List[str]:
         return [
             key
-            for key, value in self.__dict__.items()
+            for key, value in attributes(self)
             if key in self._nullable and (value == [] or value == "" or value == 0)
         ]
 
     def get_dict(self) -> Any:
-        nulled = self.get_nulled()
-        return todict(self, nullable=nulled)
+        # the same as todict(self, nullable=self.get_nulled()), but compiled
+        # once per class
+        return serializer_for(type(self), self._nullable).serialize(self)
 
 
 class CreateDraftListingRequest(Request):
@@ -76,6 +80,40 @@ class CreateDraftListingRequest(Request):
         "taxonomy_id",
     ]
 
+    __slots__ = (
+        "quantity",
+        "title",
+        "description",
+        "price",
+        "who_made",
+        "when_made",
+        "taxonomy_id",
+        "shipping_profile_id",
+        "materials",
+        "shop_section_id",
+        "processing_min",
+        "processing_max",
+        "tags",
+        "styles",
+        "item_weight",
+        "item_length",
+        "item_width",
+        "item_height",
+        "item_weight_unit",
+        "item_dimensions_unit",
+        "is_personalizable",
+        "personalization_is_required",
+        "personalization_char_count_max",
+        "personalization_instructions",
+        "production_partner_ids",
+        "image_ids",
+        "is_supply",
+        "is_customizable",
+        "should_auto_renew",
+        "is_taxable",
+        "listing_type",
+    )
+
     def __init__(
         self,
         quantity: Optional[int] = None,
@@ -151,6 +189,8 @@ class CreateListingTranslationRequest(Request):
     nullable: List[str] = ["tags"]
     mandatory: List[str] = ["title", "description"]
 
+    __slots__ = ("title", "description", "tags")
+
     def __init__(
         self,
         title: Optional[str] = None,
@@ -185,6 +225,38 @@ class UpdateListingRequest(Request):
 
     mandatory: List[str] = []
 
+    __slots__ = (
+        "image_ids",
+        "title",
+        "description",
+        "materials",
+        "should_auto_renew",
+        "shipping_profile_id",
+        "processing_min",
+        "processing_max",
+        "shop_section_id",
+        "item_weight",
+        "item_length",
+        "item_width",
+        "item_height",
+        "item_weight_unit",
+        "item_dimensions_unit",
+        "is_taxable",
+        "taxonomy_id",
+        "tags",
+        "who_made",
+        "when_made",
+        "featured_rank",
+        "is_personalizable",
+        "personalization_is_required",
+        "personalization_char_count_max",
+        "personalization_instructions",
+        "state",
+        "is_supply",
+        "production_partner_ids",
+        "listing_type",
+    )
+
     def __init__(
         self,
         image_ids: Optional[List[str]] = None,
@@ -253,6 +325,13 @@ class UpdateListingInventoryRequest(Request):
     nullable: List[str] = []
     mandatory: List[str] = ["products"]
 
+    __slots__ = (
+        "products",
+        "price_on_property",
+        "quantity_on_property",
+        "sku_on_property",
+    )
+
     def __init__(
         self,
         products: List[Product],
@@ -273,23 +352,35 @@ class UpdateListingInventoryRequest(Request):
     def generate_request_from_inventory_response(
         response: Dict[str, Any],
     ) -> UpdateListingInventoryRequest:
+        # built from new dicts and lists, so that the response is left as it
+        # was and can be compared with the request once it's been changed, as
+        # update_listing_inventory_if_changed does
         products = []
         for product in response["products"]:
-            property_values = product["property_values"]
-            for prop_val in property_values:
-                prop_val.pop("scale_name", None)
-                prop_val.pop("value_pairs", None)
-            offerings = product["offerings"]
-            for offering in offerings:
-                offering.pop("is_deleted", None)
-                offering.pop("offering_id", None)
+            property_values = [
+                {
+                    key: list(value) if isinstance(value, list) else value
+                    for key, value in prop_val.items()
+                    if key not in ("scale_name", "value_pairs")
+                }
+                for prop_val in product["property_values"]
+            ]
+            offerings = []
+            for offering in product["offerings"]:
+                offering = {
+                    key: value
+                    for key, value in offering.items()
+                    if key not in ("is_deleted", "offering_id")
+                }
                 offering["price"] = (
                     offering["price"]["amount"] / offering["price"]["divisor"]
                 )
+                offerings.append(offering)
             products.append(Product(product["sku"], property_values, offerings))
-        price_on_property = response["price_on_property"]
-        quantity_on_property = response["quantity_on_property"]
-        sku_on_property = response["sku_on_property"]
+        price_on_property, quantity_on_property, sku_on_property = (
+            list(response[key]) if response[key] is not None else None
+            for key in ("price_on_property", "quantity_on_property", "sku_on_property")
+        )
         return UpdateListingInventoryRequest(
             products, price_on_property, quantity_on_property, sku_on_property
         )
@@ -299,6 +390,8 @@ class UpdateVariationImagesRequest(Request):
     nullable: List[str] = []
     mandatory: List[str] = []
 
+    __slots__ = ("variation_images",)
+
     def __init__(self, variation_images: List[Dict[str, Any]]) -> None:
         self.variation_images = variation_images
         super().__init__(
@@ -320,6 +413,8 @@ class UpdateListingImageIDRequest(Request):
     nullable: List[str] = []
     mandatory: List[str] = ["listing_image_id"]
 
+    __slots__ = ("listing_image_id", "rank", "overwrite", "is_watermarked", "alt_text")
+
     def __init__(
         self,
         listing_image_id: int,
@@ -349,6 +444,8 @@ class UpdateListingPropertyRequest(Request):
         "values",
     ]
 
+    __slots__ = ("value_ids", "values", "scale_id")
+
     def __init__(
         self,
         value_ids: Optional[List[int]] = None,
@@ -368,6 +465,8 @@ class UpdateListingTranslationRequest(Request):
     nullable: List[str] = ["tags"]
     mandatory: List[str] = ["title", "description"]
 
+    __slots__ = ("title", "description", "tags")
+
     def __init__(
         self,
         title: Optional[str] = None,
@@ -2,6 +2,8 @@ from typing import Any, Dict, List
 
 
 class Product:
+    __slots__ = ("sku", "property_values", "offerings")
+
     def __init__(
         self,
         sku: str,
@@ -0,0 +1,96 @@
+from etsyv3.models.response import (
+    Field,
+    MoneyField,
+    ResponseView,
+    TimestampField,
+    ViewListField,
+)
+
+
+class Transaction(ResponseView):
+    __slots__ = ()
+
+    transaction_id = Field()
+    title = Field()
+    description = Field()
+    seller_user_id = Field()
+    buyer_user_id = Field()
+    create_timestamp = TimestampField()
+    created_timestamp = TimestampField()
+    paid_timestamp = TimestampField()
+    shipped_timestamp = TimestampField()
+    quantity = Field()
+    listing_image_id = Field()
+    receipt_id = Field()
+    is_digital = Field()
+    file_data = Field()
+    listing_id = Field()
+    transaction_type = Field()
+    product_id = Field()
+    sku = Field()
+    price = MoneyField()
+    shipping_cost = MoneyField()
+    variations = Field()
+    product_data = Field()
+    shipping_profile_id = Field()
+    min_processing_days = Field()
+    max_processing_days = Field()
+    shipping_method = Field()
+    shipping_upgrade = Field()
+    expected_ship_date = TimestampField()
+    buyer_coupon = Field()
+    shop_coupon = Field()
+
+
+class ReceiptShipment(ResponseView):
+    __slots__ = ()
+
+    receipt_shipping_id = Field()
+    shipment_notification_timestamp = TimestampField()
+    carrier_name = Field()
+    tracking_code = Field()
+
+
+class Receipt(ResponseView):
+    # from get_shop_receipt or get_shop_receipts
+    __slots__ = ()
+
+    receipt_id = Field()
+    receipt_type = Field()
+    seller_user_id = Field()
+    seller_email = Field()
+    buyer_user_id = Field()
+    buyer_email = Field()
+    name = Field()
+    first_line = Field()
+    second_line = Field()
+    city = Field()
+    state = Field()
+    zip = Field()
+    status = Field()
+    formatted_address = Field()
+    country_iso = Field()
+    payment_method = Field()
+    payment_email = Field()
+    message_from_seller = Field()
+    message_from_buyer = Field()
+    message_from_payment = Field()
+    is_paid = Field()
+    is_shipped = Field()
+    create_timestamp = TimestampField()
+    created_timestamp = TimestampField()
+    update_timestamp = TimestampField()
+    updated_timestamp = TimestampField()
+    is_gift = Field()
+    gift_message = Field()
+    grandtotal = MoneyField()
+    subtotal = MoneyField()
+    total_price = MoneyField()
+    total_shipping_cost = MoneyField()
+    total_tax_cost = MoneyField()
+    total_vat_cost = MoneyField()
+    discount_amt = MoneyField()
+    gift_wrap_price = MoneyField()
+    shipments = ViewListField(ReceiptShipment)
+    transactions = ViewListField(Transaction)
+    refunds = Field()
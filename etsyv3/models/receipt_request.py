@@ -10,6 +10,14 @@ class CreateReceiptShipmentRequest(Request):
     ]
     mandatory: List[str] = []
 
+    __slots__ = (
+        "tracking_code",
+        "carrier_name",
+        "send_bcc",
+        "note_to_buyer",
+        "ship_date",
+    )
+
     def __init__(
         self,
         tracking_code: Optional[str] = None,
@@ -37,6 +45,8 @@ class UpdateShopReceiptRequest(Request):
     ]
     mandatory: List[str] = []
 
+    __slots__ = ("was_shipped", "was_paid")
+
     def __init__(
         self,
         was_shipped: Optional[bool] = None,
@@ -0,0 +1,177 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+V = TypeVar("V", bound="ResponseView")
+
+
+class ResponseView:
+    # a read-only view over one object from a decoded response. Nothing is
+    # converted until it's asked for, and anything that is converted (times,
+    # enums, money, nested objects) is kept so it's only converted once
+    __slots__ = ("_data", "_cache")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+        self._cache: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_results(cls: Type[V], response: Dict[str, Any]) -> "ViewList[V]":
+        # for the {"count": ..., "results": [...]} responses of list endpoints
+        return ViewList(cls, response["results"])
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ResponseView):
+            return NotImplemented
+        return type(self) is type(other) and self._data == other._data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+
+class ViewList(Sequence[V], Generic[V]):
+    # a list of dicts that hands each one out as a view the first time it's
+    # indexed, rather than wrapping them all up front
+    __slots__ = ("_view", "_items", "_views")
+
+    def __init__(self, view: Type[V], items: List[Dict[str, Any]]) -> None:
+        self._view = view
+        self._items = items
+        self._views: List[Optional[V]] = [None] * len(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> V: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[V]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[V, List[V]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        view = self._views[index]
+        if view is None:
+            view = self._views[index] = self._view(self._items[index])
+        return view
+
+    def __iter__(self) -> Iterator[V]:
+        for i in range(len(self._items)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"ViewList({self._view.__name__}, {len(self)} items)"
+
+
+class Field:
+    # a value from the response, as it is
+    def __init__(self, key: Optional[str] = None) -> None:
+        # key defaults to the attribute's own name
+        self.key = key if key is not None else ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if not self.key:
+            self.key = name
+
+    def __get__(self, obj: Optional[ResponseView], owner: type) -> Any:
+        if obj is None:
+            return self
+        return obj._data.get(self.key)
+
+
+class ConvertedField(Field):
+    # a value from the response, converted the first time it's read
+    def __init__(
+        self, convert: Callable[[Any], Any], key: Optional[str] = None
+    ) -> None:
+        super().__init__(key)
+        self.convert = convert
+
+    def __get__(self, obj: Optional[ResponseView], owner: type) -> Any:
+        if obj is None:
+            return self
+        cache = obj._cache
+        if cache is None:
+            cache = obj._cache = {}
+        elif self.key in cache:
+            return cache[self.key]
+        raw = obj._data.get(self.key)
+        value = self.convert(raw) if raw is not None else None
+        cache[self.key] = value
+        return value
+
+
+def _to_datetime(timestamp: Any) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+class TimestampField(ConvertedField):
+    # Etsy's epoch seconds, as a timezone-aware UTC datetime
+    def __init__(self, key: Optional[str] = None) -> None:
+        super().__init__(_to_datetime, key)
+
+
+class EnumField(ConvertedField):
+    # values the enum doesn't know about (yet) are left as they are
+    def __init__(self, enum: Type[Enum], key: Optional[str] = None) -> None:
+        def convert(value: Any) -> Any:
+            try:
+                return enum(value)
+            except ValueError:
+                return value
+
+        super().__init__(convert, key)
+
+
+class Money(ResponseView):
+    __slots__ = ()
+
+    amount = Field()
+    divisor = Field()
+    currency_code = Field()
+
+    @property
+    def value(self) -> Decimal:
+        return Decimal(self.amount) / Decimal(self.divisor)
+
+
+class MoneyField(ConvertedField):
+    def __init__(self, key: Optional[str] = None) -> None:
+        super().__init__(Money, key)
+
+
+class ViewField(ConvertedField):
+    def __init__(self, view: Type[ResponseView], key: Optional[str] = None) -> None:
+        super().__init__(view, key)
+
+
+class ViewListField(ConvertedField):
+    def __init__(self, view: Type[ResponseView], key: Optional[str] = None) -> None:
+        super().__init__(lambda items: ViewList(view, items), key)
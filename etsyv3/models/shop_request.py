@@ -7,6 +7,8 @@ class CreateShopSectionRequest(Request):
     nullable: List[str] = []
     mandatory: List[str] = ["title"]
 
+    __slots__ = ("title",)
+
     def __init__(self, title: str):
         self.title = title
 
@@ -20,6 +22,8 @@ class UpdateShopSectionRequest(Request):
     nullable: List[str] = []
     mandatory: List[str] = ["title"]
 
+    __slots__ = ("title",)
+
     def __init__(self, title: str):
         self.title = title
 
@@ -33,6 +37,14 @@ class UpdateShopRequest(Request):
     nullable: List[str] = []
     mandatory: List[str] = []
 
+    __slots__ = (
+        "title",
+        "announcement",
+        "sale_message",
+        "digital_sale_message",
+        "policy_additional",
+    )
+
     def __init__(
         self,
         title: Optional[str] = None,
@@ -0,0 +1,10 @@
+from .mock_etsy import MockEtsy, MockEtsyResponse
+from .transports import MockEtsyAdapter, MockEtsyServer, install
+
+__all__ = [
+    "MockEtsy",
+    "MockEtsyAdapter",
+    "MockEtsyResponse",
+    "MockEtsyServer",
+    "install",
+]
@@ -0,0 +1,793 @@
+import email.parser
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import parse_qsl, urlsplit
+
+from etsyv3.util.routes import ETSY_API_PATH, route_template
+
+ETSY_OAUTH_TOKEN_PATH = "/v3/public/oauth/token"
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class MockEtsyResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    # seconds to wait before answering, left to whatever is serving the
+    # response so that an event loop can wait without blocking
+    delay: float = 0.0
+
+
+class _Error(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+Handler = Callable[..., Tuple[int, Any]]
+_ROUTES: Dict[Tuple[str, str], Handler] = {}
+
+
+def _route(method: str, template: str) -> Callable[[Handler], Handler]:
+    def register(handler: Handler) -> Handler:
+        _ROUTES[(method, template)] = handler
+        return handler
+
+    return register
+
+
+def _money(price: Any, currency_code: str) -> Dict[str, Any]:
+    if isinstance(price, dict):
+        return price
+    return {
+        "amount": round(float(price) * 100),
+        "divisor": 100,
+        "currency_code": currency_code,
+    }
+
+
+def _flag(value: Optional[str]) -> Optional[bool]:
+    if value is None:
+        return None
+    return value.lower() in ("true", "1")
+
+
+def _page(items: List[Any], query: Dict[str, str]) -> Dict[str, Any]:
+    limit = min(int(query.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    offset = int(query.get("offset", 0))
+    return {"count": len(items), "results": items[offset : offset + limit]}
+
+
+def _parse_body(headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+    # JSON, a form, or multipart/form-data, whose files come back as bytes
+    if not body:
+        return {}
+    content_type = headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        fields: Dict[str, Any] = {}
+        parts: List[Any] = message.get_payload()  # type: ignore[assignment]
+        for part in parts:
+            name = str(part.get_param("name", header="content-disposition"))
+            payload = part.get_payload(decode=True)
+            if part.get_param("filename", header="content-disposition") is None:
+                payload = payload.decode("utf-8")
+            fields[name] = payload
+        return fields
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return dict(parse_qsl(body.decode("utf-8")))
+    return dict(json.loads(body))
+
+
+class MockEtsy:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        per_second: Optional[float] = None,
+        per_day: Optional[int] = None,
+        retry_after: int = 1,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        currency_code: str = "USD",
+    ) -> None:
+        # a stand-in for the parts of the Etsy API that EtsyAPI calls, that
+        # keeps shops, listings, inventories, images, receipts and ledger
+        # entries in memory. Every response is delayed by `latency` plus up
+        # to `jitter` seconds; `error_rate` of them are a 503 and
+        # `throttle_rate` a 429. With per_second or per_day set, requests
+        # over the quota are refused with a 429 and every response carries
+        # Etsy's x-limit-* and x-remaining-* headers. 429s carry a
+        # Retry-After of `retry_after` seconds
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.per_second = per_second
+        self.per_day = per_day
+        self.retry_after = retry_after
+        self.clock = clock
+        self.currency_code = currency_code
+        self.calls: Counter[Tuple[str, str]] = Counter()
+        self.revoked: Set[str] = set()
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1000)
+        self._value_ids: Dict[Tuple[int, str], int] = {}
+        self._this_second: Deque[float] = deque()
+        self._today = 0
+        self.shops: Dict[int, Dict[str, Any]] = {}
+        self.listings: Dict[int, Dict[str, Any]] = {}
+        self.inventories: Dict[int, Dict[str, Any]] = {}
+        self.images: Dict[int, List[Dict[str, Any]]] = {}
+        self.files: Dict[int, List[Dict[str, Any]]] = {}
+        self.videos: Dict[int, List[Dict[str, Any]]] = {}
+        self.receipts: Dict[int, Dict[str, Any]] = {}
+        self.ledger_entries: Dict[int, List[Dict[str, Any]]] = {}
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    def _now(self) -> int:
+        return int(self.clock())
+
+    # state, for setting up a test
+
+    def add_shop(self, shop_id: Optional[int] = None, **fields: Any) -> Dict[str, Any]:
+        with self._lock:
+            shop_id = shop_id if shop_id is not None else self._next_id()
+            shop = {
+                "shop_id": shop_id,
+                "shop_name": f"shop{shop_id}",
+                "user_id": shop_id,
+                "currency_code": self.currency_code,
+                **fields,
+            }
+            self.shops[shop_id] = shop
+            self.ledger_entries.setdefault(shop_id, [])
+            return shop
+
+    def add_listing(
+        self,
+        shop_id: int,
+        sku: str = "",
+        quantity: int = 1,
+        price: Any = 10.0,
+        **fields: Any,
+    ) -> Dict[str, Any]:
+        # with an inventory of one product
+        with self._lock:
+            self._shop(shop_id)
+            now = self._now()
+            listing_id = fields.pop("listing_id", None) or self._next_id()
+            listing = {
+                "listing_id": listing_id,
+                "user_id": self.shops[shop_id]["user_id"],
+                "shop_id": shop_id,
+                "title": f"Listing {listing_id}",
+                "description": "",
+                "state": "active",
+                "quantity": quantity,
+                "price": _money(price, self.currency_code),
+                "skus": [sku] if sku else [],
+                "creation_timestamp": now,
+                "created_timestamp": now,
+                "last_modified_timestamp": now,
+                "updated_timestamp": now,
+                **fields,
+            }
+            self.listings[listing_id] = listing
+            self.images[listing_id] = []
+            self.files[listing_id] = []
+            self.videos[listing_id] = []
+            offering = {"price": price, "quantity": quantity, "is_enabled": True}
+            self._set_inventory(
+                listing_id,
+                {
+                    "products": [
+                        {"sku": sku, "property_values": [], "offerings": [offering]}
+                    ]
+                },
+            )
+            return listing
+
+    def add_receipt(self, shop_id: int, **fields: Any) -> Dict[str, Any]:
+        with self._lock:
+            self._shop(shop_id)
+            now = self._now()
+            created = fields.pop("created_timestamp", now)
+            updated = fields.pop("updated_timestamp", created)
+            receipt_id = fields.pop("receipt_id", None) or self._next_id()
+            receipt = {
+                "receipt_id": receipt_id,
+                "seller_user_id": self.shops[shop_id]["user_id"],
+                "status": "paid",
+                "was_paid": True,
+                "was_shipped": False,
+                "was_canceled": False,
+                "create_timestamp": created,
+                "created_timestamp": created,
+                "update_timestamp": updated,
+                "updated_timestamp": updated,
+                "grandtotal": _money(
+                    fields.pop("grandtotal", 10.0), self.currency_code
+                ),
+                "transactions": [],
+                "shipments": [],
+                **fields,
+                "shop_id": shop_id,
+            }
+            self.receipts[receipt_id] = receipt
+            return receipt
+
+    def add_ledger_entry(
+        self, shop_id: int, amount: int, **fields: Any
+    ) -> Dict[str, Any]:
+        with self._lock:
+            self._shop(shop_id)
+            entries = self.ledger_entries[shop_id]
+            created = fields.pop("created_timestamp", self._now())
+            balance = (entries[-1]["balance"] if entries else 0) + amount
+            entry = {
+                "entry_id": fields.pop("entry_id", None) or self._next_id(),
+                "ledger_id": shop_id,
+                "sequence_number": len(entries) + 1,
+                "amount": amount,
+                "currency": self.currency_code,
+                "description": "",
+                "balance": balance,
+                "create_date": created,
+                "created_timestamp": created,
+                "ledger_type": "",
+                "reference_type": "",
+                "reference_id": "",
+                "payment_adjustments": [],
+                **fields,
+            }
+            entries.append(entry)
+            return entry
+
+    # serving requests
+
+    def handle(
+        self, method: str, url: str, headers: Dict[str, str], body: bytes = b""
+    ) -> MockEtsyResponse:
+        headers = {k.lower(): v for k, v in headers.items()}
+        parts = urlsplit(url)
+        template = route_template(url)
+        with self._lock:
+            self.calls[(method, template)] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            quota_headers, over_quota = self._count_request()
+            roll = self._random.random()
+        if over_quota or roll < self.throttle_rate:
+            return self._respond(
+                429,
+                {"error": "Rate limit exceeded"},
+                delay,
+                {**quota_headers, "retry-after": str(self.retry_after)},
+            )
+        if roll < self.throttle_rate + self.error_rate:
+            return self._respond(
+                503, {"error": "Service unavailable"}, delay, quota_headers
+            )
+        try:
+            if parts.path == ETSY_OAUTH_TOKEN_PATH and method == "POST":
+                status, result = self._refresh(_parse_body(headers, body))
+            else:
+                handler = _ROUTES.get((method, template))
+                if handler is None or not parts.path.startswith(ETSY_API_PATH):
+                    raise _Error(404, f"No route for {method} {parts.path}")
+                self._authorise(headers)
+                ids = [int(s) for s in parts.path.split("/") if s.isdigit()]
+                query = dict(parse_qsl(parts.query))
+                with self._lock:
+                    status, result = handler(
+                        self, *ids, query=query, body=_parse_body(headers, body)
+                    )
+        except _Error as e:
+            status, result = e.status, {"error": e.message}
+        return self._respond(status, result, delay, quota_headers)
+
+    def _respond(
+        self, status: int, result: Any, delay: float, headers: Dict[str, str]
+    ) -> MockEtsyResponse:
+        body = b"" if status == 204 else json.dumps(result).encode("utf-8")
+        headers = {"content-type": "application/json", **headers}
+        return MockEtsyResponse(status, headers, body, delay)
+
+    def _count_request(self) -> Tuple[Dict[str, str], bool]:
+        if self.per_second is None and self.per_day is None:
+            return {}, False
+        now = self.clock()
+        while self._this_second and self._this_second[0] <= now - 1:
+            self._this_second.popleft()
+        per_second = self.per_second if self.per_second is not None else float("inf")
+        per_day = self.per_day if self.per_day is not None else float("inf")
+        over = len(self._this_second) >= per_second or self._today >= per_day
+        if not over:
+            self._this_second.append(now)
+            self._today += 1
+        headers = {}
+        if self.per_second is not None:
+            headers["x-limit-per-second"] = str(self.per_second)
+            headers["x-remaining-this-second"] = str(
+                max(int(per_second) - len(self._this_second), 0)
+            )
+        if self.per_day is not None:
+            headers["x-limit-per-day"] = str(self.per_day)
+            headers["x-remaining-today"] = str(max(int(per_day) - self._today, 0))
+        return headers, over
+
+    def _authorise(self, headers: Dict[str, str]) -> None:
+        authorization = headers.get("authorization", "")
+        token = (
+            authorization[len("Bearer ") :]
+            if authorization.startswith("Bearer ")
+            else ""
+        )
+        if not token or token in self.revoked:
+            raise _Error(401, "invalid_token")
+
+    def _refresh(self, data: Dict[str, Any]) -> Tuple[int, Any]:
+        if data.get("grant_type") != "refresh_token" or not data.get("refresh_token"):
+            raise _Error(400, "invalid_grant")
+        user_id = str(data["refresh_token"]).split(".")[0]
+        with self._lock:
+            suffix = self._next_id()
+        return 200, {
+            "access_token": f"{user_id}.access{suffix}",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "refresh_token": f"{user_id}.refresh{suffix}",
+        }
+
+    # lookups
+
+    def _shop(self, shop_id: int) -> Dict[str, Any]:
+        shop = self.shops.get(shop_id)
+        if shop is None:
+            raise _Error(404, f"Shop {shop_id} not found")
+        return shop
+
+    def _listing(
+        self, listing_id: int, shop_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        listing = self.listings.get(listing_id)
+        if listing is None or (shop_id is not None and listing["shop_id"] != shop_id):
+            raise _Error(404, f"Listing {listing_id} not found")
+        return listing
+
+    def _with_includes(
+        self, listing: Dict[str, Any], query: Dict[str, str]
+    ) -> Dict[str, Any]:
+        includes = query.get("includes", "").split(",")
+        listing = dict(listing)
+        if "Inventory" in includes:
+            listing["inventory"] = self.inventories[listing["listing_id"]]
+        if "Images" in includes:
+            listing["images"] = self.images[listing["listing_id"]]
+        if "Shop" in includes:
+            listing["shop"] = self.shops[listing["shop_id"]]
+        return listing
+
+    def _touch(self, listing: Dict[str, Any]) -> None:
+        now = self._now()
+        listing["last_modified_timestamp"] = listing["updated_timestamp"] = now
+
+    def _value_id(self, property_id: int, value: str) -> int:
+        key = (property_id, value)
+        if key not in self._value_ids:
+            self._value_ids[key] = self._next_id()
+        return self._value_ids[key]
+
+    def _set_inventory(self, listing_id: int, inventory: Dict[str, Any]) -> None:
+        # as Etsy does, every product and offering gets a new ID
+        listing = self.listings[listing_id]
+        products: List[Dict[str, Any]] = []
+        for product in inventory["products"]:
+            property_values = []
+            for prop in product.get("property_values") or []:
+                values = prop.get("values") or [
+                    str(v) for v in prop.get("value_ids", [])
+                ]
+                value_ids = prop.get("value_ids") or [
+                    self._value_id(prop["property_id"], value) for value in values
+                ]
+                property_values.append(
+                    {
+                        "property_id": prop["property_id"],
+                        "property_name": prop.get("property_name"),
+                        "scale_id": prop.get("scale_id"),
+                        "scale_name": None,
+                        "value_ids": value_ids,
+                        "values": values,
+                    }
+                )
+            offerings = [
+                {
+                    "offering_id": self._next_id(),
+                    "quantity": offering.get("quantity", 0),
+                    "is_enabled": offering.get("is_enabled", True),
+                    "is_deleted": False,
+                    "price": _money(offering["price"], self.currency_code),
+                }
+                for offering in product.get("offerings") or []
+            ]
+            products.append(
+                {
+                    "product_id": self._next_id(),
+                    "sku": product.get("sku") or "",
+                    "is_deleted": False,
+                    "offerings": offerings,
+                    "property_values": property_values,
+                }
+            )
+        self.inventories[listing_id] = {
+            "products": products,
+            "price_on_property": inventory.get("price_on_property") or [],
+            "quantity_on_property": inventory.get("quantity_on_property") or [],
+            "sku_on_property": inventory.get("sku_on_property") or [],
+        }
+        listing["quantity"] = sum(
+            o["quantity"] for p in products for o in p["offerings"] if o["is_enabled"]
+        )
+        listing["skus"] = [p["sku"] for p in products if p["sku"]]
+        self._touch(listing)
+
+    def _add_media(
+        self,
+        kind: Dict[int, List[Dict[str, Any]]],
+        id_field: str,
+        listing_id: int,
+        fields: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        media = {
+            id_field: self._next_id(),
+            "listing_id": listing_id,
+            "created_timestamp": self._now(),
+            **fields,
+        }
+        kind[listing_id].append(media)
+        self._touch(self.listings[listing_id])
+        return media
+
+
+# the routes, by method and the template route_template() gives their URIs.
+# Each is called with the IDs in the path, then the query and the parsed body
+
+
+@_route("GET", "/openapi-ping")
+def _ping(etsy: MockEtsy, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    return 200, {"application_id": 1}
+
+
+@_route("GET", "/users/me")
+def _get_me(etsy: MockEtsy, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    shop = next(iter(etsy.shops.values()), None)
+    if shop is None:
+        return 200, {"user_id": 1, "shop_id": None}
+    return 200, {"user_id": shop["user_id"], "shop_id": shop["shop_id"]}
+
+
+@_route("GET", "/shops/{shop_id}")
+def _get_shop(
+    etsy: MockEtsy, shop_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    return 200, etsy._shop(shop_id)
+
+
+@_route("GET", "/shops/{shop_id}/listings")
+def _get_listings_by_shop(
+    etsy: MockEtsy, shop_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._shop(shop_id)
+    state = query.get("state", "active")
+    listings = [
+        l
+        for l in etsy.listings.values()
+        if l["shop_id"] == shop_id and l["state"] == state
+    ]
+    sort_on = {"created": "created_timestamp", "updated": "updated_timestamp"}.get(
+        query.get("sort_on", "created"), "created_timestamp"
+    )
+    listings.sort(
+        key=lambda l: (l[sort_on], l["listing_id"]),
+        reverse=query.get("sort_order", "desc") == "desc",
+    )
+    page = _page(listings, query)
+    page["results"] = [etsy._with_includes(l, query) for l in page["results"]]
+    return 200, page
+
+
+@_route("POST", "/shops/{shop_id}/listings")
+def _create_draft_listing(
+    etsy: MockEtsy, shop_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    for field in ("quantity", "title", "price", "who_made", "when_made", "taxonomy_id"):
+        if field not in body:
+            raise _Error(400, f"{field} is required")
+    body = dict(body)
+    listing = etsy.add_listing(
+        shop_id,
+        quantity=body.pop("quantity"),
+        price=body.pop("price"),
+        state="draft",
+        **body,
+    )
+    return 201, listing
+
+
+@_route("GET", "/listings/{listing_id}")
+def _get_listing(
+    etsy: MockEtsy, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    return 200, etsy._with_includes(etsy._listing(listing_id), query)
+
+
+@_route("GET", "/listings/batch")
+def _get_listings_by_listing_ids(
+    etsy: MockEtsy, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    ids = [int(i) for i in query.get("listing_ids", "").split(",") if i]
+    if len(ids) > MAX_PAGE_SIZE:
+        raise _Error(400, "listing_ids has more than 100 IDs")
+    results = [
+        etsy._with_includes(etsy.listings[i], query) for i in ids if i in etsy.listings
+    ]
+    return 200, {"count": len(results), "results": results}
+
+
+@_route("PATCH", "/shops/{shop_id}/listings/{listing_id}")
+def _update_listing(
+    etsy: MockEtsy, shop_id: int, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    listing = etsy._listing(listing_id, shop_id)
+    listing.update({k: v for k, v in body.items() if k != "listing_id"})
+    etsy._touch(listing)
+    return 200, listing
+
+
+@_route("DELETE", "/listings/{listing_id}")
+def _delete_listing(
+    etsy: MockEtsy, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id)
+    del etsy.listings[listing_id]
+    del etsy.inventories[listing_id]
+    for media in (etsy.images, etsy.files, etsy.videos):
+        media.pop(listing_id, None)
+    return 204, None
+
+
+@_route("GET", "/listings/{listing_id}/inventory")
+def _get_listing_inventory(
+    etsy: MockEtsy, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id)
+    return 200, etsy.inventories[listing_id]
+
+
+@_route("PUT", "/listings/{listing_id}/inventory")
+def _update_listing_inventory(
+    etsy: MockEtsy, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id)
+    if not body.get("products"):
+        raise _Error(400, "products is required")
+    for product in body["products"]:
+        for offering in product.get("offerings", []):
+            if "price" not in offering:
+                raise _Error(400, "every offering needs a price")
+    etsy._set_inventory(listing_id, body)
+    return 200, etsy.inventories[listing_id]
+
+
+@_route("GET", "/listings/{listing_id}/images")
+def _get_listing_images(
+    etsy: MockEtsy, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id)
+    images = etsy.images[listing_id]
+    return 200, {"count": len(images), "results": images}
+
+
+@_route("GET", "/listings/{listing_id}/images/{image_id}")
+def _get_listing_image(
+    etsy: MockEtsy, listing_id: int, image_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id)
+    for image in etsy.images[listing_id]:
+        if image["listing_image_id"] == image_id:
+            return 200, image
+    raise _Error(404, f"Image {image_id} not found")
+
+
+@_route("POST", "/shops/{shop_id}/listings/{listing_id}/images")
+def _upload_listing_image(
+    etsy: MockEtsy, shop_id: int, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    # a new image, or one already on another listing by listing_image_id
+    etsy._listing(listing_id, shop_id)
+    if "image" in body:
+        size = len(body["image"])
+    elif body.get("listing_image_id"):
+        existing = int(body["listing_image_id"])
+        found = [
+            i
+            for images in etsy.images.values()
+            for i in images
+            if i["listing_image_id"] == existing
+        ]
+        if not found:
+            raise _Error(404, f"Image {existing} not found")
+        size = found[0]["full_size"]
+    else:
+        raise _Error(400, "image or listing_image_id is required")
+    images = etsy.images[listing_id]
+    rank = int(body.get("rank") or len(images) + 1)
+    image = etsy._add_media(
+        etsy.images,
+        "listing_image_id",
+        listing_id,
+        {"rank": rank, "alt_text": body.get("alt_text"), "full_size": size},
+    )
+    return 201, image
+
+
+@_route("DELETE", "/shops/{shop_id}/listings/{listing_id}/images/{image_id}")
+def _delete_listing_image(
+    etsy: MockEtsy,
+    shop_id: int,
+    listing_id: int,
+    image_id: int,
+    query: Dict[str, str],
+    body: Any,
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id, shop_id)
+    etsy.images[listing_id] = [
+        i for i in etsy.images[listing_id] if i["listing_image_id"] != image_id
+    ]
+    return 204, None
+
+
+@_route("GET", "/shops/{shop_id}/listings/{listing_id}/files")
+def _get_listing_files(
+    etsy: MockEtsy, shop_id: int, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id, shop_id)
+    files = etsy.files[listing_id]
+    return 200, {"count": len(files), "results": files}
+
+
+@_route("POST", "/shops/{shop_id}/listings/{listing_id}/files")
+def _upload_listing_file(
+    etsy: MockEtsy, shop_id: int, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id, shop_id)
+    if "file" not in body:
+        raise _Error(400, "file is required")
+    fields = {
+        "filename": body.get("name"),
+        "filesize": len(body["file"]),
+        "rank": body.get("rank"),
+    }
+    return 201, etsy._add_media(etsy.files, "listing_file_id", listing_id, fields)
+
+
+@_route("GET", "/listings/{listing_id}/videos")
+def _get_listing_videos(
+    etsy: MockEtsy, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id)
+    videos = etsy.videos[listing_id]
+    return 200, {"count": len(videos), "results": videos}
+
+
+@_route("POST", "/shops/{shop_id}/listings/{listing_id}/videos")
+def _upload_listing_video(
+    etsy: MockEtsy, shop_id: int, listing_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._listing(listing_id, shop_id)
+    if "video" not in body:
+        raise _Error(400, "video is required")
+    fields = {
+        "video_state": "active",
+        "name": body.get("name"),
+        "size": len(body["video"]),
+    }
+    return 201, etsy._add_media(etsy.videos, "video_id", listing_id, fields)
+
+
+_RECEIPT_SORTS = {
+    "created": "created_timestamp",
+    "updated": "updated_timestamp",
+    "receipt_id": "receipt_id",
+}
+
+
+@_route("GET", "/shops/{shop_id}/receipts")
+def _get_shop_receipts(
+    etsy: MockEtsy, shop_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._shop(shop_id)
+    receipts = [r for r in etsy.receipts.values() if r["shop_id"] == shop_id]
+    for param, field, keep in (
+        ("min_created", "created_timestamp", lambda v, q: v >= q),
+        ("max_created", "created_timestamp", lambda v, q: v <= q),
+        ("min_last_modified", "updated_timestamp", lambda v, q: v >= q),
+        ("max_last_modified", "updated_timestamp", lambda v, q: v <= q),
+    ):
+        if param in query:
+            bound = int(query[param])
+            receipts = [r for r in receipts if keep(r[field], bound)]
+    for param in ("was_paid", "was_shipped", "was_canceled"):
+        flag = _flag(query.get(param))
+        if flag is not None:
+            receipts = [r for r in receipts if r[param] == flag]
+    sort_on = _RECEIPT_SORTS.get(query.get("sort_on", "created"), "created_timestamp")
+    receipts.sort(
+        key=lambda r: (r[sort_on], r["receipt_id"]),
+        reverse=query.get("sort_order", "desc") == "desc",
+    )
+    return 200, _page(receipts, query)
+
+
+@_route("GET", "/shops/{shop_id}/receipts/{receipt_id}")
+def _get_shop_receipt(
+    etsy: MockEtsy, shop_id: int, receipt_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    receipt = etsy.receipts.get(receipt_id)
+    if receipt is None or receipt["shop_id"] != shop_id:
+        raise _Error(404, f"Receipt {receipt_id} not found")
+    return 200, receipt
+
+
+@_route("PUT", "/shops/{shop_id}/receipts/{receipt_id}")
+def _update_shop_receipt(
+    etsy: MockEtsy, shop_id: int, receipt_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    _, receipt = _get_shop_receipt(etsy, shop_id, receipt_id, query, body)
+    for field in ("was_shipped", "was_paid"):
+        if field in body:
+            receipt[field] = bool(body[field])
+    receipt["update_timestamp"] = receipt["updated_timestamp"] = etsy._now()
+    return 200, receipt
+
+
+@_route("GET", "/shops/{shop_id}/payment-account/ledger-entries")
+def _get_ledger_entries(
+    etsy: MockEtsy, shop_id: int, query: Dict[str, str], body: Any
+) -> Tuple[int, Any]:
+    etsy._shop(shop_id)
+    if "min_created" not in query or "max_created" not in query:
+        raise _Error(400, "min_created and max_created are required")
+    low, high = int(query["min_created"]), int(query["max_created"])
+    entries = [
+        e
+        for e in reversed(etsy.ledger_entries[shop_id])
+        if low <= e["created_timestamp"] <= high
+    ]
+    return 200, _page(entries, query)
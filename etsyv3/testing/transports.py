@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Set, Type
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+from etsyv3.etsy_api import EtsyAPI
+from etsyv3.testing.mock_etsy import MockEtsy, MockEtsyResponse
+
+ETSY_ORIGIN = "https://api.etsy.com"
+
+
+def _body(body: Any) -> bytes:
+    # requests sends a MultipartStream body as an iterable of chunks
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    return b"".join(body)
+
+
+def _requests_response(
+    request: requests.PreparedRequest, response: MockEtsyResponse
+) -> requests.Response:
+    r = requests.Response()
+    r.status_code = response.status
+    r.headers = CaseInsensitiveDict(response.headers)
+    r._content = response.body
+    r.url = request.url or ""
+    r.request = request
+    r.encoding = "utf-8"
+    return r
+
+
+class MockEtsyAdapter(BaseAdapter):
+    def __init__(self, etsy: MockEtsy) -> None:
+        # answers requests to api.etsy.com from a MockEtsy in the same
+        # process, without a socket
+        super().__init__()
+        self.etsy = etsy
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        response = self.etsy.handle(
+            request.method or "GET",
+            request.url or "",
+            dict(request.headers),
+            _body(request.body),
+        )
+        if response.delay:
+            time.sleep(response.delay)
+        return _requests_response(request, response)
+
+    def close(self) -> None:
+        pass
+
+
+if httpx is not None:
+
+    class MockEtsyTransport(httpx.AsyncBaseTransport):
+        def __init__(self, etsy: MockEtsy) -> None:
+            # the same, for AsyncEtsyAPI; latency is waited for without
+            # blocking the event loop
+            self.etsy = etsy
+
+        async def handle_async_request(
+            self, request: "httpx.Request"
+        ) -> "httpx.Response":
+            body = await request.aread()
+            response = self.etsy.handle(
+                request.method, str(request.url), dict(request.headers), body
+            )
+            if response.delay:
+                await asyncio.sleep(response.delay)
+            return httpx.Response(
+                response.status, headers=response.headers, content=response.body
+            )
+
+    class _LoopbackTransport(httpx.AsyncHTTPTransport):
+        def __init__(self, url: str) -> None:
+            super().__init__()
+            self.url = httpx.URL(url)
+
+        async def handle_async_request(
+            self, request: "httpx.Request"
+        ) -> "httpx.Response":
+            request.url = request.url.copy_with(
+                scheme=self.url.scheme, host=self.url.host, port=self.url.port
+            )
+            return await super().handle_async_request(request)
+
+
+class _LoopbackAdapter(HTTPAdapter):
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        self.url = url
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        request.url = self.url + (request.url or "")[len(ETSY_ORIGIN) :]
+        return super().send(request, **kwargs)
+
+
+def _install(api: EtsyAPI, adapter: BaseAdapter, transport: Optional[Any]) -> None:
+    if isinstance(api.session, requests.Session):
+        api.session.mount(ETSY_ORIGIN + "/", adapter)
+        return
+    # an AsyncEtsyAPI's httpx client can't have a transport mounted once it's
+    # been made, so it's swapped for one with the mock's
+    old = api.session
+    api.session = httpx.AsyncClient(timeout=None, transport=transport)
+    api.session.headers = old.headers
+    _close(old)
+
+
+# replaced clients being closed in the background, held until they're done
+_closing: Set["asyncio.Task[None]"] = set()
+
+
+def _close(client: "httpx.AsyncClient") -> None:
+    # closed rather than dropped, so that its connection pool isn't leaked
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(client.aclose())
+        return
+    task = loop.create_task(client.aclose())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def install(api: EtsyAPI, etsy: MockEtsy) -> None:
+    # points an EtsyAPI or AsyncEtsyAPI at `etsy` in the same process
+    transport = MockEtsyTransport(etsy) if httpx is not None else None
+    _install(api, MockEtsyAdapter(etsy), transport)
+
+
+def _handler(etsy: MockEtsy) -> Type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            response = etsy.handle(
+                self.command, ETSY_ORIGIN + self.path, dict(self.headers), body
+            )
+            if response.delay:
+                time.sleep(response.delay)
+            self.send_response(response.status)
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(response.body)))
+            self.end_headers()
+            self.wfile.write(response.body)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+class MockEtsyServer:
+    def __init__(self, etsy: Optional[MockEtsy] = None, port: int = 0) -> None:
+        # serves a MockEtsy over HTTP on the loopback interface, so that
+        # requests go through real sockets and connection pools
+        self.etsy = etsy if etsy is not None else MockEtsy()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _handler(self.etsy))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "MockEtsyServer":
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockEtsyServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def install(self, api: EtsyAPI) -> None:
+        # points an EtsyAPI or AsyncEtsyAPI's requests to api.etsy.com here
+        transport = _LoopbackTransport(self.url) if httpx is not None else None
+        _install(api, _LoopbackAdapter(self.url), transport)
@@ -1,3 +1,18 @@
+from .instrumentation import LoggingHook, PrometheusHook, RequestEvent
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
 from .todict import todict
+from .token_store import FileTokenStore, SQLiteTokenStore, Token, TokenStore
 
-__all__ = ["todict"]
+__all__ = [
+    "FileTokenStore",
+    "LoggingHook",
+    "PrometheusHook",
+    "RateLimiter",
+    "RequestEvent",
+    "RetryPolicy",
+    "SQLiteTokenStore",
+    "Token",
+    "TokenStore",
+    "todict",
+]
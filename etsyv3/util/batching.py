@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from etsyv3.async_etsy_api import AsyncEtsyAPI
+from etsyv3.etsy_api import EtsyAPI, Includes, NotFound
+from etsyv3.util.pagination import MAX_IDS_PER_REQUEST
+
+MAX_BATCH_SIZE = MAX_IDS_PER_REQUEST
+
+BatchKey = Tuple[Includes, ...]
+
+
+def _batch_key(includes: Optional[List[Includes]]) -> BatchKey:
+    return tuple(includes) if includes is not None else ()
+
+
+def _by_listing_id(response: Any) -> Dict[int, Any]:
+    return {listing["listing_id"]: listing for listing in response["results"]}
+
+
+def _not_found(listing_id: int) -> NotFound:
+    return NotFound({"error": f"Listing {listing_id} not found"})
+
+
+class ListingLoader:
+    def __init__(
+        self, api: EtsyAPI, window: float = 0.01, max_batch_size: int = MAX_BATCH_SIZE
+    ) -> None:
+        # get_listing calls made from any thread within `window` seconds of
+        # each other are sent as one get_listings_by_listing_ids call
+        self.api = api
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending: Dict[BatchKey, Dict[int, List[Future[Any]]]] = {}
+        self._timers: Dict[BatchKey, threading.Timer] = {}
+
+    def load(
+        self, listing_id: int, includes: Optional[List[Includes]] = None
+    ) -> Future[Any]:
+        key = _batch_key(includes)
+        future: Future[Any] = Future()
+        with self._lock:
+            batch = self._pending.setdefault(key, {})
+            batch.setdefault(listing_id, []).append(future)
+            if len(batch) >= self.max_batch_size:
+                ready = self._take(key)
+            else:
+                ready = None
+                if key not in self._timers:
+                    timer = threading.Timer(self.window, self._flush, (key,))
+                    timer.daemon = True
+                    self._timers[key] = timer
+                    timer.start()
+        if ready is not None:
+            threading.Thread(target=self._dispatch, args=(key, ready)).start()
+        return future
+
+    def get_listing(
+        self, listing_id: int, includes: Optional[List[Includes]] = None
+    ) -> Any:
+        return self.load(listing_id, includes).result()
+
+    def _take(self, key: BatchKey) -> Dict[int, List[Future[Any]]]:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        return self._pending.pop(key, {})
+
+    def _flush(self, key: BatchKey) -> None:
+        with self._lock:
+            waiting = self._take(key)
+        if waiting:
+            self._dispatch(key, waiting)
+
+    def _dispatch(self, key: BatchKey, waiting: Dict[int, List[Future[Any]]]) -> None:
+        # futures cancelled by their callers are dropped, and the rest can't
+        # be cancelled from here on, so setting their results can't fail
+        live: Dict[int, List[Future[Any]]] = {}
+        for listing_id, futures in waiting.items():
+            futures = [f for f in futures if f.set_running_or_notify_cancel()]
+            if futures:
+                live[listing_id] = futures
+        waiting = live
+        if not waiting:
+            return
+        try:
+            response = self.api.get_listings_by_listing_ids(
+                list(waiting), list(key) if key else None
+            )
+        except Exception as e:
+            for futures in waiting.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+        found = _by_listing_id(response)
+        for listing_id, futures in waiting.items():
+            for future in futures:
+                if listing_id in found:
+                    future.set_result(found[listing_id])
+                else:
+                    future.set_exception(_not_found(listing_id))
+
+
+class AsyncListingLoader:
+    def __init__(
+        self,
+        api: AsyncEtsyAPI,
+        window: float = 0.01,
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ) -> None:
+        # the asyncio equivalent of ListingLoader, for use with AsyncEtsyAPI
+        self.api = api
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[BatchKey, Dict[int, List[asyncio.Future[Any]]]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        # the event loop only keeps weak references to tasks, so dispatches
+        # are held here until they finish
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    async def get_listing(
+        self, listing_id: int, includes: Optional[List[Includes]] = None
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        key = _batch_key(includes)
+        future: asyncio.Future[Any] = loop.create_future()
+        batch = self._pending.setdefault(key, {})
+        batch.setdefault(listing_id, []).append(future)
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: BatchKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        waiting = self._pending.pop(key, {})
+        if waiting:
+            task = asyncio.ensure_future(self._dispatch(key, waiting))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(
+        self, key: BatchKey, waiting: Dict[int, List[asyncio.Future[Any]]]
+    ) -> None:
+        try:
+            response = await self.api.get_listings_by_listing_ids(
+                list(waiting), list(key) if key else None
+            )
+        except Exception as e:
+            for futures in waiting.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        found = _by_listing_id(response)
+        for listing_id, futures in waiting.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if listing_id in found:
+                    future.set_result(found[listing_id])
+                else:
+                    future.set_exception(_not_found(listing_id))
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from etsyv3.util.routes import route_template
+
+ONE_HOUR = 3600
+ONE_DAY = 86400
+
+# endpoints whose responses rarely change, keyed by route template
+DEFAULT_TTLS: Dict[str, float] = {
+    "/buyer-taxonomy/nodes": ONE_DAY,
+    "/buyer-taxonomy/nodes/{node_id}/properties": ONE_DAY,
+    "/seller-taxonomy/nodes": ONE_DAY,
+    "/seller-taxonomy/nodes/{node_id}/properties": ONE_DAY,
+    "/shipping-carriers": ONE_DAY,
+    "/shops/{shop_id}/sections": ONE_HOUR,
+}
+
+
+class CacheEntry(NamedTuple):
+    content: bytes
+    expires: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # only GETs against a route template in `ttls` are cached, unless a
+        # default_ttl is given, in which case every GET is
+        self.ttls = dict(ttls) if ttls is not None else dict(DEFAULT_TTLS)
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidation_hooks: List[Callable[[str, str], Iterable[str]]] = []
+
+    def ttl_for(self, uri: str) -> Optional[float]:
+        return self.ttls.get(route_template(uri), self.default_ttl)
+
+    def get(self, uri: str) -> Optional[CacheEntry]:
+        # returns the entry for uri, fresh or not, so that a stale one can
+        # still be revalidated
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is not None:
+                self._entries.move_to_end(uri)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self.clock() < entry.expires
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        headers = {}
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, uri: str, content: bytes, headers: Mapping[str, str]) -> None:
+        ttl = self.ttl_for(uri)
+        if ttl is None:
+            return
+        entry = CacheEntry(
+            content,
+            self.clock() + ttl,
+            headers.get("etag"),
+            headers.get("last-modified"),
+        )
+        with self._lock:
+            self._entries[uri] = entry
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def refresh(self, uri: str) -> Optional[CacheEntry]:
+        # the server said our copy is still good (a 304), so it gets a new TTL
+        ttl = self.ttl_for(uri)
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is None or ttl is None:
+                return entry
+            entry = entry._replace(expires=self.clock() + ttl)
+            self._entries[uri] = entry
+            return entry
+
+    def invalidate(self, uri: str, descendants: bool = True) -> None:
+        # drops uri, whatever query string it was cached with, and (unless
+        # descendants is False) anything beneath it
+        base = uri.split("?", 1)[0]
+        with self._lock:
+            for key in list(self._entries):
+                key_base = key.split("?", 1)[0]
+                if key_base == base or (
+                    descendants and key_base.startswith(base + "/")
+                ):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def add_invalidation_hook(self, hook: Callable[[str, str], Iterable[str]]) -> None:
+        # hook(method, uri) is called after every successful write and returns
+        # any further URIs that write makes stale
+        self._invalidation_hooks.append(hook)
+
+    def invalidate_for_write(self, method: str, uri: str) -> None:
+        # a write makes the resource itself and the collection it's in stale,
+        # eg updating /shops/1/sections/2 invalidates /shops/1/sections
+        base = uri.split("?", 1)[0]
+        self.invalidate(base)
+        self.invalidate(base.rsplit("/", 1)[0], descendants=False)
+        for hook in self._invalidation_hooks:
+            for stale in hook(method, uri):
+                self.invalidate(stale)
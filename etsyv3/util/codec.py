@@ -0,0 +1,54 @@
+import json
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ujson  # type: ignore[import]
+except ImportError:  # pragma: no cover
+    ujson = None  # type: ignore[assignment]
+
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+
+class JSONCodec(NamedTuple):
+    name: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib_encode(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+STDLIB_CODEC = JSONCodec("json", _stdlib_encode, json.loads)
+
+_CODECS: Dict[str, JSONCodec] = {"json": STDLIB_CODEC}
+
+if ujson is not None:
+
+    def _ujson_encode(obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _CODECS["ujson"] = JSONCodec("ujson", _ujson_encode, ujson.loads)
+
+if orjson is not None:
+    # orjson goes straight from bytes to objects and back without a str in
+    # between, which is why it's preferred
+    _CODECS["orjson"] = JSONCodec("orjson", orjson.dumps, orjson.loads)
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    # the named codec, or the fastest one installed: orjson, then ujson, then
+    # the standard library
+    if name is not None:
+        if name not in _CODECS:
+            raise ValueError(f"JSON codec {name!r} isn't available")
+        return _CODECS[name]
+    for preferred in ("orjson", "ujson", "json"):
+        if preferred in _CODECS:
+            return _CODECS[preferred]
+    return STDLIB_CODEC  # pragma: no cover
@@ -0,0 +1,233 @@
+import logging
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None  # type: ignore[assignment]
+
+from etsyv3.util.routes import route_template
+
+logger = logging.getLogger(__name__)
+
+# how long each phase of a request took, for the Prometheus histogram
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class RequestEvent(NamedTuple):
+    method: str
+    # the endpoint, eg /listings/{listing_id}/inventory, rather than the URL
+    route: str
+    # None if the last attempt couldn't connect
+    status: Optional[int]
+    # waiting for the rate limiter, a token refresh and between retries
+    queue_time: float
+    # None where the transport can't tell, in which case connecting is part
+    # of server_time
+    connect_time: Optional[float]
+    # from sending the request to having read the whole response, over every
+    # attempt
+    server_time: float
+    decode_time: float
+    request_bytes: int
+    response_bytes: int
+    retries: int
+    refreshed: bool
+    # answered from the response cache: either fresh, in which case nothing
+    # was sent and every time but decode_time is 0, or revalidated with a 304
+    cached: bool = False
+
+    @property
+    def duration(self) -> float:
+        return (
+            self.queue_time
+            + (self.connect_time or 0.0)
+            + self.server_time
+            + self.decode_time
+        )
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+class RequestTimer:
+    def __init__(self, trace_connect: bool = False) -> None:
+        # adds up the phases of one call to _issue_request over each of its
+        # attempts, each phase running from the end of the one before
+        self.queue_time = 0.0
+        self.connect_time: Optional[float] = 0.0 if trace_connect else None
+        self.server_time = 0.0
+        self.decode_time = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.refreshed = False
+        self.cached = False
+        self.trace_connect = trace_connect
+        self._mark = time.perf_counter()
+        self._connecting: Dict[str, float] = {}
+
+    def _lap(self) -> float:
+        now = time.perf_counter()
+        elapsed, self._mark = now - self._mark, now
+        return elapsed
+
+    def queued(self) -> None:
+        # called once the request is about to go out
+        self.queue_time += self._lap()
+
+    def sent(self, request_bytes: int, response: Any = None) -> None:
+        # called once the response has been read, or sending it failed
+        self.server_time += self._lap()
+        self.request_bytes += request_bytes
+        if response is not None:
+            self.response_bytes += len(response.content)
+
+    def decoded(self) -> None:
+        self.decode_time += self._lap()
+
+    async def trace(self, name: str, info: Dict[str, Any]) -> None:
+        # httpx's "trace" request extension, which says when connections are
+        # opened and TLS is negotiated on them
+        step, _, stage = name.rpartition(".")
+        if step not in ("connection.connect_tcp", "connection.start_tls"):
+            return
+        if stage == "started":
+            self._connecting[step] = time.perf_counter()
+        elif step in self._connecting:
+            elapsed = time.perf_counter() - self._connecting.pop(step)
+            self.connect_time = (self.connect_time or 0.0) + elapsed
+            self.server_time -= elapsed
+
+    def event(
+        self, method: str, uri: str, status: Optional[int], retries: int
+    ) -> RequestEvent:
+        return RequestEvent(
+            method,
+            route_template(uri),
+            status,
+            self.queue_time,
+            self.connect_time,
+            self.server_time,
+            self.decode_time,
+            self.request_bytes,
+            self.response_bytes,
+            retries,
+            self.refreshed,
+            self.cached,
+        )
+
+
+def emit(hooks: Sequence[RequestHook], event: RequestEvent) -> None:
+    # a broken hook is logged rather than failing the request it's about
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception("request hook %r failed", hook)
+
+
+class LoggingHook:
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+        error_level: int = logging.WARNING,
+    ) -> None:
+        # one record per request, with the event's fields as attributes of
+        # the record (eg record.route) for structured formatters to pick up.
+        # Requests that failed are logged at error_level
+        self.logger = logger if logger is not None else logging.getLogger("etsyv3")
+        self.level = level
+        self.error_level = error_level
+
+    def __call__(self, event: RequestEvent) -> None:
+        failed = event.status is None or event.status >= 400
+        self.logger.log(
+            self.error_level if failed else self.level,
+            "%s %s %s in %.3fs%s",
+            event.method,
+            event.route,
+            event.status if event.status is not None else "connection error",
+            event.duration,
+            " (cached)" if event.cached else "",
+            extra={**event._asdict(), "duration": event.duration},
+        )
+
+
+class PrometheusHook:
+    def __init__(
+        self,
+        registry: Any = None,
+        namespace: str = "etsy",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        # requests, bytes and retries counted by method and route, and each
+        # phase's latency in one histogram labelled by phase. Requests are
+        # also labelled by whether they were answered from the cache; those
+        # with a 200 status never reached Etsy, so didn't use any quota.
+        # registry defaults to prometheus_client's global one
+        if prometheus_client is None:
+            raise ImportError(
+                "PrometheusHook requires prometheus_client, install it with "
+                "`pip install etsyv3[metrics]`"
+            )
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        labels = ("method", "route")
+        self.requests = prometheus_client.Counter(
+            "requests",
+            "Requests made to the Etsy API",
+            labels + ("status", "cached"),
+            namespace=namespace,
+            registry=registry,
+        )
+        self.latency = prometheus_client.Histogram(
+            "request_phase_seconds",
+            "Time spent on each phase of Etsy API requests",
+            labels + ("phase",),
+            namespace=namespace,
+            registry=registry,
+            buckets=buckets,
+        )
+        self.bytes = prometheus_client.Counter(
+            "request_bytes",
+            "Bytes sent to and received from the Etsy API",
+            labels + ("direction",),
+            namespace=namespace,
+            registry=registry,
+        )
+        self.retries = prometheus_client.Counter(
+            "request_retries",
+            "Retries of Etsy API requests",
+            labels,
+            namespace=namespace,
+            registry=registry,
+        )
+        self.refreshes = prometheus_client.Counter(
+            "token_refreshes",
+            "Requests that waited for an access token to be refreshed",
+            namespace=namespace,
+            registry=registry,
+        )
+
+    def __call__(self, event: RequestEvent) -> None:
+        labels = (event.method, event.route)
+        status = str(event.status) if event.status is not None else "error"
+        cached = "true" if event.cached else "false"
+        self.requests.labels(*labels, status, cached).inc()
+        phases = (
+            ("queue", event.queue_time),
+            ("connect", event.connect_time),
+            ("server", event.server_time),
+            ("decode", event.decode_time),
+        )
+        for phase, seconds in phases:
+            if seconds is not None:
+                self.latency.labels(*labels, phase).observe(seconds)
+        self.bytes.labels(*labels, "sent").inc(event.request_bytes)
+        self.bytes.labels(*labels, "received").inc(event.response_bytes)
+        if event.retries:
+            self.retries.labels(*labels).inc(event.retries)
+        if event.refreshed:
+            self.refreshes.inc()
@@ -0,0 +1,141 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from etsyv3.models.listing_request import UpdateListingInventoryRequest
+from etsyv3.models.product import Product
+
+# the listing-level settings compared alongside the products
+ON_PROPERTY_FIELDS = ("price_on_property", "quantity_on_property", "sku_on_property")
+
+PropertyKey = Tuple[Tuple[Any, ...], ...]
+
+_CENT = Decimal("0.01")
+
+
+class ProductChange(NamedTuple):
+    current: Dict[str, Any]
+    desired: Product
+    # which of "sku" and "offerings" differ
+    fields: List[str]
+
+
+class InventoryDiff(NamedTuple):
+    added: List[Product]
+    removed: List[Dict[str, Any]]
+    modified: List[ProductChange]
+    # which of ON_PROPERTY_FIELDS differ
+    settings: List[str]
+    # the update_listing_inventory response, when one was sent
+    response: Any = None
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.modified or self.settings)
+
+
+def _price(price: Any) -> Decimal:
+    # Etsy sends {"amount": ..., "divisor": ...}; requests send a number
+    if isinstance(price, dict):
+        value = Decimal(price["amount"]) / Decimal(price["divisor"])
+    else:
+        value = Decimal(str(price))
+    return value.quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def _offering(offering: Dict[str, Any], keys: Sequence[str]) -> Tuple[Any, ...]:
+    values: List[Any] = [
+        _price(offering["price"]) if offering.get("price") is not None else None,
+        offering.get("quantity"),
+        offering.get("is_enabled", True),
+    ]
+    values.extend(offering.get(key) for key in keys)
+    return tuple(values)
+
+
+def _offerings(
+    current: List[Dict[str, Any]], desired: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+    # anything besides price, quantity and is_enabled (eg readiness_state_id)
+    # is only compared where the desired offering gives it
+    extra = sorted(
+        {key for o in desired for key in o}
+        - {"price", "quantity", "is_enabled", "offering_id", "is_deleted"}
+    )
+    live = [o for o in current if not o.get("is_deleted")]
+    return (
+        [_offering(o, extra) for o in live],
+        [_offering(o, extra) for o in desired],
+    )
+
+
+def _property_key(
+    property_values: List[Dict[str, Any]], by: str
+) -> Optional[PropertyKey]:
+    # a product's identity within a listing: the values it has for each
+    # property, by value name or by value ID
+    key = []
+    for prop in property_values:
+        values = prop.get(by)
+        if not values:
+            return None
+        key.append((prop["property_id"], tuple(values)))
+    return tuple(sorted(key))
+
+
+def _desired_key(property_values: List[Dict[str, Any]]) -> PropertyKey:
+    # names where they're given, since that's what's known for new custom
+    # values, otherwise IDs
+    key = _property_key(property_values, "values")
+    if key is None:
+        key = _property_key(property_values, "value_ids")
+    return key if key is not None else ()
+
+
+def _on_property(value: Optional[List[int]]) -> List[int]:
+    return sorted(value or [])
+
+
+def diff_inventory(
+    current: Dict[str, Any], desired: UpdateListingInventoryRequest
+) -> InventoryDiff:
+    # compares the products, offerings and on-property settings of a
+    # get_listing_inventory response with an inventory about to be sent.
+    # Products are matched by their property values, so a changed SKU is a
+    # modification rather than a removal and an addition
+    by_values: Dict[PropertyKey, Dict[str, Any]] = {}
+    by_ids: Dict[PropertyKey, Dict[str, Any]] = {}
+    products = [p for p in current.get("products", []) if not p.get("is_deleted")]
+    for product in products:
+        for index, by in ((by_values, "values"), (by_ids, "value_ids")):
+            key = _property_key(product.get("property_values", []), by)
+            if key is not None:
+                index[key] = product
+
+    added: List[Product] = []
+    modified: List[ProductChange] = []
+    matched = set()
+    for product in desired.products:
+        key = _desired_key(product.property_values)
+        existing = by_values.get(key) or by_ids.get(key)
+        if existing is None or id(existing) in matched:
+            added.append(product)
+            continue
+        matched.add(id(existing))
+        fields = []
+        if (existing.get("sku") or "") != (product.sku or ""):
+            fields.append("sku")
+        current_offerings, desired_offerings = _offerings(
+            existing.get("offerings", []), product.offerings
+        )
+        if current_offerings != desired_offerings:
+            fields.append("offerings")
+        if fields:
+            modified.append(ProductChange(existing, product, fields))
+
+    removed = [p for p in products if id(p) not in matched]
+    settings = [
+        name
+        for name in ON_PROPERTY_FIELDS
+        if _on_property(current.get(name)) != _on_property(getattr(desired, name))
+    ]
+    return InventoryDiff(added, removed, modified, settings)
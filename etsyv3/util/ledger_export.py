@@ -0,0 +1,177 @@
+import csv
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable, Deque, Dict, List, NamedTuple, Optional, Union
+
+from etsyv3.etsy_api import EtsyAPI
+from etsyv3.util.codec import JSONCodec, get_codec
+from etsyv3.util.pagination import MAX_PAGE_SIZE
+
+# windows with more entries than this are split in two, so that no window
+# needs offsets deep enough to be slow
+DEFAULT_MAX_WINDOW_COUNT = 1000
+DEFAULT_EXPORT_CONCURRENCY = 4
+
+LEDGER_FIELDS = (
+    "entry_id",
+    "ledger_id",
+    "sequence_number",
+    "amount",
+    "currency",
+    "description",
+    "balance",
+    "create_date",
+    "created_timestamp",
+    "ledger_type",
+    "reference_type",
+    "reference_id",
+)
+
+LedgerSink = Callable[[List[Dict[str, Any]]], None]
+
+
+class Window(NamedTuple):
+    start: int
+    end: int
+    # the last window includes entries created at `end`; the rest stop just
+    # before it, where the next window starts
+    last: bool
+
+    def split(self) -> List["Window"]:
+        middle = (self.start + self.end) // 2
+        return [Window(self.start, middle, False), Window(middle, self.end, self.last)]
+
+    def __contains__(self, timestamp: object) -> bool:
+        if not isinstance(timestamp, int):
+            return False
+        return self.start <= timestamp < self.end or (
+            self.last and timestamp == self.end
+        )
+
+
+class ExportResult(NamedTuple):
+    entries: int
+    windows: int
+    requests: int
+
+
+def _created(entry: Dict[str, Any]) -> int:
+    created = entry.get("created_timestamp")
+    if created is None:
+        created = entry["create_date"]
+    return int(created)
+
+
+class NDJSONSink:
+    def __init__(self, f: IO[bytes], codec: Optional[JSONCodec] = None) -> None:
+        # one entry per line, to a file opened in binary mode
+        self.f = f
+        self.codec = codec if codec is not None else get_codec()
+
+    def __call__(self, entries: List[Dict[str, Any]]) -> None:
+        self.f.write(b"".join(self.codec.encode(entry) + b"\n" for entry in entries))
+
+
+class CSVSink:
+    def __init__(self, f: IO[str], fields: Any = LEDGER_FIELDS) -> None:
+        # to a file opened with newline="", with a header row first. Fields
+        # not in `fields` (eg payment_adjustments) are left out
+        self.writer = csv.DictWriter(f, fields, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def __call__(self, entries: List[Dict[str, Any]]) -> None:
+        self.writer.writerows(entries)
+
+
+class _Split(NamedTuple):
+    windows: List[Window]
+
+
+class LedgerExporter:
+    def __init__(
+        self,
+        api: EtsyAPI,
+        shop_id: int,
+        max_window_count: int = DEFAULT_MAX_WINDOW_COUNT,
+        concurrency: int = DEFAULT_EXPORT_CONCURRENCY,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> None:
+        # exports the ledger entries created between two times. The range is
+        # split into windows small enough to page through quickly, which are
+        # fetched `concurrency` at a time and handed to the sink in order, so
+        # that no more than `concurrency` windows' entries are held at once
+        self.api = api
+        self.shop_id = shop_id
+        self.max_window_count = max_window_count
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def _fetch(self, window: Window, offset: int) -> Any:
+        with self._lock:
+            self._requests += 1
+        return self.api.get_shop_payment_account_ledger_entries(
+            self.shop_id,
+            min_created=window.start,
+            max_created=window.end,
+            limit=self.page_size,
+            offset=offset or None,
+        )
+
+    def _fetch_window(self, window: Window) -> Union[_Split, List[Dict[str, Any]]]:
+        # the first page says how many entries the window has: too many, and
+        # it's split rather than paged through
+        first = self._fetch(window, 0)
+        if first["count"] > self.max_window_count and window.end - window.start > 1:
+            return _Split(window.split())
+        entries = list(first["results"])
+        for offset in range(len(entries), first["count"], self.page_size):
+            results = self._fetch(window, offset)["results"]
+            if not results:
+                break
+            entries.extend(results)
+        # window boundaries are asked for inclusively, so entries created on
+        # one are fetched by both windows but only kept by one
+        kept = [entry for entry in entries if _created(entry) in window]
+        kept.sort(key=_created)
+        return kept
+
+    def export(
+        self, min_created: int, max_created: int, sink: LedgerSink
+    ) -> ExportResult:
+        self._requests = 0
+        # start with a window per worker, so the first probes go in parallel
+        queue: Deque[Window] = deque([Window(min_created, max_created, True)])
+        while len(queue) < self.concurrency and all(
+            window.end - window.start > 1 for window in queue
+        ):
+            queue = deque(half for window in queue for half in window.split())
+        entries = windows = 0
+        # queue holds every window not yet handed to the sink, in order; the
+        # first of them are fetched, no more than `concurrency` at a time
+        fetching: Dict[Window, Future[Any]] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while queue:
+                    for window in queue:
+                        if len(fetching) >= self.concurrency:
+                            break
+                        if window not in fetching:
+                            fetching[window] = executor.submit(
+                                self._fetch_window, window
+                            )
+                    result = fetching.pop(queue.popleft()).result()
+                    if isinstance(result, _Split):
+                        # the halves take the split window's place
+                        queue.extendleft(reversed(result.windows))
+                        continue
+                    windows += 1
+                    if result:
+                        sink(result)
+                        entries += len(result)
+            finally:
+                for future in fetching.values():
+                    future.cancel()
+        return ExportResult(entries, windows, self._requests)
@@ -0,0 +1,222 @@
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from etsyv3.etsy_api import EtsyAPI
+from etsyv3.models.file_request import (
+    UploadListingFileRequest,
+    UploadListingImageRequest,
+    UploadListingVideoRequest,
+)
+from etsyv3.models.listing_request import UpdateListingImageIDRequest
+
+IMAGE = "image"
+FILE = "file"
+VIDEO = "video"
+
+UPLOADED = "uploaded"
+REUSED = "reused"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+# the field holding the new media's ID in each upload's response
+_ID_FIELDS = {IMAGE: "listing_image_id", FILE: "listing_file_id", VIDEO: "video_id"}
+
+DEFAULT_UPLOAD_CONCURRENCY = 4
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def media_kind(path: str) -> str:
+    content_type, _ = mimetypes.guess_type(path)
+    if content_type is not None and content_type.startswith("image/"):
+        return IMAGE
+    if content_type is not None and content_type.startswith("video/"):
+        return VIDEO
+    return FILE
+
+
+class UploadItem(NamedTuple):
+    listing_id: int
+    path: str
+    rank: Optional[int] = None
+    alt_text: Optional[str] = None
+    # worked out from the file's extension if not given
+    kind: Optional[str] = None
+
+
+class UploadResult(NamedTuple):
+    item: UploadItem
+    status: str
+    media_id: Optional[int] = None
+    digest: Optional[str] = None
+    response: Any = None
+    error: Optional[Exception] = None
+
+
+class MediaIndex:
+    def __init__(self, path: str = ":memory:") -> None:
+        # which files, by content hash, have been uploaded to which listings,
+        # and the image/file/video ID each one got
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            "listing_id INTEGER NOT NULL, "
+            "kind TEXT NOT NULL, "
+            "digest TEXT NOT NULL, "
+            "media_id INTEGER NOT NULL, "
+            "PRIMARY KEY (listing_id, kind, digest))"
+        )
+
+    def get(self, listing_id: int, kind: str, digest: str) -> Optional[int]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT media_id FROM media "
+                "WHERE listing_id = ? AND kind = ? AND digest = ?",
+                (listing_id, kind, digest),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def find(self, kind: str, digest: str) -> Optional[int]:
+        # the same contents on any listing
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT media_id FROM media WHERE kind = ? AND digest = ? LIMIT 1",
+                (kind, digest),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def add(self, listing_id: int, kind: str, digest: str, media_id: int) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO media (listing_id, kind, digest, media_id) "
+                "VALUES (?, ?, ?, ?)",
+                (listing_id, kind, digest, media_id),
+            )
+
+    def forget(self, listing_id: int, kind: Optional[str] = None) -> None:
+        # for when media has been deleted from a listing outside the uploader
+        with self._lock:
+            if kind is None:
+                self._connection.execute(
+                    "DELETE FROM media WHERE listing_id = ?", (listing_id,)
+                )
+            else:
+                self._connection.execute(
+                    "DELETE FROM media WHERE listing_id = ? AND kind = ?",
+                    (listing_id, kind),
+                )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class MediaUploader:
+    def __init__(
+        self,
+        api: EtsyAPI,
+        shop_id: int,
+        index: Optional[MediaIndex] = None,
+        concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    ) -> None:
+        # uploads a manifest of images, files and videos, skipping anything
+        # the index says a listing already has, and reusing an image already
+        # uploaded to another listing in the shop instead of sending it again
+        self.api = api
+        self.shop_id = shop_id
+        self.index = index if index is not None else MediaIndex()
+        self.concurrency = concurrency
+
+    def upload(self, manifest: Sequence[UploadItem]) -> List[UploadResult]:
+        # one result per item, in manifest order. Images with the same
+        # contents are handled one after another, so that the first upload's
+        # image can be reused by the rest
+        results: List[Optional[UploadResult]] = [None] * len(manifest)
+        groups: Dict[Tuple[Any, ...], List[Tuple[int, UploadItem, str]]] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            prepared = list(executor.map(self._prepare, manifest))
+            for i, (item, digest, error) in enumerate(prepared):
+                if error is not None:
+                    results[i] = UploadResult(item, FAILED, error=error)
+                    continue
+                key = (item.kind, digest) if item.kind == IMAGE else (i,)
+                groups.setdefault(key, []).append((i, item, digest))
+
+            def run(group: List[Tuple[int, UploadItem, str]]) -> None:
+                for i, item, digest in group:
+                    results[i] = self._upload_one(item, digest)
+
+            list(executor.map(run, groups.values()))
+        return [result for result in results if result is not None]
+
+    def _prepare(self, item: UploadItem) -> Tuple[UploadItem, str, Optional[OSError]]:
+        item = item._replace(kind=item.kind or media_kind(item.path))
+        try:
+            return item, file_digest(item.path), None
+        except OSError as e:
+            return item, "", e
+
+    def _upload_one(self, item: UploadItem, digest: str) -> UploadResult:
+        kind = item.kind or FILE
+        try:
+            media_id = self.index.get(item.listing_id, kind, digest)
+            if media_id is not None:
+                return UploadResult(item, SKIPPED, media_id, digest)
+            if kind == IMAGE:
+                existing = self.index.find(IMAGE, digest)
+                if existing is not None:
+                    response = self.api.update_listing_image_id(
+                        self.shop_id,
+                        item.listing_id,
+                        UpdateListingImageIDRequest(
+                            existing, rank=item.rank, alt_text=item.alt_text
+                        ),
+                    )
+                    return self._record(item, kind, digest, REUSED, response)
+            response = self._send(item, kind)
+            return self._record(item, kind, digest, UPLOADED, response)
+        except Exception as e:
+            return UploadResult(item, FAILED, digest=digest, error=e)
+
+    def _send(self, item: UploadItem, kind: str) -> Any:
+        name = os.path.basename(item.path)
+        if kind == IMAGE:
+            return self.api.upload_listing_image(
+                self.shop_id,
+                item.listing_id,
+                UploadListingImageRequest(
+                    item.path, rank=item.rank, alt_text=item.alt_text
+                ),
+            )
+        if kind == VIDEO:
+            return self.api.upload_listing_video(
+                self.shop_id,
+                item.listing_id,
+                UploadListingVideoRequest(item.path, name=name),
+            )
+        return self.api.upload_listing_file(
+            self.shop_id,
+            item.listing_id,
+            UploadListingFileRequest(item.path, name=name, rank=item.rank),
+        )
+
+    def _record(
+        self, item: UploadItem, kind: str, digest: str, status: str, response: Any
+    ) -> UploadResult:
+        media_id = response.get(_ID_FIELDS[kind]) if response else None
+        if media_id is not None:
+            self.index.add(item.listing_id, kind, digest, media_id)
+        return UploadResult(item, status, media_id, digest, response)
@@ -0,0 +1,156 @@
+import binascii
+import os
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# what can be uploaded: the contents themselves, a path to them, or a binary
+# file object (which must be seekable, so that its size is known up front and
+# the upload can be sent again if it has to be retried)
+FileSource = Union[bytes, bytearray, str, "os.PathLike[str]", IO[bytes]]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _quote(value: str) -> str:
+    # as urllib3 quotes names and filenames in multipart headers
+    return value.translate({10: "%0A", 13: "%0D", 34: "%22"})
+
+
+class _FilePart:
+    def __init__(self, source: FileSource) -> None:
+        self.source = source
+        if isinstance(source, (bytes, bytearray)):
+            self.start = 0
+            self.size = len(source)
+        elif isinstance(source, (str, os.PathLike)):
+            self.start = 0
+            self.size = os.path.getsize(source)
+        else:
+            self.start = source.tell()
+            try:
+                self.size = os.fstat(source.fileno()).st_size - self.start
+            except (AttributeError, OSError):
+                self.size = source.seek(0, os.SEEK_END) - self.start
+                source.seek(self.start)
+
+    def chunks(self, chunk_size: int) -> Iterator[bytes]:
+        if isinstance(self.source, (bytes, bytearray)):
+            yield bytes(self.source)
+        elif isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, "rb") as f:
+                yield from self._read(f, chunk_size)
+        else:
+            self.source.seek(self.start)
+            yield from self._read(self.source, chunk_size)
+
+    def _read(self, f: IO[bytes], chunk_size: int) -> Iterator[bytes]:
+        remaining = self.size
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                raise IOError("file was shorter than when the upload started")
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _filename(name: str, source: Any) -> Optional[str]:
+    # the filename requests would have given the same file
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    path = getattr(source, "name", None)
+    if isinstance(path, str) and path and path[0] != "<" and path[-1] != ">":
+        return os.path.basename(path)
+    return name
+
+
+class MultipartStream:
+    def __init__(
+        self,
+        data: Optional[Mapping[str, Any]],
+        files: Mapping[str, Any],
+        boundary: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        # a multipart/form-data body that's read from its files a chunk at a
+        # time as it's sent, rather than built in memory first. Fields and
+        # files are encoded as requests would encode data= and files=, and
+        # each value in files can be a FileSource or a (filename, source) or
+        # (filename, source, content_type) tuple
+        self.boundary = boundary or binascii.hexlify(os.urandom(16)).decode()
+        self.chunk_size = chunk_size
+        self._parts: List[Tuple[bytes, Union[bytes, _FilePart]]] = []
+        for name, value in (data or {}).items():
+            if value is None:
+                continue
+            if not isinstance(value, bytes):
+                value = str(value).encode("utf-8")
+            self._parts.append((self._part_header(name), value))
+        for name, value in files.items():
+            content_type = None
+            if isinstance(value, tuple):
+                if len(value) == 2:
+                    filename, source = value
+                else:
+                    filename, source, content_type = value
+            else:
+                filename, source = _filename(name, value), value
+            self._parts.append(
+                (self._part_header(name, filename, content_type), _FilePart(source))
+            )
+        self._closing = f"--{self.boundary}--\r\n".encode("utf-8")
+
+    def _part_header(
+        self,
+        name: str,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> bytes:
+        disposition = f'form-data; name="{_quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(filename)}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type is not None:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Content-Type": self.content_type, "Content-Length": str(len(self))}
+
+    def __len__(self) -> int:
+        length = len(self._closing)
+        for header, body in self._parts:
+            size = body.size if isinstance(body, _FilePart) else len(body)
+            length += len(header) + size + 2
+        return length
+
+    def __iter__(self) -> Iterator[bytes]:
+        # can be iterated more than once, eg when a request is retried
+        for header, body in self._parts:
+            yield header
+            if isinstance(body, _FilePart):
+                yield from body.chunks(self.chunk_size)
+            else:
+                yield body
+            yield b"\r\n"
+        yield self._closing
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # reads are small and from local files, so they're made in the event
+        # loop rather than a thread
+        for chunk in self:
+            yield chunk
@@ -0,0 +1,152 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+# the largest page Etsy will return from limit/offset endpoints
+MAX_PAGE_SIZE = 100
+# the most IDs Etsy accepts in one call to a list-of-IDs endpoint
+MAX_IDS_PER_REQUEST = 100
+DEFAULT_CHUNK_CONCURRENCY = 4
+
+
+def chunk_ids(
+    ids: Optional[List[int]], chunk_size: int = MAX_IDS_PER_REQUEST
+) -> List[Optional[str]]:
+    if ids is None:
+        return [None]
+    if len(ids) == 0:
+        return [""]
+    return [
+        ",".join([str(x) for x in ids[i : i + chunk_size]])
+        for i in range(0, len(ids), chunk_size)
+    ]
+
+
+def merge_pages(pages: List[Any]) -> Dict[str, Any]:
+    return {
+        "count": sum(page["count"] for page in pages),
+        "results": [result for page in pages for result in page["results"]],
+    }
+
+
+def paginate(
+    fetch_page: Callable[[int, int], Any], limit: int = MAX_PAGE_SIZE, offset: int = 0
+) -> Iterator[Any]:
+    # fetch_page(limit, offset) returns one page of a {"count", "results"}
+    # response; the next page is fetched in the background while the caller
+    # works through the current one, so only two pages are ever held
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future: Optional[Future[Any]] = executor.submit(fetch_page, limit, offset)
+        while future is not None:
+            page = future.result()
+            results = page["results"]
+            offset += len(results)
+            future = (
+                executor.submit(fetch_page, limit, offset)
+                if results and offset < page["count"]
+                else None
+            )
+            yield from results
+
+
+async def apaginate(
+    fetch_page: Callable[[int, int], Awaitable[Any]],
+    limit: int = MAX_PAGE_SIZE,
+    offset: int = 0,
+) -> AsyncIterator[Any]:
+    task: Optional[asyncio.Future[Any]] = asyncio.ensure_future(
+        fetch_page(limit, offset)
+    )
+    try:
+        while task is not None:
+            page = await task
+            results = page["results"]
+            offset += len(results)
+            task = (
+                asyncio.ensure_future(fetch_page(limit, offset))
+                if results and offset < page["count"]
+                else None
+            )
+            for result in results:
+                yield result
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def paginate_parallel(
+    fetch_page: Callable[[int, int], Any],
+    limit: int = MAX_PAGE_SIZE,
+    concurrency: int = 4,
+    ordered: bool = True,
+    offset: int = 0,
+) -> Iterator[Any]:
+    # once the first page has told us the count, the remaining offsets are
+    # fetched by up to `concurrency` threads, with no more than `concurrency`
+    # pages waiting to be consumed at any time
+    first = fetch_page(limit, offset)
+    yield from first["results"]
+    if not first["results"]:
+        return
+    offsets = iter(range(offset + len(first["results"]), first["count"], limit))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: Deque[Future[Any]] = deque(
+            executor.submit(fetch_page, limit, o) for o in islice(offsets, concurrency)
+        )
+        while pending:
+            if ordered:
+                done = pending.popleft()
+            else:
+                done = next(as_completed(pending))
+                pending.remove(done)
+            for o in islice(offsets, 1):
+                pending.append(executor.submit(fetch_page, limit, o))
+            yield from done.result()["results"]
+
+
+async def apaginate_parallel(
+    fetch_page: Callable[[int, int], Awaitable[Any]],
+    limit: int = MAX_PAGE_SIZE,
+    concurrency: int = 4,
+    ordered: bool = True,
+    offset: int = 0,
+) -> AsyncIterator[Any]:
+    first = await fetch_page(limit, offset)
+    for result in first["results"]:
+        yield result
+    if not first["results"]:
+        return
+    offsets = iter(range(offset + len(first["results"]), first["count"], limit))
+    pending: Deque[asyncio.Future[Any]] = deque(
+        asyncio.ensure_future(fetch_page(limit, o))
+        for o in islice(offsets, concurrency)
+    )
+    try:
+        while pending:
+            if ordered:
+                done = pending.popleft()
+            else:
+                finished, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                done = finished.pop()
+                pending.remove(done)
+            for o in islice(offsets, 1):
+                pending.append(asyncio.ensure_future(fetch_page(limit, o)))
+            for result in (await done)["results"]:
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
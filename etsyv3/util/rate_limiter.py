@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Mapping, Optional
+
+# Etsy's default quota for an app keystring, per
+# https://developers.etsy.com/documentation/essentials/rate-limits
+ETSY_DEFAULT_PER_SECOND = 10
+ETSY_DEFAULT_PER_DAY = 10000
+SECONDS_PER_DAY = 86400
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        per_second: float = ETSY_DEFAULT_PER_SECOND,
+        per_day: float = ETSY_DEFAULT_PER_DAY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # two token buckets: the per-second one also sets the burst size, the
+        # per-day one refills evenly over Etsy's rolling 24 hour window
+        self.per_second = float(per_second)
+        self.per_day = float(per_day)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._second_tokens = self.per_second
+        self._day_tokens = self.per_day
+        self._blocked_until = 0.0
+        self._last = clock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._last, 0.0)
+        self._last = now
+        self._second_tokens = min(
+            self.per_second, self._second_tokens + elapsed * self.per_second
+        )
+        self._day_tokens = min(
+            self.per_day, self._day_tokens + elapsed * self.per_day / SECONDS_PER_DAY
+        )
+
+    def reserve(self) -> float:
+        # takes a token and returns how many seconds the caller has to wait
+        # before it is allowed to send the request it was taken for
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._second_tokens -= 1
+            self._day_tokens -= 1
+            wait = max(self._blocked_until - now, 0.0)
+            if self._second_tokens < 0:
+                wait = max(wait, -self._second_tokens / self.per_second)
+            if self._day_tokens < 0:
+                wait = max(wait, -self._day_tokens * SECONDS_PER_DAY / self.per_day)
+            return wait
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        limit_per_second = _header_float(headers, "x-limit-per-second")
+        remaining_this_second = _header_float(headers, "x-remaining-this-second")
+        limit_per_day = _header_float(headers, "x-limit-per-day")
+        remaining_today = _header_float(headers, "x-remaining-today")
+        retry_after = _header_float(headers, "retry-after")
+        with self._lock:
+            self._refill(self._clock())
+            if limit_per_second:
+                self.per_second = limit_per_second
+            if limit_per_day:
+                self.per_day = limit_per_day
+            if remaining_this_second is not None:
+                self._second_tokens = min(self._second_tokens, remaining_this_second)
+            if remaining_today is not None:
+                self._day_tokens = min(self._day_tokens, remaining_today)
+            if retry_after is not None:
+                self._blocked_until = max(
+                    self._blocked_until, self._clock() + retry_after
+                )
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
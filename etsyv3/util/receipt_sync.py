@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from etsyv3.etsy_api import EtsyAPI
+from etsyv3.util.pagination import MAX_PAGE_SIZE
+
+# how far before the watermark each sync starts again, for receipts whose
+# last-modified time was set a little before they became visible
+DEFAULT_OVERLAP = 300
+
+# how far back the first sync for a shop goes
+DEFAULT_INITIAL_LOOKBACK = 30 * 24 * 60 * 60
+
+ReceiptSink = Callable[[List[Dict[str, Any]]], None]
+
+
+class Checkpoint(NamedTuple):
+    # the latest last-modified time of a receipt handed to the sink
+    watermark: int
+    # receipt_id -> last-modified time of the receipts delivered within the
+    # overlap window, so that they aren't delivered again unless they've
+    # changed since
+    recent: Dict[int, int]
+
+
+class SyncResult(NamedTuple):
+    delivered: int
+    duplicates: int
+    requests: int
+    checkpoint: Checkpoint
+
+
+def _updated(receipt: Dict[str, Any]) -> int:
+    updated = receipt.get("updated_timestamp")
+    if updated is None:
+        updated = receipt["update_timestamp"]
+    return int(updated)
+
+
+class CheckpointStore(ABC):
+    @abstractmethod
+    def load(self, key: str) -> Optional[Checkpoint]: ...
+
+    @abstractmethod
+    def save(self, key: str, checkpoint: Checkpoint) -> None: ...
+
+
+def _encode(checkpoint: Checkpoint) -> str:
+    recent = {str(receipt_id): t for receipt_id, t in checkpoint.recent.items()}
+    return json.dumps({"watermark": checkpoint.watermark, "recent": recent})
+
+
+def _decode(stored: str) -> Checkpoint:
+    decoded = json.loads(stored)
+    recent = {int(receipt_id): t for receipt_id, t in decoded["recent"].items()}
+    return Checkpoint(decoded["watermark"], recent)
+
+
+class FileCheckpointStore(CheckpointStore):
+    def __init__(self, directory: str) -> None:
+        # one JSON file per key, replaced atomically on each save
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        try:
+            with open(self._path(key), "r") as f:
+                return _decode(f.read())
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(_encode(checkpoint))
+        os.replace(tmp_path, self._path(key))
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "key TEXT PRIMARY KEY, "
+            "checkpoint TEXT NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        row = (
+            self._connection()
+            .execute("SELECT checkpoint FROM checkpoints WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return _decode(row[0]) if row is not None else None
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO checkpoints (key, checkpoint) VALUES (?, ?)",
+            (key, _encode(checkpoint)),
+        )
+
+
+class ReceiptSync:
+    def __init__(
+        self,
+        api: EtsyAPI,
+        shop_id: int,
+        store: CheckpointStore,
+        sink: ReceiptSink,
+        overlap: int = DEFAULT_OVERLAP,
+        initial_lookback: int = DEFAULT_INITIAL_LOOKBACK,
+        page_size: int = MAX_PAGE_SIZE,
+        key: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        # hands every receipt created or changed since the last run to
+        # sink, a page at a time, oldest change first. The checkpoint is
+        # saved after each page the sink returns from, so a sink that raises
+        # leaves it where it was and those receipts are fetched again next run
+        self.api = api
+        self.shop_id = shop_id
+        self.store = store
+        self.sink = sink
+        self.overlap = overlap
+        self.initial_lookback = initial_lookback
+        self.page_size = page_size
+        self.key = key if key is not None else f"receipts-{shop_id}"
+        self.clock = clock
+
+    def _fetch(self, min_last_modified: int, offset: int) -> Any:
+        return self.api.get_shop_receipts(
+            self.shop_id,
+            limit=self.page_size,
+            offset=offset or None,
+            was_paid=None,
+            was_shipped=None,
+            min_last_modified=min_last_modified,
+            sort_on="updated",
+            sort_order="asc",
+        )
+
+    def run(self) -> SyncResult:
+        checkpoint = self.store.load(self.key)
+        if checkpoint is None:
+            start = int(self.clock()) - self.initial_lookback
+            checkpoint = Checkpoint(start, {})
+        watermark, recent = checkpoint.watermark, dict(checkpoint.recent)
+        # pages follow the last-modified time of the last receipt on the
+        # previous page, rather than an offset, so that receipts changing
+        # while the sync runs can't shift the pages under it. An offset is
+        # only needed for a page full of receipts changed in the same second
+        cursor = max(watermark - self.overlap, 0)
+        offset = 0
+        delivered = duplicates = requests = 0
+        while True:
+            results = self._fetch(cursor, offset)["results"]
+            requests += 1
+            batch = []
+            seen: Dict[int, int] = {}
+            for receipt in results:
+                updated = _updated(receipt)
+                if recent.get(receipt["receipt_id"]) == updated:
+                    duplicates += 1
+                    continue
+                seen[receipt["receipt_id"]] = updated
+                batch.append(receipt)
+            if batch:
+                self.sink(batch)
+                delivered += len(batch)
+            if results:
+                last = _updated(results[-1])
+                watermark = max(watermark, last)
+                horizon = watermark - self.overlap
+                recent = {r: t for r, t in {**recent, **seen}.items() if t >= horizon}
+                checkpoint = Checkpoint(watermark, recent)
+                self.store.save(self.key, checkpoint)
+            if len(results) < self.page_size:
+                return SyncResult(delivered, duplicates, requests, checkpoint)
+            if last == cursor:
+                offset += len(results)
+            else:
+                cursor, offset = last, 0
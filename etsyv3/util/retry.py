@@ -0,0 +1,92 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Collection, Dict, Optional
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+IDEMPOTENT_METHODS = frozenset(["GET", "PUT", "DELETE"])
+
+
+class RetryStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retried_calls = 0
+        self.retries = 0
+        self.retry_delay = 0.0
+        # number of retries a call needed -> number of calls that needed it
+        self.retries_per_call: Dict[int, int] = {}
+
+    def record(self, retries: int, retry_delay: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.retry_delay += retry_delay
+            if retries > 0:
+                self.retried_calls += 1
+            self.retries_per_call[retries] = self.retries_per_call.get(retries, 0) + 1
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_total_time: float = 120.0,
+        statuses: Collection[int] = RETRY_STATUSES,
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_total_time = max_total_time
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self.clock = clock
+        self.stats = RetryStats()
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        # exponential backoff with full jitter, but never sooner than the
+        # server asked us to come back
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        delay = random.uniform(0, ceiling)
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            delay = max(delay, server_delay)
+        return delay
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        started: float,
+        status_code: Optional[int] = None,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        # returns how long to wait before the next attempt, or None if the
+        # call shouldn't be retried; status_code is None for connection errors
+        if method not in self.methods or attempt >= self.max_retries:
+            return None
+        if status_code is not None and status_code not in self.statuses:
+            return None
+        delay = self.backoff(attempt, retry_after)
+        if self.clock() - started + delay > self.max_total_time:
+            return None
+        return delay
+
+
+def parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
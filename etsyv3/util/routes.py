@@ -0,0 +1,28 @@
+from urllib.parse import urlsplit
+
+# the path every Etsy v3 application endpoint sits under
+ETSY_API_PATH = "/v3/application"
+
+
+def _placeholder(collection: str) -> str:
+    name = collection.replace("-", "_")
+    if name.endswith("ies"):
+        name = name[:-3] + "y"
+    elif name.endswith("s"):
+        name = name[:-1]
+    return "{" + name + "_id}"
+
+
+def route_template(uri: str) -> str:
+    # turns a full request URI into the endpoint it was made against, eg
+    # https://api.etsy.com/v3/application/shops/1/sections?x=y becomes
+    # /shops/{shop_id}/sections, by replacing each numeric path segment with
+    # a placeholder named after the collection it follows
+    path = urlsplit(uri).path
+    if path.startswith(ETSY_API_PATH):
+        path = path[len(ETSY_API_PATH) :]
+    segments = path.split("/")
+    for i, segment in enumerate(segments):
+        if segment.isdigit() and i > 0:
+            segments[i] = _placeholder(segments[i - 1])
+    return "/".join(segments)
@@ -0,0 +1,142 @@
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from etsyv3.util.todict import slot_names, todict
+
+_SCALAR, _ITERABLE, _DICT, _ENUM, _OBJECT, _OTHER = range(6)
+
+# returned as they are, checked for inline to save a call per value
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+# what `value not in [[], "" or 0]` in todict amounts to
+_EMPTY: List[Any] = [[], 0]
+
+Field = Optional[Tuple[str, bool]]
+
+
+def _kind(t: type) -> int:
+    # the same checks todict makes of each value, in the same order, made once
+    # per type instead of once per value
+    if issubclass(t, dict):
+        return _DICT
+    if issubclass(t, Enum):
+        return _ENUM
+    if hasattr(t, "_ast"):
+        return _OTHER
+    if t is str:
+        return _SCALAR
+    if issubclass(t, str):
+        # str subclasses can have a __dict__, which todict would use
+        return _OTHER
+    if hasattr(t, "__iter__"):
+        return _ITERABLE
+    if getattr(t, "__dictoffset__", 0) or slot_names(t):
+        return _OBJECT
+    return _SCALAR
+
+
+class Serializer:
+    def __init__(self, cls: type, nullable: Sequence[str] = ()) -> None:
+        # turns objects of one class into the dict todict would make of them,
+        # working out each attribute's wire name and whether it's nullable
+        # the first time it's seen rather than every time
+        self.nullable = nullable
+        self._fields: Dict[str, Field] = {}
+        self._slots = slot_names(cls)
+        self._has_dict = bool(getattr(cls, "__dictoffset__", 0))
+        for key in self._slots:
+            self._field(key)
+
+    def _field(self, key: str) -> Field:
+        field: Field = None
+        if not key.startswith("_"):
+            field = ("type" if key == "listing_type" else key, key in self.nullable)
+        self._fields[key] = field
+        return field
+
+    def serialize(self, obj: Any) -> Dict[str, Any]:
+        fields = self._fields
+        data: Dict[str, Any] = {}
+        if self._slots:
+            # unset slots come out as None, which is skipped like a None value
+            items = [(key, getattr(obj, key, None)) for key in self._slots]
+            if self._has_dict:
+                items.extend(obj.__dict__.items())
+        else:
+            items = obj.__dict__.items()
+        for key, value in items:
+            if value is None:
+                continue
+            field = fields[key] if key in fields else self._field(key)
+            if field is None or callable(value):
+                continue
+            name, nullable = field
+            if nullable and (value == [] or value == "" or value == 0):
+                data[key] = None
+            elif value in _EMPTY:
+                data[key] = None
+            elif type(value) in _SCALARS:
+                data[name] = value
+            else:
+                data[name] = serialize_value(value)
+        return data
+
+
+_REQUEST_SERIALIZERS: Dict[type, Serializer] = {}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _serialize_iterable(value: Any) -> List[Any]:
+    return [v if type(v) in _SCALARS else serialize_value(v) for v in value]
+
+
+def _serialize_dict(value: Any) -> Dict[Any, Any]:
+    return {
+        k: v if type(v) in _SCALARS else serialize_value(v) for k, v in value.items()
+    }
+
+
+def _serialize_enum(value: Any) -> Any:
+    return serialize_value(value.value)
+
+
+def _converter(t: type) -> Callable[[Any], Any]:
+    kind = _kind(t)
+    if kind == _ITERABLE:
+        return _serialize_iterable
+    if kind == _DICT:
+        return _serialize_dict
+    if kind == _ENUM:
+        return _serialize_enum
+    if kind == _OBJECT:
+        return Serializer(t).serialize
+    if kind == _OTHER:
+        return todict
+    return _identity
+
+
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def serialize_value(value: Any) -> Any:
+    t = type(value)
+    if t in _SCALARS:
+        return value
+    converter = _CONVERTERS.get(t)
+    if converter is None:
+        converter = _CONVERTERS[t] = _converter(t)
+    return converter(value)
+
+
+def serializer_for(cls: type, nullable: Sequence[str]) -> Serializer:
+    # one per Request subclass, compiled for the nullable list its instances
+    # share, which is normally the class's own
+    serializer = _REQUEST_SERIALIZERS.get(cls)
+    if serializer is None or (
+        serializer.nullable is not nullable and serializer.nullable != nullable
+    ):
+        serializer = _REQUEST_SERIALIZERS[cls] = Serializer(cls, nullable)
+    return serializer
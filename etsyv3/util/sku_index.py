@@ -0,0 +1,206 @@
+import json
+import sqlite3
+import threading
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from etsyv3.etsy_api import EtsyAPI, Includes, ListingState, NotFound
+
+# every state a listing can be in
+ALL_LISTING_STATES = (
+    ListingState.ACTIVE,
+    ListingState.INACTIVE,
+    ListingState.SOLD_OUT,
+    ListingState.DRAFT,
+    ListingState.EXPIRED,
+)
+
+Row = Tuple[str, int, Optional[int], Optional[int], str]
+
+
+class SkuEntry(NamedTuple):
+    sku: str
+    listing_id: int
+    product_id: Optional[int]
+    offering_id: Optional[int]
+    property_values: List[Dict[str, Any]]
+
+
+def _rows(listing_id: int, inventory: Dict[str, Any]) -> Iterator[Row]:
+    # Etsy sends null rather than leaving out fields it has nothing for
+    for product in inventory.get("products") or []:
+        if product.get("is_deleted") or not product.get("sku"):
+            continue
+        property_values = json.dumps(product.get("property_values") or [])
+        offerings = [
+            o for o in (product.get("offerings") or []) if not o.get("is_deleted")
+        ]
+        for offering in offerings or [{}]:
+            yield (
+                product["sku"],
+                listing_id,
+                product.get("product_id"),
+                offering.get("offering_id"),
+                property_values,
+            )
+
+
+class SkuIndex:
+    def __init__(self, path: str = ":memory:") -> None:
+        # which listing, product and offering each SKU in a shop belongs to,
+        # kept in SQLite so that it can outlive the process if given a path.
+        # load_shop() fills it from every listing in the shop, and
+        # update_listing() or refresh_listings() keep it up to date after
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS skus ("
+            "sku TEXT NOT NULL, "
+            "listing_id INTEGER NOT NULL, "
+            "product_id INTEGER, "
+            "offering_id INTEGER, "
+            "property_values TEXT NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS skus_sku ON skus (sku)")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS skus_listing_id ON skus (listing_id)"
+        )
+
+    @classmethod
+    def from_shop(
+        cls,
+        api: EtsyAPI,
+        shop_id: int,
+        path: str = ":memory:",
+        states: Sequence[ListingState] = ALL_LISTING_STATES,
+        concurrency: int = 1,
+    ) -> "SkuIndex":
+        index = cls(path)
+        index.load_shop(api, shop_id, states, concurrency)
+        return index
+
+    def load_shop(
+        self,
+        api: EtsyAPI,
+        shop_id: int,
+        states: Sequence[ListingState] = ALL_LISTING_STATES,
+        concurrency: int = 1,
+    ) -> None:
+        # replaces the whole index. Inventories come with the shop's listings,
+        # a page of 100 at a time, rather than being fetched one by one
+        rows: List[Row] = []
+        for state in states:
+            for listing in api.iter_listings_by_shop(
+                shop_id,
+                state=state,
+                includes=[Includes.INVENTORY],
+                concurrency=concurrency,
+            ):
+                rows.extend(
+                    _rows(listing["listing_id"], listing.get("inventory") or {})
+                )
+        self._replace(None, rows)
+
+    def update_listing(self, listing_id: int, inventory: Dict[str, Any]) -> None:
+        # from a get_listing_inventory response, or a listing's "inventory"
+        self._replace([listing_id], _rows(listing_id, inventory))
+
+    def remove_listing(self, listing_id: int) -> None:
+        self._replace([listing_id], ())
+
+    def refresh_listing(self, api: EtsyAPI, listing_id: int) -> None:
+        try:
+            inventory = api.get_listing_inventory(listing_id)
+        except NotFound:
+            self.remove_listing(listing_id)
+        else:
+            self.update_listing(listing_id, inventory)
+
+    def refresh_listings(self, api: EtsyAPI, listing_ids: List[int]) -> None:
+        # fetched 100 listings a request; any that Etsy no longer has are
+        # removed
+        response = api.get_listings_by_listing_ids(
+            listing_ids, includes=[Includes.INVENTORY]
+        )
+        rows: List[Row] = []
+        for listing in response["results"]:
+            rows.extend(_rows(listing["listing_id"], listing.get("inventory") or {}))
+        self._replace(listing_ids, rows)
+
+    def _replace(self, listing_ids: Optional[List[int]], rows: Iterable[Row]) -> None:
+        # listing_ids of None replaces everything
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                if listing_ids is None:
+                    self._connection.execute("DELETE FROM skus")
+                else:
+                    self._connection.executemany(
+                        "DELETE FROM skus WHERE listing_id = ?",
+                        [(listing_id,) for listing_id in listing_ids],
+                    )
+                self._connection.executemany(
+                    "INSERT INTO skus VALUES (?, ?, ?, ?, ?)", rows
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def find(self, sku: str) -> List[SkuEntry]:
+        # Etsy doesn't stop the same SKU being used on more than one listing
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM skus WHERE sku = ? ORDER BY listing_id, product_id",
+                (sku,),
+            ).fetchall()
+        return [
+            SkuEntry(row[0], row[1], row[2], row[3], json.loads(row[4])) for row in rows
+        ]
+
+    def get(self, sku: str) -> Optional[SkuEntry]:
+        entries = self.find(sku)
+        return entries[0] if entries else None
+
+    def __getitem__(self, sku: str) -> SkuEntry:
+        entry = self.get(sku)
+        if entry is None:
+            raise KeyError(sku)
+        return entry
+
+    def __contains__(self, sku: object) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM skus WHERE sku = ? LIMIT 1", (sku,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        # the number of distinct SKUs
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(DISTINCT sku) FROM skus"
+            ).fetchone()
+        return int(row[0])
+
+    def skus(self, listing_id: int) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT sku FROM skus WHERE listing_id = ? ORDER BY sku",
+                (listing_id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,135 @@
+import re
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from etsyv3.etsy_api import EtsyAPI
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class TaxonomyIndex:
+    def __init__(self, response: Dict[str, Any], api: Optional[EtsyAPI] = None):
+        # built once from a get_seller_taxonomy_nodes (or buyer) response, so
+        # that nothing after this needs to walk the tree
+        self.api = api
+        self._nodes: Dict[int, Dict[str, Any]] = {}
+        self._parents: Dict[int, Optional[int]] = {}
+        self._children: Dict[int, List[int]] = {}
+        self._roots: List[int] = []
+        self._words: Dict[str, Set[int]] = {}
+        self._properties: Dict[int, Any] = {}
+        self._properties_lock = threading.Lock()
+        stack: List[Tuple[Dict[str, Any], Optional[int]]] = [
+            (node, None) for node in reversed(response["results"])
+        ]
+        while stack:
+            node, parent_id = stack.pop()
+            taxonomy_id = node["id"]
+            self._nodes[taxonomy_id] = node
+            self._parents[taxonomy_id] = parent_id
+            self._children[taxonomy_id] = [child["id"] for child in node["children"]]
+            if parent_id is None:
+                self._roots.append(taxonomy_id)
+            for word in _words(node["name"]):
+                self._words.setdefault(word, set()).add(taxonomy_id)
+            stack.extend((child, taxonomy_id) for child in reversed(node["children"]))
+        self._names: List[Tuple[str, int]] = sorted(
+            (node["name"].lower(), taxonomy_id)
+            for taxonomy_id, node in self._nodes.items()
+        )
+
+    @staticmethod
+    def from_api(api: EtsyAPI) -> "TaxonomyIndex":
+        return TaxonomyIndex(api.get_seller_taxonomy_nodes(), api)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, taxonomy_id: object) -> bool:
+        return taxonomy_id in self._nodes
+
+    def get(self, taxonomy_id: int) -> Dict[str, Any]:
+        return self._nodes[taxonomy_id]
+
+    def roots(self) -> List[Dict[str, Any]]:
+        return [self._nodes[x] for x in self._roots]
+
+    def parent(self, taxonomy_id: int) -> Optional[Dict[str, Any]]:
+        parent_id = self._parents[taxonomy_id]
+        return self._nodes[parent_id] if parent_id is not None else None
+
+    def children(self, taxonomy_id: int) -> List[Dict[str, Any]]:
+        return [self._nodes[x] for x in self._children[taxonomy_id]]
+
+    def ancestors(self, taxonomy_id: int) -> List[Dict[str, Any]]:
+        # from the root down to, but not including, taxonomy_id
+        ancestors = []
+        parent_id = self._parents[taxonomy_id]
+        while parent_id is not None:
+            ancestors.append(self._nodes[parent_id])
+            parent_id = self._parents[parent_id]
+        ancestors.reverse()
+        return ancestors
+
+    def descendants(self, taxonomy_id: int) -> Iterator[Dict[str, Any]]:
+        stack = list(reversed(self._children[taxonomy_id]))
+        while stack:
+            child_id = stack.pop()
+            yield self._nodes[child_id]
+            stack.extend(reversed(self._children[child_id]))
+
+    def path(self, taxonomy_id: int) -> List[str]:
+        return [node["name"] for node in self.ancestors(taxonomy_id)] + [
+            self._nodes[taxonomy_id]["name"]
+        ]
+
+    def is_descendant(self, taxonomy_id: int, ancestor_id: int) -> bool:
+        parent_id = self._parents[taxonomy_id]
+        while parent_id is not None:
+            if parent_id == ancestor_id:
+                return True
+            parent_id = self._parents[parent_id]
+        return False
+
+    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
+        return self.search_prefix(name, exact=True)
+
+    def search_prefix(self, prefix: str, exact: bool = False) -> List[Dict[str, Any]]:
+        # case-insensitive match against the start of each node's name
+        prefix = prefix.lower()
+        matches = []
+        i = bisect_left(self._names, (prefix, -1))
+        while i < len(self._names) and self._names[i][0].startswith(prefix):
+            name, taxonomy_id = self._names[i]
+            if not exact or name == prefix:
+                matches.append(self._nodes[taxonomy_id])
+            i += 1
+        return matches
+
+    def search(self, text: str) -> List[Dict[str, Any]]:
+        # nodes whose name contains every word in text, in any order
+        words = _words(text)
+        if not words:
+            return []
+        matches = set(self._words.get(words[0], set()))
+        for word in words[1:]:
+            matches &= self._words.get(word, set())
+        return [self._nodes[x] for x in sorted(matches)]
+
+    def properties(self, taxonomy_id: int) -> Any:
+        # fetched from get_properties_by_taxonomy_id the first time they're
+        # asked for, then kept
+        if taxonomy_id not in self._properties:
+            if self.api is None:
+                raise ValueError("TaxonomyIndex needs an api to fetch properties")
+            with self._properties_lock:
+                if taxonomy_id not in self._properties:
+                    self._properties[taxonomy_id] = (
+                        self.api.get_properties_by_taxonomy_id(taxonomy_id)
+                    )
+        return self._properties[taxonomy_id]
@@ -1,5 +1,34 @@
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_SLOT_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def slot_names(cls: type) -> Tuple[str, ...]:
+    # every __slots__ field of cls and its bases, base classes first
+    if cls in _SLOT_NAMES:
+        return _SLOT_NAMES[cls]
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ("__dict__", "__weakref__") and name not in names:
+                names.append(name)
+    _SLOT_NAMES[cls] = tuple(names)
+    return _SLOT_NAMES[cls]
+
+
+def attributes(obj: Any) -> Iterator[Tuple[str, Any]]:
+    # like obj.__dict__.items(), but including any slots that have been set
+    for name in slot_names(type(obj)):
+        try:
+            yield name, getattr(obj, name)
+        except AttributeError:
+            pass
+    if hasattr(obj, "__dict__"):
+        yield from obj.__dict__.items()
 
 
 def todict(
@@ -18,7 +47,7 @@ def todict(
         return todict(obj._ast())
     elif hasattr(obj, "__iter__") and not isinstance(obj, str):
         return [todict(v, classkey) for v in obj]
-    elif hasattr(obj, "__dict__"):
+    elif hasattr(obj, "__dict__") or slot_names(type(obj)):
         # I hate this, but it's a way around the reserved name 'type' for now
         data = dict(
             [
@@ -27,7 +56,7 @@ def todict(
                     if key not in nullable and value not in [[], "" or 0]
                     else (key, None)
                 )
-                for key, value in obj.__dict__.items()
+                for key, value in attributes(obj)
                 if not callable(value) and not key.startswith("_") and value is not None
             ]
         )
@@ -0,0 +1,178 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import ContextManager, Dict, Iterator, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+
+class Token(NamedTuple):
+    access_token: str
+    refresh_token: str
+    expires_at: datetime
+
+
+class TokenStore(ABC):
+    # somewhere tokens can be shared between processes, with a lock held by
+    # whichever process is refreshing a token so the others wait for it and
+    # pick up the result instead of using a refresh token that's been rotated
+    @abstractmethod
+    def load(self, key: str) -> Optional[Token]: ...
+
+    @abstractmethod
+    def save(self, key: str, token: Token) -> None: ...
+
+    @abstractmethod
+    def lock(self, key: str) -> ContextManager[None]: ...
+
+
+def _to_timestamp(expires_at: datetime) -> float:
+    return expires_at.timestamp()
+
+
+def _from_timestamp(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+class FileTokenStore(TokenStore):
+    def __init__(self, directory: str) -> None:
+        # one JSON file per key, plus a lock file for each that's held with
+        # flock (or msvcrt.locking on Windows) while refreshing
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def load(self, key: str) -> Optional[Token]:
+        try:
+            with open(self._path(key, "json"), "r") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return None
+        return Token(
+            stored["access_token"],
+            stored["refresh_token"],
+            _from_timestamp(stored["expires_at"]),
+        )
+
+    def save(self, key: str, token: Token) -> None:
+        # written to a temporary file and renamed over the old one, so that a
+        # reader never sees half a token
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                {
+                    "access_token": token.access_token,
+                    "refresh_token": token.refresh_token,
+                    "expires_at": _to_timestamp(token.expires_at),
+                },
+                f,
+            )
+        os.replace(tmp_path, self._path(key, "json"))
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with open(self._path(key, "lock"), "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:  # pragma: no cover
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:  # pragma: no cover
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SQLiteTokenStore(TokenStore):
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        # the lock is a write transaction on the whole database, so it is
+        # shared by every key, but refreshes are rare enough for that not
+        # to matter
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        # key -> the connection whose transaction is holding its lock
+        self._held: Dict[str, sqlite3.Connection] = {}
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "key TEXT PRIMARY KEY, "
+            "access_token TEXT NOT NULL, "
+            "refresh_token TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self, key: Optional[str] = None) -> sqlite3.Connection:
+        # while a key is locked it's read and written through the lock's
+        # connection, as any other would have to wait for the lock
+        if key is not None and key in self._held:
+            return self._held[key]
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def load(self, key: str) -> Optional[Token]:
+        row = (
+            self._connection(key)
+            .execute(
+                "SELECT access_token, refresh_token, expires_at FROM tokens "
+                "WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return Token(row[0], row[1], _from_timestamp(row[2]))
+
+    def save(self, key: str, token: Token) -> None:
+        self._connection(key).execute(
+            "INSERT OR REPLACE INTO tokens "
+            "(key, access_token, refresh_token, expires_at) VALUES (?, ?, ?, ?)",
+            (
+                key,
+                token.access_token,
+                token.refresh_token,
+                _to_timestamp(token.expires_at),
+            ),
+        )
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        # each lock has a connection of its own, which AsyncEtsyAPI takes on
+        # one thread and releases on another
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            self._held[key] = connection
+            try:
+                yield
+            except BaseException:
+                del self._held[key]
+                connection.execute("ROLLBACK")
+                raise
+            del self._held[key]
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
@@ -0,0 +1,19 @@
+import pytest
+
+# options that mean the benchmarks are being run to be measured
+MEASURE_OPTIONS = (
+    "benchmark_only",
+    "benchmark_enable",
+    "benchmark_save",
+    "benchmark_autosave",
+    "benchmark_compare",
+    "benchmark_json",
+)
+
+
+@pytest.fixture
+def benchmark(benchmark, request):
+    # run each benchmark once, as an ordinary test, in a normal test run
+    if not any(request.config.getoption(o, None) for o in MEASURE_OPTIONS):
+        benchmark.disabled = True
+    return benchmark
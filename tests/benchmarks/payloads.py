@@ -0,0 +1,50 @@
+def inventory_response(variations):
+    # a get_listing_inventory response with colour x size products
+    colours = max(variations // 10, 1)
+    products = []
+    for c in range(colours):
+        for s in range(variations // colours):
+            products.append(
+                {
+                    "product_id": 1000 + len(products),
+                    "sku": f"MUG-{c}-{s}",
+                    "is_deleted": False,
+                    "offerings": [
+                        {
+                            "offering_id": 5000 + len(products),
+                            "quantity": c + s,
+                            "is_enabled": True,
+                            "is_deleted": False,
+                            "price": {
+                                "amount": 1250 + s,
+                                "divisor": 100,
+                                "currency_code": "GBP",
+                            },
+                        }
+                    ],
+                    "property_values": [
+                        {
+                            "property_id": 200,
+                            "property_name": "Primary color",
+                            "scale_id": None,
+                            "scale_name": None,
+                            "value_ids": [c],
+                            "values": [f"Colour {c}"],
+                        },
+                        {
+                            "property_id": 100,
+                            "property_name": "Size",
+                            "scale_id": 1,
+                            "scale_name": "Letters",
+                            "value_ids": [s],
+                            "values": [f"Size {s}"],
+                        },
+                    ],
+                }
+            )
+    return {
+        "products": products,
+        "price_on_property": [100],
+        "quantity_on_property": [100, 200],
+        "sku_on_property": [100, 200],
+    }
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from etsyv3 import EtsyAPI
+from etsyv3.etsy_api import ETSY_API_BASEURL, Method
+from etsyv3.models.listing_request import UpdateListingInventoryRequest
+from etsyv3.testing import MockEtsy, install
+from etsyv3.util import RateLimiter
+from tests.benchmarks.payloads import inventory_response
+
+RECEIPT_QUERY = {
+    "limit": 100,
+    "offset": 200,
+    "was_paid": True,
+    "was_shipped": False,
+    "was_canceled": None,
+    "min_created": 1700000000,
+    "max_created": 1710000000,
+    "min_last_modified": None,
+    "max_last_modified": None,
+    "sort_on": "created",
+    "sort_order": "desc",
+    "was_delivered": None,
+}
+
+
+@pytest.fixture
+def etsy():
+    # answered in-process, with nothing held back by the rate limiter
+    mock = MockEtsy()
+    mock.add_shop(1)
+    mock.add_listing(1, listing_id=2, sku="MUG")
+    etsy = EtsyAPI(
+        "",
+        "",
+        "1.token",
+        "",
+        datetime.now() + timedelta(hours=1),
+        rate_limiter=RateLimiter(per_second=1e9, per_day=1e12),
+    )
+    install(etsy, mock)
+    return etsy
+
+
+def test_generate_get_uri(benchmark):
+    uri = benchmark(
+        EtsyAPI._generate_get_uri,
+        f"{ETSY_API_BASEURL}/shops/1/receipts",
+        **RECEIPT_QUERY,
+    )
+    assert uri.endswith("sort_order=desc")
+
+
+def test_get(benchmark, etsy):
+    listing = benchmark(etsy._issue_request, f"{ETSY_API_BASEURL}/listings/2")
+    assert listing["listing_id"] == 2
+
+
+def test_put_inventory(benchmark, etsy):
+    request = UpdateListingInventoryRequest.generate_request_from_inventory_response(
+        inventory_response(100)
+    )
+    inventory = benchmark(
+        etsy._issue_request,
+        f"{ETSY_API_BASEURL}/listings/2/inventory",
+        Method.PUT,
+        request,
+    )
+    assert len(inventory["products"]) == 100
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from etsyv3.models.listing_request import UpdateListingInventoryRequest
+from etsyv3.util.inventory import diff_inventory
+from etsyv3.util.todict import todict
+from tests.benchmarks.payloads import inventory_response
+
+
+@pytest.fixture
+def inventory_request():
+    return UpdateListingInventoryRequest.generate_request_from_inventory_response(
+        inventory_response(400)
+    )
+
+
+def test_todict(benchmark, inventory_request):
+    result = benchmark(todict, inventory_request)
+    assert len(result["products"]) == 400
+
+
+def test_get_dict(benchmark, inventory_request):
+    result = benchmark(inventory_request.get_dict)
+    assert result == todict(inventory_request)
+
+
+def test_generate_request_from_inventory_response(benchmark):
+    result = benchmark(
+        UpdateListingInventoryRequest.generate_request_from_inventory_response,
+        inventory_response(400),
+    )
+    assert len(result.products) == 400
+
+
+def test_diff_inventory(benchmark, inventory_request):
+    diff = benchmark(diff_inventory, inventory_response(400), inventory_request)
+    assert not diff.has_changes
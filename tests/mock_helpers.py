@@ -1,12 +1,28 @@
+import json
+
+
 class MockResponse:
-    def __init__(self, json_data, status_code):
+    def __init__(self, json_data, status_code, headers=None, content=None):
         self.json_data = json_data
         self.status_code = status_code
+        self.headers = headers if headers is not None else {}
+        if content is None:
+            content = json.dumps(json_data).encode("utf-8")
+        self.content = content
 
     def json(self):
         return self.json_data
 
 
+class FakeClock:
+    # stands in for time.monotonic, moved on by setting `now`
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
 def mocked_requests_get(*args, **kwargs):
     uri = args[0]
     if "users/UNAUTHORIZED" in uri:
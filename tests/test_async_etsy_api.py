@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import tests.mock_helpers
+from etsyv3 import AsyncEtsyAPI
+from etsyv3.etsy_api import ETSY_API_BASEURL, NotFound, Unauthorised
+
+EXPIRY_FUTURE = datetime.utcnow() + timedelta(hours=1)
+EXPIRY_PAST = datetime.utcnow() - timedelta(hours=1)
+KEYSTRING = ""
+SHARED_SECRET = ""
+TOKEN = "12345.token"
+REFRESH_TOKEN = ""
+
+
+async def mocked_async_get(*args, **kwargs):
+    uri = args[0]
+    if uri.endswith("/listings/404"):
+        return tests.mock_helpers.MockResponse({"error": "Not found"}, 404)
+    return tests.mock_helpers.mocked_requests_get(*args, **kwargs)
+
+
+async def mocked_async_refresh(*args, **kwargs):
+    return tests.mock_helpers.MockResponse(
+        {"access_token": "new", "refresh_token": "new_refresh", "expires_in": 3600},
+        200,
+    )
+
+
+class TestAsyncEtsyAPI(unittest.IsolatedAsyncioTestCase):
+    @mock.patch("httpx.AsyncClient.get", side_effect=mocked_async_get)
+    async def test_get_user_unauthorised(self, mock_get):
+        async with AsyncEtsyAPI(
+            KEYSTRING, SHARED_SECRET, TOKEN, REFRESH_TOKEN, EXPIRY_FUTURE
+        ) as etsy:
+            with self.assertRaises(Unauthorised):
+                await etsy.get_user("UNAUTHORIZED")
+
+    @mock.patch("httpx.AsyncClient.get", side_effect=mocked_async_get)
+    async def test_get_listing_not_found(self, mock_get):
+        async with AsyncEtsyAPI(
+            KEYSTRING, SHARED_SECRET, TOKEN, REFRESH_TOKEN, EXPIRY_FUTURE
+        ) as etsy:
+            with self.assertRaises(NotFound):
+                await etsy.get_listing(404)
+            mock_get.assert_called_with(
+                f"{ETSY_API_BASEURL}/listings/404", headers=None
+            )
+
+    @mock.patch("httpx.AsyncClient.send", side_effect=mocked_async_refresh)
+    @mock.patch("httpx.AsyncClient.get", side_effect=mocked_async_get)
+    async def test_refresh_on_expired_token(self, mock_get, mock_send):
+        saved = []
+        async with AsyncEtsyAPI(
+            KEYSTRING,
+            SHARED_SECRET,
+            TOKEN,
+            REFRESH_TOKEN,
+            EXPIRY_PAST,
+            lambda *args: saved.append(args),
+        ) as etsy:
+            await etsy.get_authenticated_user()
+            self.assertEqual("new", etsy.token)
+            self.assertEqual("Bearer new", etsy.session.headers["Authorization"])
+            self.assertEqual(1, len(saved))
+            mock_send.assert_called_once()
+            self.assertNotIn("Authorization", mock_send.call_args[0][0].headers)
+            mock_get.assert_called_once()
@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from etsyv3 import AsyncEtsyAPI, EtsyAPI
+from etsyv3.etsy_api import NotFound
+from etsyv3.util.batching import AsyncListingLoader, ListingLoader
+from tests.mock_helpers import MockResponse
+
+EXPIRY_FUTURE = datetime.utcnow() + timedelta(hours=1)
+MISSING_ID = 404
+
+
+def mocked_batch_get(uri, *args, **kwargs):
+    query = parse_qs(urlparse(uri).query)
+    ids = [int(x) for x in query["listing_ids"][0].split(",")]
+    results = [{"listing_id": x} for x in ids if x != MISSING_ID]
+    return MockResponse({"count": len(results), "results": results}, 200)
+
+
+async def mocked_async_batch_get(uri, *args, **kwargs):
+    return mocked_batch_get(uri, *args, **kwargs)
+
+
+class TestListingLoader(unittest.TestCase):
+    @mock.patch("requests.Session.get", side_effect=mocked_batch_get)
+    def test_concurrent_calls_are_coalesced(self, mock_get):
+        loader = ListingLoader(EtsyAPI("", "", "", "", EXPIRY_FUTURE), window=0.05)
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            listings = list(executor.map(loader.get_listing, range(10)))
+        self.assertEqual(list(range(10)), [x["listing_id"] for x in listings])
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch("requests.Session.get", side_effect=mocked_batch_get)
+    def test_full_batch_is_sent_immediately(self, mock_get):
+        loader = ListingLoader(
+            EtsyAPI("", "", "", "", EXPIRY_FUTURE), window=60, max_batch_size=3
+        )
+        futures = [loader.load(x) for x in range(3)]
+        self.assertEqual(2, futures[2].result(timeout=5)["listing_id"])
+
+    @mock.patch("requests.Session.get", side_effect=mocked_batch_get)
+    def test_missing_listing_raises_not_found(self, mock_get):
+        loader = ListingLoader(EtsyAPI("", "", "", "", EXPIRY_FUTURE), window=0.01)
+        found = loader.load(1)
+        with self.assertRaises(NotFound):
+            loader.get_listing(MISSING_ID)
+        self.assertEqual(1, found.result()["listing_id"])
+
+    @mock.patch("requests.Session.get", side_effect=mocked_batch_get)
+    def test_cancelled_load_is_skipped(self, mock_get):
+        loader = ListingLoader(EtsyAPI("", "", "", "", EXPIRY_FUTURE), window=60)
+        cancelled = loader.load(1)
+        self.assertTrue(cancelled.cancel())
+        kept = loader.load(2)
+        loader._flush(())
+        self.assertEqual(2, kept.result(timeout=5)["listing_id"])
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(
+            ["2"], parse_qs(urlparse(mock_get.call_args[0][0]).query)["listing_ids"]
+        )
+
+
+class TestAsyncListingLoader(unittest.IsolatedAsyncioTestCase):
+    @mock.patch("httpx.AsyncClient.get", side_effect=mocked_async_batch_get)
+    async def test_concurrent_calls_are_coalesced(self, mock_get):
+        async with AsyncEtsyAPI("", "", "", "", EXPIRY_FUTURE) as etsy:
+            loader = AsyncListingLoader(etsy)
+            listings = await asyncio.gather(
+                *[loader.get_listing(x) for x in range(5)],
+                loader.get_listing(MISSING_ID),
+                return_exceptions=True,
+            )
+        self.assertEqual(list(range(5)), [x["listing_id"] for x in listings[:5]])
+        self.assertIsInstance(listings[5], NotFound)
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch("httpx.AsyncClient.get", side_effect=mocked_async_batch_get)
+    async def test_dispatch_is_kept_until_done(self, mock_get):
+        async with AsyncEtsyAPI("", "", "", "", EXPIRY_FUTURE) as etsy:
+            loader = AsyncListingLoader(etsy, window=60)
+            pending = asyncio.ensure_future(loader.get_listing(1))
+            await asyncio.sleep(0)
+            loader._flush(())
+            self.assertEqual(1, len(loader._tasks))
+            self.assertEqual(1, (await pending)["listing_id"])
+            await asyncio.sleep(0)
+            self.assertEqual(set(), loader._tasks)
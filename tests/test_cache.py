@@ -0,0 +1,102 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from etsyv3 import EtsyAPI
+from etsyv3.etsy_api import ETSY_API_BASEURL
+from etsyv3.models.shop_request import UpdateShopSectionRequest
+from etsyv3.util.cache import ResponseCache
+from etsyv3.util.routes import route_template
+from tests.mock_helpers import FakeClock, MockResponse
+
+EXPIRY_FUTURE = datetime.utcnow() + timedelta(hours=1)
+SECTIONS = {"count": 1, "results": [{"shop_section_id": 2, "title": "Hats"}]}
+
+
+class TestRouteTemplate(unittest.TestCase):
+    def test_route_template(self):
+        self.assertEqual(
+            "/shops/{shop_id}/sections/{section_id}",
+            route_template(f"{ETSY_API_BASEURL}/shops/1/sections/2"),
+        )
+        self.assertEqual(
+            "/shops/{shop_id}/payment-account/ledger-entries/{ledger_entry_id}",
+            route_template(
+                f"{ETSY_API_BASEURL}/shops/1/payment-account/ledger-entries/3"
+            ),
+        )
+        self.assertEqual(
+            "/shipping-carriers",
+            route_template(
+                f"{ETSY_API_BASEURL}/shipping-carriers?origin_country_iso=GB"
+            ),
+        )
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_only_configured_routes_are_cached(self):
+        cache = ResponseCache()
+        cache.store(f"{ETSY_API_BASEURL}/shops/1/sections", b"{}", {})
+        cache.store(f"{ETSY_API_BASEURL}/shops/1/receipts", b"{}", {})
+        self.assertIsNotNone(cache.get(f"{ETSY_API_BASEURL}/shops/1/sections"))
+        self.assertIsNone(cache.get(f"{ETSY_API_BASEURL}/shops/1/receipts"))
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttls={"/ping": 10}, clock=clock)
+        cache.store("/ping", b"{}", {})
+        self.assertTrue(cache.is_fresh(cache.get("/ping")))
+        clock.now += 11
+        self.assertFalse(cache.is_fresh(cache.get("/ping")))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResponseCache(default_ttl=60, max_size=2)
+        cache.store("/a", b"{}", {})
+        cache.store("/b", b"{}", {})
+        cache.get("/a")
+        cache.store("/c", b"{}", {})
+        self.assertIsNotNone(cache.get("/a"))
+        self.assertIsNone(cache.get("/b"))
+
+    def test_invalidate_for_write(self):
+        cache = ResponseCache(default_ttl=60)
+        cache.store("/shops/1/sections", b"{}", {})
+        cache.store("/shops/1/sections/2", b"{}", {})
+        cache.store("/shops/1", b"{}", {})
+        cache.invalidate_for_write("PUT", "/shops/1/sections/2")
+        self.assertIsNone(cache.get("/shops/1/sections"))
+        self.assertIsNone(cache.get("/shops/1/sections/2"))
+        self.assertIsNotNone(cache.get("/shops/1"))
+
+    def test_invalidation_hook(self):
+        cache = ResponseCache(default_ttl=60)
+        cache.store("/shops/1/listings", b"{}", {})
+        cache.add_invalidation_hook(lambda method, uri: ["/shops/1/listings"])
+        cache.invalidate_for_write("PUT", "/listings/5/inventory")
+        self.assertIsNone(cache.get("/shops/1/listings"))
+
+
+class TestEtsyAPICaching(unittest.TestCase):
+    @mock.patch("requests.Session.put", return_value=MockResponse(SECTIONS, 200))
+    @mock.patch("requests.Session.get", return_value=MockResponse(SECTIONS, 200))
+    def test_sections_cached_until_updated(self, mock_get, mock_put):
+        etsy = EtsyAPI("", "", "", "", EXPIRY_FUTURE, cache=ResponseCache())
+        self.assertEqual(SECTIONS, etsy.get_shop_sections(1))
+        self.assertEqual(SECTIONS, etsy.get_shop_sections(1))
+        self.assertEqual(1, mock_get.call_count)
+        etsy.update_shop_section(1, 2, UpdateShopSectionRequest("Scarves"))
+        etsy.get_shop_sections(1)
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch("requests.Session.get")
+    def test_stale_entry_is_revalidated(self, mock_get):
+        clock = FakeClock()
+        mock_get.side_effect = [
+            MockResponse(SECTIONS, 200, {"etag": '"v1"'}),
+            MockResponse(None, 304),
+        ]
+        etsy = EtsyAPI("", "", "", "", EXPIRY_FUTURE, cache=ResponseCache(clock=clock))
+        etsy.get_shop_sections(1)
+        clock.now += 7200
+        self.assertEqual(SECTIONS, etsy.get_shop_sections(1))
+        self.assertEqual({"If-None-Match": '"v1"'}, mock_get.call_args[1]["headers"])
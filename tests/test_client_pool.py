@@ -0,0 +1,76 @@
+import socket
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from etsyv3 import EtsyClientPool
+from etsyv3.client_pool import keepalive_socket_options
+from tests.mock_helpers import FakeClock, MockResponse
+
+URI = "https://api.etsy.com/v3/application/openapi-ping"
+
+
+def credentials(tenant):
+    return f"{tenant}.token", f"{tenant}.refresh", datetime.now() + timedelta(hours=1)
+
+
+class TestEtsyClientPool(unittest.TestCase):
+    def test_tenants_share_adapter_not_credentials(self):
+        pool = EtsyClientPool("key", "secret", credentials)
+        first = pool.get("1")
+        second = pool.get("2")
+        self.assertIs(pool.adapter, first.session.get_adapter(URI))
+        self.assertIs(pool.adapter, second.session.get_adapter(URI))
+        self.assertEqual("Bearer 1.token", first.session.headers["Authorization"])
+        self.assertEqual("Bearer 2.token", second.session.headers["Authorization"])
+        self.assertIs(first.rate_limiter, second.rate_limiter)
+        self.assertIs(first, pool.get("1"))
+
+    def test_unknown_tenant_without_credentials(self):
+        pool = EtsyClientPool("key", "secret")
+        pool.add("1", *credentials("1"))
+        self.assertIn("1", pool)
+        with self.assertRaises(KeyError):
+            pool.get("2")
+
+    def test_least_recently_used_evicted(self):
+        pool = EtsyClientPool("key", "secret", credentials, max_clients=2)
+        first = pool.get("1")
+        pool.get("2")
+        pool.get("1")
+        pool.get("3")
+        self.assertEqual(2, len(pool))
+        self.assertNotIn("2", pool)
+        self.assertIs(first, pool.get("1"))
+
+    def test_idle_tenants_evicted(self):
+        clock = FakeClock(now=0.0)
+        pool = EtsyClientPool(
+            "key", "secret", credentials, idle_timeout=60, clock=clock
+        )
+        pool.get("1")
+        clock.now = 30
+        pool.get("2")
+        clock.now = 70
+        pool.evict_idle()
+        self.assertNotIn("1", pool)
+        self.assertIn("2", pool)
+
+    @mock.patch(
+        "requests.Session.post",
+        return_value=MockResponse(
+            {"access_token": "1.new", "refresh_token": "r", "expires_in": 3600}, 200
+        ),
+    )
+    def test_refresh_save_gets_tenant(self, mock_post):
+        saved = []
+        pool = EtsyClientPool(
+            "key", "secret", credentials, refresh_save=lambda *x: saved.append(x)
+        )
+        pool.get("1").refresh()
+        self.assertEqual("1", saved[0][0])
+        self.assertEqual("1.new", saved[0][1])
+
+    def test_keepalive_socket_options(self):
+        options = keepalive_socket_options(30)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
@@ -0,0 +1,60 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from etsyv3 import EtsyAPI
+from etsyv3.models.shop_request import CreateShopSectionRequest
+from etsyv3.util.codec import STDLIB_CODEC, get_codec
+from tests.mock_helpers import MockResponse
+
+LISTINGS = {"count": 1, "results": [{"listing_id": 1, "title": "Café mug"}]}
+
+
+class TestCodec(unittest.TestCase):
+    def test_round_trip(self):
+        for codec in {get_codec(), STDLIB_CODEC}:
+            encoded = codec.encode(LISTINGS)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(LISTINGS, json.loads(encoded))
+            self.assertEqual(LISTINGS, codec.decode(json.dumps(LISTINGS).encode()))
+
+    def test_get_codec(self):
+        self.assertIs(STDLIB_CODEC, get_codec("json"))
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+    def test_orjson_preferred(self):
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            self.skipTest("orjson isn't installed")
+        self.assertEqual("orjson", get_codec().name)
+
+
+class TestEtsyAPICodec(unittest.TestCase):
+    def get_api(self, codec=None):
+        return EtsyAPI(
+            "",
+            "",
+            "1.token",
+            "",
+            datetime.now() + timedelta(hours=1),
+            codec=codec,
+        )
+
+    @mock.patch("requests.Session.get", return_value=MockResponse(LISTINGS, 200))
+    def test_decodes_response_content(self, mock_get):
+        codec = mock.Mock(wraps=STDLIB_CODEC)
+        etsy = self.get_api(codec)
+        self.assertEqual(LISTINGS, etsy.get_listings_by_shop(1))
+        codec.decode.assert_called_once_with(json.dumps(LISTINGS).encode())
+
+    @mock.patch("requests.Session.post", return_value=MockResponse({}, 201))
+    def test_encodes_payload_to_bytes(self, mock_post):
+        etsy = self.get_api()
+        etsy.create_shop_section(1, CreateShopSectionRequest("Mugs"))
+        kwargs = mock_post.call_args[1]
+        self.assertIsInstance(kwargs["data"], bytes)
+        self.assertEqual({"title": "Mugs"}, json.loads(kwargs["data"]))
+        self.assertEqual("application/json", kwargs["headers"]["Content-Type"])
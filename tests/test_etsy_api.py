@@ -4,7 +4,8 @@ from unittest import mock
 
 import tests.mock_helpers
 from etsyv3 import EtsyAPI
-from etsyv3.etsy_api import ETSY_API_BASEURL, Unauthorised
+from etsyv3.etsy_api import ETSY_API_BASEURL, TooManyRequests, Unauthorised
+from etsyv3.util import RateLimiter, RetryPolicy
 
 EXPIRY_FUTURE = datetime.utcnow() + timedelta(hours=1)
 EXPIRY_PAST = datetime.utcnow() - timedelta(hours=1)
@@ -56,3 +57,26 @@ class TestEtsyAPI(unittest.TestCase):
         etsy = EtsyAPI(KEYSTRING, TOKEN, REFRESH_TOKEN, EXPIRY_FUTURE, fn_save)
         etsy.get_authenticated_user()
         mock_get.assert_called()
+
+    @mock.patch(
+        "requests.Session.get",
+        return_value=tests.mock_helpers.MockResponse(
+            {"error": "Too many requests"},
+            429,
+            {"x-limit-per-second": "5", "x-remaining-this-second": "0"},
+        ),
+    )
+    def test_too_many_requests_recalibrates_limiter(self, mock_get):
+        limiter = RateLimiter()
+        etsy = EtsyAPI(
+            KEYSTRING,
+            "",
+            TOKEN,
+            REFRESH_TOKEN,
+            EXPIRY_FUTURE,
+            rate_limiter=limiter,
+            retry_policy=RetryPolicy(max_retries=0),
+        )
+        with self.assertRaises(TooManyRequests):
+            etsy.ping()
+        self.assertEqual(5, limiter.per_second)
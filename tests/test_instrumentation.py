@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import requests
+
+from etsyv3 import AsyncEtsyAPI, EtsyAPI
+from etsyv3.etsy_api import NotFound
+from etsyv3.models.listing_request import UpdateListingInventoryRequest
+from etsyv3.testing import MockEtsy, install
+from etsyv3.util import LoggingHook, PrometheusHook, RetryPolicy
+from etsyv3.util.cache import ResponseCache
+from etsyv3.util.instrumentation import RequestEvent, prometheus_client
+from tests.mock_helpers import MockResponse
+from tests.test_token_refresh import REFRESHED
+
+EXPIRY_FUTURE = datetime.utcnow() + timedelta(hours=1)
+
+
+def get_api(expiry=EXPIRY_FUTURE, cls=EtsyAPI, **kwargs):
+    events = []
+    etsy = cls(
+        "", "", "1.token", "refresh", expiry, request_hooks=[events.append], **kwargs
+    )
+    return etsy, events
+
+
+def event(**kwargs):
+    fields = dict(
+        method="GET",
+        route="/listings/{listing_id}",
+        status=200,
+        queue_time=0.01,
+        connect_time=None,
+        server_time=0.2,
+        decode_time=0.001,
+        request_bytes=0,
+        response_bytes=1234,
+        retries=0,
+        refreshed=False,
+    )
+    fields.update(kwargs)
+    return RequestEvent(**fields)
+
+
+class TestRequestHooks(unittest.TestCase):
+    @mock.patch("requests.Session.get", return_value=MockResponse({"a": 1}, 200))
+    def test_event_per_request(self, mock_get):
+        etsy, events = get_api()
+        etsy.get_listing(123)
+        etsy.get_listing(456)
+        self.assertEqual(2, len(events))
+        first = events[0]
+        self.assertEqual("GET", first.method)
+        self.assertEqual("/listings/{listing_id}", first.route)
+        self.assertEqual(200, first.status)
+        self.assertEqual(len(b'{"a": 1}'), first.response_bytes)
+        self.assertEqual(0, first.request_bytes)
+        self.assertEqual(0, first.retries)
+        self.assertFalse(first.refreshed)
+        # requests doesn't say how long connecting took
+        self.assertIsNone(first.connect_time)
+        self.assertGreaterEqual(first.duration, first.server_time)
+
+    @mock.patch(
+        "requests.Session.get",
+        side_effect=[MockResponse(None, 503), MockResponse({}, 200)],
+    )
+    def test_retries_counted_once(self, mock_get):
+        etsy, events = get_api(retry_policy=RetryPolicy(backoff_base=0.01))
+        etsy.ping()
+        self.assertEqual(1, len(events))
+        self.assertEqual(1, events[0].retries)
+        self.assertEqual(200, events[0].status)
+
+    @mock.patch("requests.Session.get", return_value=MockResponse({"e": 1}, 404))
+    def test_error_status(self, mock_get):
+        etsy, events = get_api()
+        with self.assertRaises(NotFound):
+            etsy.get_listing(1)
+        self.assertEqual(404, events[0].status)
+
+    @mock.patch("requests.Session.get", side_effect=requests.ConnectionError)
+    def test_connection_error(self, mock_get):
+        etsy, events = get_api(retry_policy=RetryPolicy(max_retries=0))
+        with self.assertRaises(requests.ConnectionError):
+            etsy.ping()
+        self.assertIsNone(events[0].status)
+
+    @mock.patch("requests.Session.get", return_value=MockResponse({}, 200))
+    @mock.patch("requests.Session.post", return_value=MockResponse(REFRESHED, 200))
+    def test_refresh(self, mock_post, mock_get):
+        etsy, events = get_api(datetime.utcnow() - timedelta(hours=1))
+        etsy.ping()
+        etsy.ping()
+        self.assertEqual([True, False], [e.refreshed for e in events])
+
+    @mock.patch("requests.Session.get", return_value=MockResponse({}, 200))
+    def test_broken_hook_does_not_fail_request(self, mock_get):
+        etsy, events = get_api()
+        etsy.request_hooks.insert(0, mock.Mock(side_effect=ValueError))
+        with self.assertLogs("etsyv3.util.instrumentation", logging.ERROR):
+            self.assertEqual({}, etsy.ping())
+        self.assertEqual(1, len(events))
+
+    @mock.patch("requests.Session.get")
+    def test_cache_hits(self, mock_get):
+        mock_get.side_effect = [
+            MockResponse({"results": []}, 200, {"etag": '"v1"'}),
+            MockResponse(None, 304),
+        ]
+        etsy, events = get_api(
+            cache=ResponseCache(ttls={"/shops/{shop_id}/sections": 60})
+        )
+        etsy.get_shop_sections(1)
+        etsy.get_shop_sections(1)
+        etsy.cache.clock = lambda: float("inf")
+        etsy.get_shop_sections(1)
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual([False, True, True], [e.cached for e in events])
+        self.assertEqual([200, 200, 304], [e.status for e in events])
+        fresh = events[1]
+        self.assertEqual("/shops/{shop_id}/sections", fresh.route)
+        self.assertEqual(0, fresh.server_time)
+        self.assertEqual(0, fresh.response_bytes)
+
+    def test_request_bytes(self):
+        mock_etsy = MockEtsy()
+        mock_etsy.add_shop(1)
+        listing = mock_etsy.add_listing(1, sku="MUG")
+        etsy, events = get_api()
+        install(etsy, mock_etsy)
+        inventory = etsy.get_listing_inventory(listing["listing_id"])
+        request = (
+            UpdateListingInventoryRequest.generate_request_from_inventory_response(
+                inventory
+            )
+        )
+        etsy.update_listing_inventory(listing["listing_id"], request)
+        self.assertEqual("PUT", events[1].method)
+        self.assertEqual("/listings/{listing_id}/inventory", events[1].route)
+        self.assertEqual(len(etsy._encode(request)), events[1].request_bytes)
+        self.assertGreater(events[1].response_bytes, 0)
+
+    def test_async(self):
+        mock_etsy = MockEtsy()
+        mock_etsy.add_shop(1)
+        listing = mock_etsy.add_listing(1, sku="MUG")
+
+        async def run():
+            etsy, events = get_api(cls=AsyncEtsyAPI)
+            install(etsy, mock_etsy)
+            async with etsy:
+                await etsy.get_listing(listing["listing_id"])
+            return events
+
+        events = asyncio.run(run())
+        self.assertEqual(200, events[0].status)
+        # nothing to connect to in-process, but httpx would have said
+        self.assertEqual(0.0, events[0].connect_time)
+
+
+class TestLoggingHook(unittest.TestCase):
+    def test_fields_on_record(self):
+        logger = logging.getLogger("etsyv3.test")
+        with self.assertLogs(logger, logging.INFO) as logs:
+            LoggingHook(logger)(event())
+            LoggingHook(logger)(event(status=None))
+        ok, failed = logs.records
+        self.assertEqual(logging.INFO, ok.levelno)
+        self.assertEqual("/listings/{listing_id}", ok.route)
+        self.assertEqual(1234, ok.response_bytes)
+        self.assertIn("GET /listings/{listing_id} 200", ok.getMessage())
+        self.assertEqual(logging.WARNING, failed.levelno)
+
+
+@unittest.skipIf(prometheus_client is None, "prometheus_client isn't installed")
+class TestPrometheusHook(unittest.TestCase):
+    def test_metrics(self):
+        registry = prometheus_client.CollectorRegistry()
+        hook = PrometheusHook(registry)
+        hook(event())
+        hook(event(status=429, retries=2, refreshed=True))
+        hook(event(cached=True))
+        labels = {"method": "GET", "route": "/listings/{listing_id}"}
+        value = registry.get_sample_value
+        requests = {**labels, "status": "200", "cached": "false"}
+        self.assertEqual(1, value("etsy_requests_total", requests))
+        self.assertEqual(
+            1, value("etsy_requests_total", {**requests, "cached": "true"})
+        )
+        self.assertEqual(1, value("etsy_requests_total", {**requests, "status": "429"}))
+        self.assertEqual(2, value("etsy_request_retries_total", labels))
+        self.assertEqual(1, value("etsy_token_refreshes_total"))
+        self.assertEqual(
+            3702, value("etsy_request_bytes_total", {**labels, "direction": "received"})
+        )
+        self.assertEqual(
+            3,
+            value("etsy_request_phase_seconds_count", {**labels, "phase": "server"}),
+        )
+        # connect time wasn't known, so isn't observed
+        self.assertIsNone(
+            value("etsy_request_phase_seconds_count", {**labels, "phase": "connect"})
+        )
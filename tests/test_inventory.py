@@ -0,0 +1,172 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from etsyv3 import AsyncEtsyAPI, EtsyAPI
+from etsyv3.models.listing_request import UpdateListingInventoryRequest
+from etsyv3.models.product import Product
+from etsyv3.testing import MockEtsy, install
+from etsyv3.util.inventory import diff_inventory
+from tests.mock_helpers import MockResponse
+
+EXPIRY_FUTURE = datetime.now() + timedelta(hours=1)
+
+
+def product(product_id, colour, colour_id, sku, quantity, amount=1250):
+    return {
+        "product_id": product_id,
+        "sku": sku,
+        "is_deleted": False,
+        "offerings": [
+            {
+                "offering_id": product_id * 10,
+                "quantity": quantity,
+                "is_enabled": True,
+                "is_deleted": False,
+                "price": {"amount": amount, "divisor": 100, "currency_code": "GBP"},
+            }
+        ],
+        "property_values": [
+            {
+                "property_id": 200,
+                "property_name": "Primary color",
+                "scale_id": None,
+                "scale_name": None,
+                "value_ids": [colour_id],
+                "values": [colour],
+            }
+        ],
+    }
+
+
+CURRENT = {
+    "products": [
+        product(1, "Blue", 1213, "MUG-B", 3),
+        product(2, "Red", 1220, "MUG-R", 0),
+    ],
+    "price_on_property": [],
+    "quantity_on_property": [200],
+    "sku_on_property": [200],
+}
+
+
+def desired():
+    return UpdateListingInventoryRequest.generate_request_from_inventory_response(
+        CURRENT
+    )
+
+
+class TestInventoryDiff(unittest.TestCase):
+    def test_unchanged(self):
+        self.assertFalse(diff_inventory(CURRENT, desired()).has_changes)
+
+    def test_price_and_order_differences_that_are_not_changes(self):
+        request = desired()
+        request.products.reverse()
+        request.products[0].offerings[0]["price"] = 12.5
+        request.quantity_on_property = [200]
+        self.assertFalse(diff_inventory(CURRENT, request).has_changes)
+
+    def test_changes(self):
+        request = desired()
+        request.products[0].offerings[0]["quantity"] = 2
+        request.products[1].sku = "MUG-RED"
+        request.products.append(
+            Product(
+                "MUG-G",
+                [{"property_id": 200, "values": ["Green"]}],
+                [{"price": 12.5, "quantity": 1, "is_enabled": True}],
+            )
+        )
+        request.price_on_property = [200]
+        diff = diff_inventory(CURRENT, request)
+        self.assertTrue(diff.has_changes)
+        self.assertEqual(["MUG-G"], [p.sku for p in diff.added])
+        self.assertEqual([], diff.removed)
+        self.assertEqual(
+            [("MUG-B", ["offerings"]), ("MUG-R", ["sku"])],
+            [(c.current["sku"], c.fields) for c in diff.modified],
+        )
+        self.assertEqual(["price_on_property"], diff.settings)
+
+    def test_removed_and_matched_by_value_id(self):
+        request = desired()
+        del request.products[1]
+        request.products[0].property_values[0].pop("values")
+        diff = diff_inventory(CURRENT, request)
+        self.assertEqual(["MUG-R"], [p["sku"] for p in diff.removed])
+        self.assertEqual([], diff.added)
+        self.assertEqual([], diff.modified)
+
+    def test_offering_fields_only_compared_when_given(self):
+        request = desired()
+        request.products[0].offerings[0]["readiness_state_id"] = 5
+        diff = diff_inventory(CURRENT, request)
+        self.assertEqual(["offerings"], diff.modified[0].fields)
+
+
+class TestUpdateIfChanged(unittest.TestCase):
+    def setUp(self):
+        self.etsy = EtsyAPI("", "", "1.token", "", EXPIRY_FUTURE)
+
+    @mock.patch("requests.Session.put", return_value=MockResponse({}, 200))
+    @mock.patch("requests.Session.get", return_value=MockResponse(CURRENT, 200))
+    def test_no_put_when_unchanged(self, mock_get, mock_put):
+        diff = self.etsy.update_listing_inventory_if_changed(1, desired())
+        self.assertFalse(diff.has_changes)
+        self.assertIsNone(diff.response)
+        mock_get.assert_called_once()
+        mock_put.assert_not_called()
+
+    @mock.patch("requests.Session.put", return_value=MockResponse({"ok": 1}, 200))
+    @mock.patch("requests.Session.get")
+    def test_put_when_changed(self, mock_get, mock_put):
+        request = desired()
+        request.products[1].offerings[0]["quantity"] = 4
+        diff = self.etsy.update_listing_inventory_if_changed(1, request, CURRENT)
+        self.assertEqual({"ok": 1}, diff.response)
+        mock_get.assert_not_called()
+        mock_put.assert_called_once()
+
+
+class TestUpdateIfChangedFromResponse(unittest.TestCase):
+    def test_request_generated_from_current(self):
+        # the request is built from the same response that's passed as
+        # current, so changing one mustn't change the other
+        mock_etsy = MockEtsy()
+        mock_etsy.add_shop(1)
+        listing_id = mock_etsy.add_listing(1, sku="MUG", quantity=5)["listing_id"]
+        etsy = EtsyAPI("", "", "1.token", "", EXPIRY_FUTURE)
+        install(etsy, mock_etsy)
+        current = etsy.get_listing_inventory(listing_id)
+        request = (
+            UpdateListingInventoryRequest.generate_request_from_inventory_response(
+                current
+            )
+        )
+        request.products[0].offerings[0]["quantity"] = 2
+        diff = etsy.update_listing_inventory_if_changed(listing_id, request, current)
+        self.assertEqual(["offerings"], diff.modified[0].fields)
+        self.assertEqual(2, etsy.get_listing(listing_id)["quantity"])
+        self.assertEqual(5, current["products"][0]["offerings"][0]["quantity"])
+
+
+class TestAsyncUpdateIfChanged(unittest.IsolatedAsyncioTestCase):
+    async def test_put_when_changed(self):
+        request = desired()
+        request.products[0].offerings[0]["is_enabled"] = False
+
+        async def get(*args, **kwargs):
+            return MockResponse(CURRENT, 200)
+
+        async def put(*args, **kwargs):
+            return MockResponse({"ok": 1}, 200)
+
+        with mock.patch("httpx.AsyncClient.get", side_effect=get), mock.patch(
+            "httpx.AsyncClient.put", side_effect=put
+        ) as mock_put:
+            async with AsyncEtsyAPI("", "", "1.token", "", EXPIRY_FUTURE) as etsy:
+                diff = await etsy.update_listing_inventory_if_changed(1, request)
+        self.assertEqual(["offerings"], diff.modified[0].fields)
+        self.assertEqual({"ok": 1}, diff.response)
+        mock_put.assert_called_once()
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from etsyv3 import EtsyAPI
+from etsyv3.util import RateLimiter
+from etsyv3.util.ledger_export import CSVSink, LedgerExporter, NDJSONSink
+from tests.mock_helpers import MockResponse
+
+START = 1_700_000_000
+
+
+class FakeLedger:
+    # serves ledger entries between min_created and max_created, inclusive,
+    # newest first
+    def __init__(self, timestamps):
+        self.entries = [
+            {"entry_id": i, "amount": 100 + i, "created_timestamp": t}
+            for i, t in enumerate(timestamps)
+        ]
+        self.max_offset = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, uri, **kwargs):
+        query = {k: int(v[0]) for k, v in parse_qs(urlsplit(uri).query).items()}
+        matching = [
+            e
+            for e in reversed(self.entries)
+            if query["min_created"] <= e["created_timestamp"] <= query["max_created"]
+        ]
+        offset = query.get("offset", 0)
+        with self.lock:
+            self.max_offset = max(self.max_offset, offset)
+        page = matching[offset : offset + query["limit"]]
+        return MockResponse({"count": len(matching), "results": page}, 200)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    # counts windows submitted whose results haven't been taken yet
+    outstanding = 0
+    max_outstanding = 0
+
+    def submit(self, fn, *args, **kwargs):
+        future = super().submit(fn, *args, **kwargs)
+        cls = CountingExecutor
+        cls.outstanding += 1
+        cls.max_outstanding = max(cls.max_outstanding, cls.outstanding)
+        result = future.result
+
+        def taken(timeout=None):
+            cls.outstanding -= 1
+            return result(timeout)
+
+        future.result = taken
+        return future
+
+
+class TestLedgerExporter(unittest.TestCase):
+    def setUp(self):
+        self.etsy = EtsyAPI(
+            "",
+            "",
+            "1.token",
+            "",
+            datetime.now() + timedelta(hours=1),
+            rate_limiter=RateLimiter(per_second=1000, per_day=100000),
+        )
+
+    def export(self, ledger, end, **kwargs):
+        exporter = LedgerExporter(self.etsy, 9, **kwargs)
+        batches = []
+        with mock.patch("requests.Session.get", side_effect=ledger):
+            result = exporter.export(START, end, batches.append)
+        return result, [entry for batch in batches for entry in batch]
+
+    def test_windows_are_split_and_exported_in_order(self):
+        # busy in the middle, with entries on window boundaries
+        timestamps = [START + i * 10 for i in range(100)] + [
+            START + 500 + i // 4 for i in range(400)
+        ]
+        ledger = FakeLedger(timestamps)
+        result, entries = self.export(
+            ledger, START + 1000, max_window_count=50, page_size=10
+        )
+        self.assertEqual(len(timestamps), result.entries)
+        self.assertEqual(len(timestamps), len({e["entry_id"] for e in entries}))
+        created = [e["created_timestamp"] for e in entries]
+        self.assertEqual(sorted(created), created)
+        self.assertLess(ledger.max_offset, 50)
+        self.assertGreater(result.windows, 8)
+
+    def test_splits_stay_within_concurrency(self):
+        CountingExecutor.outstanding = CountingExecutor.max_outstanding = 0
+        timestamps = [START + i for i in range(1000)]
+        with mock.patch(
+            "etsyv3.util.ledger_export.ThreadPoolExecutor", CountingExecutor
+        ):
+            result, entries = self.export(
+                FakeLedger(timestamps),
+                START + 1000,
+                max_window_count=20,
+                concurrency=3,
+            )
+        self.assertEqual(1000, result.entries)
+        created = [e["created_timestamp"] for e in entries]
+        self.assertEqual(timestamps, created)
+        self.assertLessEqual(CountingExecutor.max_outstanding, 3)
+
+    def test_last_window_includes_end(self):
+        ledger = FakeLedger([START, START + 50, START + 100])
+        result, entries = self.export(ledger, START + 100, concurrency=2)
+        self.assertEqual(3, result.entries)
+        self.assertEqual(2, result.windows)
+        self.assertEqual(2, result.requests)
+
+    def test_sinks(self):
+        entries = [{"entry_id": 1, "amount": -30, "payment_adjustments": []}]
+        out = io.BytesIO()
+        NDJSONSink(out)(entries)
+        self.assertEqual(
+            entries, [json.loads(line) for line in out.getvalue().splitlines()]
+        )
+        text = io.StringIO(newline="")
+        sink = CSVSink(text, fields=("entry_id", "amount"))
+        sink(entries)
+        sink(entries)
+        rows = list(csv.reader(io.StringIO(text.getvalue())))
+        self.assertEqual([["entry_id", "amount"], ["1", "-30"], ["1", "-30"]], rows)
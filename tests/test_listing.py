@@ -40,6 +40,19 @@ class TestListingRequest(unittest.TestCase):
         self.assertTrue("nullable" not in listing.get_dict().keys())
         self.assertEqual("i_did", listing.get_dict()["who_made"])
 
+    def test_slots(self):
+        product = Product("PRODUCT1", [], [])
+        self.assertFalse(hasattr(product, "__dict__"))
+        listing = UpdateListingRequest(title="A title!")
+        self.assertFalse(hasattr(listing, "__dict__"))
+        self.assertIs(UpdateListingRequest.nullable, listing._nullable)
+        with self.assertRaises(AttributeError):
+            listing.colour = "red"
+        self.assertEqual(
+            {"sku": "PRODUCT1", "property_values": None, "offerings": None},
+            todict(product),
+        )
+
     def test_listing_inventory_request(self):
         properties = [
             {
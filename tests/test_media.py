@@ -0,0 +1,110 @@
+import itertools
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from etsyv3 import EtsyAPI
+from etsyv3.util.media import (
+    FAILED,
+    FILE,
+    IMAGE,
+    REUSED,
+    SKIPPED,
+    UPLOADED,
+    VIDEO,
+    MediaIndex,
+    MediaUploader,
+    UploadItem,
+    media_kind,
+)
+from tests.mock_helpers import MockResponse
+
+
+class TestMediaUploader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mug = self.write("mug.jpg", b"mug")
+        self.copy = self.write("copy.jpg", b"mug")
+        self.pattern = self.write("pattern.pdf", b"pattern")
+        self.etsy = EtsyAPI("", "", "1.token", "", datetime.now() + timedelta(hours=1))
+        self.ids = itertools.count(100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, contents):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(contents)
+        return path
+
+    def respond(self, uri, **kwargs):
+        media_id = next(self.ids)
+        return MockResponse(
+            {"listing_image_id": media_id, "listing_file_id": media_id}, 201
+        )
+
+    def test_media_kind(self):
+        self.assertEqual(IMAGE, media_kind(self.mug))
+        self.assertEqual(VIDEO, media_kind("mug.mp4"))
+        self.assertEqual(FILE, media_kind(self.pattern))
+
+    def test_upload_then_skip(self):
+        manifest = [UploadItem(1, self.mug, rank=1), UploadItem(1, self.pattern)]
+        uploader = MediaUploader(self.etsy, 9, concurrency=2)
+        with mock.patch("requests.Session.post", side_effect=self.respond) as post:
+            results = uploader.upload(manifest)
+            self.assertEqual([UPLOADED, UPLOADED], [r.status for r in results])
+            self.assertEqual(manifest[1].path, results[1].item.path)
+            self.assertEqual(FILE, results[1].item.kind)
+            self.assertEqual(2, post.call_count)
+
+            results = uploader.upload(manifest)
+            self.assertEqual([SKIPPED, SKIPPED], [r.status for r in results])
+            self.assertEqual(2, post.call_count)
+
+    def test_same_image_is_reused_on_other_listings(self):
+        manifest = [
+            UploadItem(1, self.mug),
+            UploadItem(2, self.copy, rank=3),
+            UploadItem(3, self.mug),
+        ]
+        uploader = MediaUploader(self.etsy, 9)
+        with mock.patch("requests.Session.post", side_effect=self.respond) as post:
+            results = uploader.upload(manifest)
+        self.assertEqual([UPLOADED, REUSED, REUSED], [r.status for r in results])
+        self.assertEqual(3, post.call_count)
+        # only the first one sent the image itself
+        reuse = post.call_args_list[1]
+        self.assertEqual(
+            "https://api.etsy.com/v3/application/shops/9/listings/2/images",
+            reuse[0][0],
+        )
+        self.assertEqual(
+            {"listing_image_id": 100, "rank": 3}, json.loads(reuse[1]["data"])
+        )
+
+    def test_failures_are_reported_in_place(self):
+        manifest = [
+            UploadItem(1, os.path.join(self.tmp.name, "missing.jpg")),
+            UploadItem(1, self.mug),
+        ]
+        with mock.patch("requests.Session.post", side_effect=self.respond):
+            results = MediaUploader(self.etsy, 9).upload(manifest)
+        self.assertEqual([FAILED, UPLOADED], [r.status for r in results])
+        self.assertIsInstance(results[0].error, OSError)
+
+    def test_index_persists(self):
+        path = os.path.join(self.tmp.name, "media.sqlite3")
+        index = MediaIndex(path)
+        index.add(1, IMAGE, "abc", 100)
+        index.close()
+        index = MediaIndex(path)
+        self.assertEqual(100, index.get(1, IMAGE, "abc"))
+        self.assertEqual(100, index.find(IMAGE, "abc"))
+        index.forget(1)
+        self.assertIsNone(index.get(1, IMAGE, "abc"))
+        index.close()
@@ -0,0 +1,216 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from etsyv3 import AsyncEtsyAPI, EtsyAPI
+from etsyv3.enums import WhenMade, WhoMade
+from etsyv3.etsy_api import Includes, NotFound, TooManyRequests, Unauthorised
+from etsyv3.models.listing_request import (
+    CreateDraftListingRequest,
+    UpdateListingInventoryRequest,
+)
+from etsyv3.models.product import Product
+from etsyv3.testing import MockEtsy, MockEtsyServer, install
+from etsyv3.util import RateLimiter, RetryPolicy
+from etsyv3.util.media import UPLOADED, MediaUploader, UploadItem
+from etsyv3.util.receipt_sync import ReceiptSync
+
+EXPIRY_FUTURE = datetime.now() + timedelta(hours=1)
+
+
+def client(cls=EtsyAPI, **kwargs):
+    kwargs.setdefault("rate_limiter", RateLimiter(per_second=1000, per_day=100000))
+    return cls("keystring", "secret", "1.token", "1.refresh", EXPIRY_FUTURE, **kwargs)
+
+
+class TestMockEtsy(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockEtsy(seed=1)
+        self.shop = self.mock.add_shop(9)
+        self.etsy = client()
+        install(self.etsy, self.mock)
+
+    def test_listings_and_inventory(self):
+        draft = self.etsy.create_draft_listing(
+            9,
+            CreateDraftListingRequest(
+                quantity=2,
+                title="Mug",
+                description="A mug",
+                price=12.5,
+                who_made=WhoMade.I_DID,
+                when_made=WhenMade.MADE_TO_ORDER,
+                taxonomy_id=1,
+            ),
+        )
+        self.assertEqual("draft", draft["state"])
+        listing_id = draft["listing_id"]
+        self.assertEqual(1250, self.etsy.get_listing(listing_id)["price"]["amount"])
+
+        inventory = UpdateListingInventoryRequest(
+            [
+                Product(
+                    "MUG-" + colour,
+                    [{"property_id": 200, "values": [colour]}],
+                    [{"price": 12.5, "quantity": 3, "is_enabled": True}],
+                )
+                for colour in ("Blue", "Red")
+            ],
+            quantity_on_property=[200],
+        )
+        diff = self.etsy.update_listing_inventory_if_changed(listing_id, inventory)
+        self.assertEqual(2, len(diff.added))
+        diff = self.etsy.update_listing_inventory_if_changed(listing_id, inventory)
+        self.assertFalse(diff.has_changes)
+        self.assertEqual(
+            1, self.mock.calls[("PUT", "/listings/{listing_id}/inventory")]
+        )
+
+        batch = self.etsy.get_listings_by_listing_ids(
+            [listing_id, 1], includes=[Includes.INVENTORY]
+        )
+        self.assertEqual(1, batch["count"])
+        self.assertEqual(6, batch["results"][0]["quantity"])
+        self.assertEqual(
+            ["MUG-Blue", "MUG-Red"],
+            [p["sku"] for p in batch["results"][0]["inventory"]["products"]],
+        )
+
+        self.etsy.delete_listing(listing_id)
+        with self.assertRaises(NotFound):
+            self.etsy.get_listing(listing_id)
+
+    def test_generated_inventory_request(self):
+        # requests generated from a listing without properties send null
+        # property_values
+        listing_id = self.mock.add_listing(9, sku="MUG", quantity=5)["listing_id"]
+        request = (
+            UpdateListingInventoryRequest.generate_request_from_inventory_response(
+                self.etsy.get_listing_inventory(listing_id)
+            )
+        )
+        request.products[0].offerings[0]["quantity"] = 7
+        self.etsy.update_listing_inventory(listing_id, request)
+        self.assertEqual(7, self.etsy.get_listing(listing_id)["quantity"])
+
+    def test_image_uploads(self):
+        listings = [self.mock.add_listing(9)["listing_id"] for _ in range(2)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mug.jpg")
+            with open(path, "wb") as f:
+                f.write(os.urandom(1000))
+            results = MediaUploader(self.etsy, 9).upload(
+                [
+                    UploadItem(listing_id, path, alt_text="A mug")
+                    for listing_id in listings
+                ]
+            )
+        self.assertEqual(UPLOADED, results[0].status)
+        images = self.etsy.get_listing_images(listings[1])["results"]
+        self.assertEqual(1000, images[0]["full_size"])
+        self.assertEqual(results[1].media_id, images[0]["listing_image_id"])
+
+    def test_receipts_and_ledger(self):
+        now = int(datetime.now().timestamp())
+        for i in range(5):
+            self.mock.add_receipt(9, created_timestamp=now - 100 + i)
+        self.mock.add_ledger_entry(9, 500, created_timestamp=now - 50)
+        delivered = []
+        sync = ReceiptSync(self.etsy, 9, _MemoryStore(), delivered.extend, page_size=2)
+        self.assertEqual(5, sync.run().delivered)
+        entries = self.etsy.get_shop_payment_account_ledger_entries(9, now - 60, now)
+        self.assertEqual(500, entries["results"][0]["balance"])
+
+    def test_errors(self):
+        with self.assertRaises(NotFound):
+            self.etsy.get_shop(10)
+        self.mock.revoked.add("1.token")
+        with self.assertRaises(Unauthorised):
+            self.etsy.get_shop(9)
+        self.etsy.refresh()
+        self.assertEqual(9, self.etsy.get_shop(9)["shop_id"])
+
+    def test_faults_and_rate_limits(self):
+        self.mock.throttle_rate = 0.3
+        self.mock.error_rate = 0.2
+        self.mock.retry_after = 0
+        retry_policy = RetryPolicy(max_retries=20, backoff_base=0.0001)
+        etsy = client(retry_policy=retry_policy)
+        install(etsy, self.mock)
+        for _ in range(20):
+            etsy.get_shop(9)
+        self.assertGreater(retry_policy.stats.retries, 0)
+
+        self.mock.throttle_rate = self.mock.error_rate = 0
+        self.mock.per_second = 3
+        self.mock.clock = lambda: 1000.0
+        limiter = RateLimiter(per_second=1000, per_day=100000)
+        etsy = client(rate_limiter=limiter, retry_policy=RetryPolicy(max_retries=0))
+        install(etsy, self.mock)
+        etsy.get_shop(9)
+        etsy.get_shop(9)
+        self.assertEqual(3, limiter.per_second)
+        etsy.get_shop(9)
+        with self.assertRaises(TooManyRequests):
+            etsy.get_shop(9)
+
+
+class _MemoryStore:
+    def __init__(self):
+        self.checkpoints = {}
+
+    def load(self, key):
+        return self.checkpoints.get(key)
+
+    def save(self, key, checkpoint):
+        self.checkpoints[key] = checkpoint
+
+
+class TestMockEtsyServer(unittest.TestCase):
+    def test_over_loopback(self):
+        mock = MockEtsy(latency=0.01)
+        mock.add_shop(9)
+        listing = mock.add_listing(9, sku="MUG")
+        with MockEtsyServer(mock) as server:
+            etsy = client()
+            server.install(etsy)
+            self.assertEqual(
+                "MUG",
+                etsy.get_listing_inventory(listing["listing_id"])["products"][0]["sku"],
+            )
+
+            async def fetch():
+                async with client(AsyncEtsyAPI) as etsy:
+                    server.install(etsy)
+                    return await asyncio.gather(*[etsy.get_shop(9) for _ in range(5)])
+
+            self.assertEqual([9] * 5, [s["shop_id"] for s in asyncio.run(fetch())])
+        self.assertEqual(6, sum(mock.calls.values()))
+
+    def test_async_in_process(self):
+        mock = MockEtsy()
+        mock.add_shop(9)
+
+        async def fetch():
+            async with client(AsyncEtsyAPI) as etsy:
+                install(etsy, mock)
+                return await etsy.get_shop(9)
+
+        self.assertEqual(9, asyncio.run(fetch())["shop_id"])
+
+    def test_install_closes_replaced_client(self):
+        etsy = client(AsyncEtsyAPI)
+        replaced = etsy.session
+        install(etsy, MockEtsy())
+        self.assertTrue(replaced.is_closed)
+
+        async def reinstall():
+            async with client(AsyncEtsyAPI) as etsy:
+                replaced = etsy.session
+                install(etsy, MockEtsy())
+                await asyncio.sleep(0)
+                return replaced
+
+        self.assertTrue(asyncio.run(reinstall()).is_closed)
@@ -0,0 +1,92 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from requests.models import RequestEncodingMixin
+
+from etsyv3 import EtsyAPI
+from etsyv3.models.file_request import (
+    UploadListingFileRequest,
+    UploadListingImageRequest,
+)
+from etsyv3.util.multipart import MultipartStream
+from tests.mock_helpers import MockResponse
+
+BOUNDARY = "0123456789abcdef"
+
+
+def requests_body(files, data):
+    with mock.patch("urllib3.filepost.choose_boundary", return_value=BOUNDARY):
+        body, content_type = RequestEncodingMixin._encode_files(files, data)
+    return body, content_type
+
+
+class TestMultipartStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "mug.jpg")
+        self.contents = os.urandom(200 * 1024 + 7)
+        with open(self.path, "wb") as f:
+            f.write(self.contents)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_body_as_requests(self):
+        data = {"rank": 1, "overwrite": True, "alt_text": None, "name": "é"}
+        for files in (
+            {"image": self.contents},
+            {"file": ("mug.jpg", self.contents, "multipart/form-data")},
+            {"file": (None, self.contents, "multipart/form-data")},
+        ):
+            stream = MultipartStream(data, files, boundary=BOUNDARY)
+            body, content_type = requests_body(files, data)
+            self.assertEqual(body, b"".join(stream))
+            self.assertEqual(len(body), len(stream))
+            self.assertEqual(content_type, stream.content_type)
+
+    def test_path_is_streamed_in_chunks(self):
+        stream = MultipartStream({}, {"image": self.path}, chunk_size=1024)
+        chunks = list(stream)
+        self.assertLessEqual(max(len(c) for c in chunks), 1024)
+        with open(self.path, "rb") as f:
+            expected, _ = requests_body({"image": f}, {})
+        stream = MultipartStream({}, {"image": self.path}, boundary=BOUNDARY)
+        self.assertEqual(expected, b"".join(stream))
+        self.assertEqual(len(expected), len(stream))
+
+    def test_file_object_from_current_position_and_repeatable(self):
+        f = io.BytesIO(b"skip" + self.contents)
+        f.seek(4)
+        stream = MultipartStream({}, {"video": f}, boundary=BOUNDARY)
+        first = b"".join(stream)
+        self.assertEqual(first, b"".join(stream))
+        self.assertEqual(len(first), len(stream))
+        self.assertIn(self.contents, first)
+        self.assertNotIn(b"skip", first)
+
+    def test_async_iteration(self):
+        async def read(stream):
+            return b"".join([chunk async for chunk in stream])
+
+        stream = MultipartStream({"rank": 1}, {"image": self.path})
+        self.assertEqual(b"".join(stream), asyncio.run(read(stream)))
+
+    @mock.patch("requests.Session.post", return_value=MockResponse({}, 201))
+    def test_upload_from_path(self, mock_post):
+        etsy = EtsyAPI("", "", "1.token", "", datetime.now() + timedelta(hours=1))
+        etsy.upload_listing_image(1, 2, UploadListingImageRequest(self.path, rank=1))
+        kwargs = mock_post.call_args[1]
+        self.assertIsInstance(kwargs["data"], MultipartStream)
+        self.assertEqual(str(len(kwargs["data"])), kwargs["headers"]["Content-Length"])
+        self.assertIn(b'filename="mug.jpg"', b"".join(kwargs["data"]))
+
+    def test_file_request_accepts_file_object(self):
+        with open(self.path, "rb") as f:
+            request = UploadListingFileRequest(f, name="mug.jpg")
+            body = b"".join(request.multipart())
+        self.assertIn(self.contents, body)
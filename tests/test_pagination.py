@@ -0,0 +1,150 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from etsyv3 import AsyncEtsyAPI, EtsyAPI
+from etsyv3.util.pagination import (
+    apaginate,
+    apaginate_parallel,
+    chunk_ids,
+    merge_pages,
+    paginate,
+    paginate_parallel,
+)
+from tests.mock_helpers import MockResponse
+
+EXPIRY_FUTURE = datetime.utcnow() + timedelta(hours=1)
+TOTAL = 25
+
+
+def fetch_page(limit, offset):
+    results = [{"id": i} for i in range(offset, min(offset + limit, TOTAL))]
+    return {"count": TOTAL, "results": results}
+
+
+async def async_fetch_page(limit, offset):
+    return fetch_page(limit, offset)
+
+
+def mocked_paged_get(uri, *args, **kwargs):
+    query = parse_qs(urlparse(uri).query)
+    page = fetch_page(int(query["limit"][0]), int(query.get("offset", ["0"])[0]))
+    return MockResponse(page, 200)
+
+
+async def mocked_async_paged_get(uri, *args, **kwargs):
+    return mocked_paged_get(uri, *args, **kwargs)
+
+
+def mocked_ids_get(uri, *args, **kwargs):
+    query = parse_qs(urlparse(uri).query)
+    ids = [int(x) for x in query["payment_ids"][0].split(",")]
+    results = [{"payment_id": x} for x in ids]
+    return MockResponse({"count": len(results), "results": results}, 200)
+
+
+async def mocked_async_ids_get(uri, *args, **kwargs):
+    return mocked_ids_get(uri, *args, **kwargs)
+
+
+class TestChunking(unittest.TestCase):
+    def test_chunk_ids(self):
+        self.assertEqual(["1,2", "3"], chunk_ids([1, 2, 3], chunk_size=2))
+        self.assertEqual([None], chunk_ids(None))
+        self.assertEqual([""], chunk_ids([]))
+
+    def test_merge_pages(self):
+        merged = merge_pages(
+            [{"count": 1, "results": [1]}, {"count": 2, "results": [2, 3]}]
+        )
+        self.assertEqual({"count": 3, "results": [1, 2, 3]}, merged)
+
+    @mock.patch("requests.Session.get", side_effect=mocked_ids_get)
+    def test_get_payments_is_chunked(self, mock_get):
+        etsy = EtsyAPI("", "", "", "", EXPIRY_FUTURE)
+        response = etsy.get_payments(1, list(range(250)))
+        self.assertEqual(3, mock_get.call_count)
+        self.assertEqual(250, response["count"])
+        self.assertEqual(
+            list(range(250)), [x["payment_id"] for x in response["results"]]
+        )
+
+
+class TestPaginate(unittest.TestCase):
+    def test_paginate_yields_every_record_in_order(self):
+        records = list(paginate(fetch_page, limit=10))
+        self.assertEqual(list(range(TOTAL)), [r["id"] for r in records])
+
+    def test_paginate_stops_on_empty_page(self):
+        def short_fetch(limit, offset):
+            page = fetch_page(limit, offset)
+            page["count"] = 1000
+            return page
+
+        self.assertEqual(TOTAL, len(list(paginate(short_fetch, limit=10))))
+
+    def test_paginate_is_lazy(self):
+        fetch = mock.Mock(side_effect=fetch_page)
+        records = paginate(fetch, limit=10)
+        next(records)
+        # the current page and the prefetched next page, but no more
+        self.assertLessEqual(fetch.call_count, 2)
+        records.close()
+
+    def test_paginate_parallel_keeps_order(self):
+        records = list(paginate_parallel(fetch_page, limit=3, concurrency=4))
+        self.assertEqual(list(range(TOTAL)), [r["id"] for r in records])
+
+    def test_paginate_parallel_completion_order(self):
+        records = paginate_parallel(fetch_page, limit=3, concurrency=4, ordered=False)
+        self.assertEqual(list(range(TOTAL)), sorted(r["id"] for r in records))
+
+    def test_paginate_parallel_bounds_concurrency(self):
+        fetch = mock.Mock(side_effect=fetch_page)
+        records = paginate_parallel(fetch, limit=1, concurrency=2)
+        next(records)
+        # the first page, then no more than `concurrency` pages ahead
+        self.assertLessEqual(fetch.call_count, 3)
+        records.close()
+
+    @mock.patch("requests.Session.get", side_effect=mocked_paged_get)
+    def test_iter_listings_by_shop_concurrently(self, mock_get):
+        etsy = EtsyAPI("", "", "", "", EXPIRY_FUTURE)
+        records = list(etsy.iter_listings_by_shop(1, limit=5, concurrency=3))
+        self.assertEqual(list(range(TOTAL)), [r["id"] for r in records])
+
+    @mock.patch("requests.Session.get", side_effect=mocked_paged_get)
+    def test_iter_listings_by_shop(self, mock_get):
+        etsy = EtsyAPI("", "", "", "", EXPIRY_FUTURE)
+        records = list(etsy.iter_listings_by_shop(1, limit=10))
+        self.assertEqual(TOTAL, len(records))
+        self.assertEqual(3, mock_get.call_count)
+
+
+class TestAsyncPaginate(unittest.IsolatedAsyncioTestCase):
+    async def test_apaginate_yields_every_record_in_order(self):
+        records = [r async for r in apaginate(async_fetch_page, limit=10)]
+        self.assertEqual(list(range(TOTAL)), [r["id"] for r in records])
+
+    async def test_apaginate_parallel(self):
+        ordered = [r["id"] async for r in apaginate_parallel(async_fetch_page, limit=3)]
+        self.assertEqual(list(range(TOTAL)), ordered)
+        unordered = [
+            r["id"]
+            async for r in apaginate_parallel(async_fetch_page, limit=3, ordered=False)
+        ]
+        self.assertEqual(list(range(TOTAL)), sorted(unordered))
+
+    @mock.patch("httpx.AsyncClient.get", side_effect=mocked_async_ids_get)
+    async def test_get_payments_is_chunked(self, mock_get):
+        async with AsyncEtsyAPI("", "", "", "", EXPIRY_FUTURE) as etsy:
+            response = await etsy.get_payments(1, list(range(150)))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(150, response["count"])
+
+    @mock.patch("httpx.AsyncClient.get", side_effect=mocked_async_paged_get)
+    async def test_iter_shop_receipts(self, mock_get):
+        async with AsyncEtsyAPI("", "", "", "", EXPIRY_FUTURE) as etsy:
+            records = [r async for r in etsy.iter_shop_receipts(1, limit=10)]
+        self.assertEqual(TOTAL, len(records))
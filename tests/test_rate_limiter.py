@@ -0,0 +1,47 @@
+import unittest
+
+from etsyv3.util import RateLimiter
+from tests.mock_helpers import FakeClock
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_up_to_per_second(self):
+        limiter = RateLimiter(per_second=5, per_day=1000, clock=FakeClock())
+        waits = [limiter.reserve() for _ in range(5)]
+        self.assertEqual([0.0] * 5, waits)
+        self.assertAlmostEqual(0.2, limiter.reserve())
+        self.assertAlmostEqual(0.4, limiter.reserve())
+
+    def test_tokens_refill_over_time(self):
+        clock = FakeClock()
+        limiter = RateLimiter(per_second=5, per_day=1000, clock=clock)
+        for _ in range(5):
+            limiter.reserve()
+        clock.now += 1
+        self.assertEqual(0.0, limiter.reserve())
+
+    def test_per_day_budget(self):
+        limiter = RateLimiter(per_second=100, per_day=2, clock=FakeClock())
+        limiter.reserve()
+        limiter.reserve()
+        self.assertAlmostEqual(86400 / 2, limiter.reserve())
+
+    def test_update_from_headers(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.update_from_headers(
+            {
+                "x-limit-per-second": "4",
+                "x-remaining-this-second": "0",
+                "x-limit-per-day": "5000",
+                "x-remaining-today": "4000",
+            }
+        )
+        self.assertEqual(4, limiter.per_second)
+        self.assertEqual(5000, limiter.per_day)
+        self.assertAlmostEqual(0.25, limiter.reserve())
+
+    def test_retry_after_blocks(self):
+        limiter = RateLimiter(clock=FakeClock())
+        limiter.update_from_headers({"retry-after": "3"})
+        self.assertAlmostEqual(3, limiter.reserve())
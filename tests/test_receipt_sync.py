@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from etsyv3 import EtsyAPI
+from etsyv3.util.receipt_sync import (
+    Checkpoint,
+    CheckpointStore,
+    FileCheckpointStore,
+    ReceiptSync,
+    SQLiteCheckpointStore,
+)
+from tests.mock_helpers import MockResponse
+
+NOW = 1_700_000_000
+
+
+class FakeReceipts:
+    # serves get_shop_receipts from a dict of receipt_id -> updated_timestamp
+    def __init__(self, receipts):
+        self.receipts = receipts
+        self.uris = []
+
+    def __call__(self, uri, **kwargs):
+        self.uris.append(uri)
+        query = {k: v[0] for k, v in parse_qs(urlsplit(uri).query).items()}
+        self.query = query
+        matching = sorted(
+            (
+                {"receipt_id": r, "updated_timestamp": t}
+                for r, t in self.receipts.items()
+                if t >= int(query["min_last_modified"])
+            ),
+            key=lambda r: (r["updated_timestamp"], r["receipt_id"]),
+        )
+        offset = int(query.get("offset", 0))
+        page = matching[offset : offset + int(query["limit"])]
+        return MockResponse({"count": len(matching), "results": page}, 200)
+
+
+class MemoryStore(CheckpointStore):
+    def __init__(self):
+        self.checkpoints = {}
+
+    def load(self, key):
+        return self.checkpoints.get(key)
+
+    def save(self, key, checkpoint):
+        self.checkpoints[key] = checkpoint
+
+
+class TestReceiptSync(unittest.TestCase):
+    def setUp(self):
+        self.etsy = EtsyAPI("", "", "1.token", "", datetime.now() + timedelta(hours=1))
+        self.store = MemoryStore()
+        self.delivered = []
+
+    def sync(self, receipts, page_size=100, sink=None):
+        fake = FakeReceipts(receipts)
+        sync = ReceiptSync(
+            self.etsy,
+            9,
+            self.store,
+            sink or self.delivered.append,
+            overlap=60,
+            initial_lookback=3600,
+            page_size=page_size,
+            clock=lambda: NOW,
+        )
+        with mock.patch("requests.Session.get", side_effect=fake):
+            result = sync.run()
+        return result, fake
+
+    def ids(self):
+        return [r["receipt_id"] for batch in self.delivered for r in batch]
+
+    def test_incremental(self):
+        receipts = {1: NOW - 7200, 2: NOW - 600, 3: NOW - 30, 4: NOW - 10}
+        result, fake = self.sync(receipts)
+        self.assertEqual([2, 3, 4], self.ids())
+        self.assertEqual(str(NOW - 3600 - 60), fake.query["min_last_modified"])
+        self.assertEqual("updated", fake.query["sort_on"])
+        self.assertNotIn("was_paid", fake.query)
+        self.assertEqual(Checkpoint(NOW - 10, {3: NOW - 30, 4: NOW - 10}), result[3])
+
+        # nothing has changed, so the overlap's receipts aren't sent again
+        self.delivered.clear()
+        result, fake = self.sync(receipts)
+        self.assertEqual([], self.ids())
+        self.assertEqual((0, 2, 1), result[:3])
+        self.assertEqual(str(NOW - 70), fake.query["min_last_modified"])
+
+        receipts.update({3: NOW + 5, 5: NOW - 20})
+        self.delivered.clear()
+        result, _ = self.sync(receipts)
+        self.assertEqual([5, 3], self.ids())
+        self.assertEqual(NOW + 5, result.checkpoint.watermark)
+
+    def test_pages_follow_last_modified(self):
+        receipts = {i: NOW - 100 + i // 5 for i in range(1, 23)}
+        result, fake = self.sync(receipts, page_size=4)
+        self.assertEqual(sorted(receipts), sorted(self.ids()))
+        self.assertEqual(len(receipts), len(set(self.ids())))
+        self.assertTrue(any("offset=4" in uri for uri in fake.uris))
+        self.assertEqual(NOW - 96, result.checkpoint.watermark)
+
+    def test_checkpoint_only_advances_when_sink_returns(self):
+        receipts = {1: NOW - 50, 2: NOW - 40, 3: NOW - 30}
+
+        def failing_sink(batch):
+            if any(r["receipt_id"] == 3 for r in batch):
+                raise IOError("warehouse is down")
+            self.delivered.append(batch)
+
+        with self.assertRaises(IOError):
+            self.sync(receipts, page_size=2, sink=failing_sink)
+        self.assertEqual([1, 2], self.ids())
+        self.assertEqual(NOW - 40, self.store.load("receipts-9").watermark)
+
+        self.delivered.clear()
+        self.sync(receipts, page_size=2)
+        self.assertEqual([3], self.ids())
+
+
+class TestCheckpointStores(unittest.TestCase):
+    def test_round_trip(self):
+        checkpoint = Checkpoint(NOW, {1: NOW, 2: NOW - 1})
+        with tempfile.TemporaryDirectory() as tmp:
+            for store in (
+                FileCheckpointStore(tmp),
+                SQLiteCheckpointStore(os.path.join(tmp, "checkpoints.sqlite3")),
+            ):
+                self.assertIsNone(store.load("receipts-9"))
+                store.save("receipts-9", checkpoint)
+                self.assertEqual(checkpoint, store.load("receipts-9"))
+
+    def test_incomplete_store_cannot_be_created(self):
+        class NoSave(CheckpointStore):
+            def load(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            NoSave()
@@ -0,0 +1,103 @@
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from etsyv3 import etsy_api
+from etsyv3.enums import ListingState, WhoMade
+from etsyv3.models import LedgerEntry, Listing, ListingInventory, Receipt
+
+PRICE = {"amount": 1250, "divisor": 100, "currency_code": "GBP"}
+
+LISTING = {
+    "listing_id": 1,
+    "title": "Mug",
+    "state": "active",
+    "who_made": "i_did",
+    "when_made": "a_new_decade",
+    "created_timestamp": 946684800,
+    "price": PRICE,
+    "images": [
+        {"listing_image_id": 10, "rank": 1, "created_timestamp": 946684800},
+        {"listing_image_id": 11, "rank": 2, "created_timestamp": 946684800},
+    ],
+    "inventory": {
+        "products": [
+            {
+                "sku": "MUG-1",
+                "offerings": [{"quantity": 3, "is_enabled": True, "price": PRICE}],
+                "property_values": [{"property_id": 513, "values": ["Blue"]}],
+            }
+        ],
+        "price_on_property": [513],
+    },
+}
+
+
+class TestResponseViews(unittest.TestCase):
+    def test_listing_fields(self):
+        listing = Listing(LISTING)
+        self.assertEqual(1, listing.listing_id)
+        self.assertEqual("Mug", listing.title)
+        self.assertIs(ListingState.ACTIVE, listing.state)
+        self.assertIs(etsy_api.ListingState.ACTIVE, listing.state)
+        self.assertIs(WhoMade.I_DID, listing.who_made)
+        # not a WhenMade Etsy has told us about, so left alone
+        self.assertEqual("a_new_decade", listing.when_made)
+        self.assertEqual(
+            datetime(2000, 1, 1, tzinfo=timezone.utc), listing.created_timestamp
+        )
+        self.assertEqual(Decimal("12.50"), listing.price.value)
+        self.assertEqual("GBP", listing.price.currency_code)
+        self.assertIsNone(listing.shop_section_id)
+        self.assertEqual("Mug", listing["title"])
+        self.assertIs(LISTING, listing.to_dict())
+
+    def test_nested_views_are_lazy_and_cached(self):
+        listing = Listing(LISTING)
+        images = listing.images
+        self.assertEqual(2, len(images))
+        self.assertEqual([None, None], images._views)
+        self.assertEqual(11, images[1].listing_image_id)
+        self.assertIsNone(images._views[0])
+        self.assertIs(images[1], images[1])
+        self.assertIs(images, listing.images)
+        self.assertIs(listing.created_timestamp, listing.created_timestamp)
+        self.assertEqual([10, 11], [i.listing_image_id for i in images])
+
+    def test_inventory(self):
+        inventory = Listing(LISTING).inventory
+        self.assertIsInstance(inventory, ListingInventory)
+        product = inventory.products[0]
+        self.assertEqual("MUG-1", product.sku)
+        self.assertEqual(3, product.offerings[0].quantity)
+        self.assertEqual(Decimal("12.5"), product.offerings[0].price.value)
+        self.assertEqual(["Blue"], product.property_values[0].values)
+        self.assertEqual([513], inventory.price_on_property)
+
+    def test_receipts_from_results(self):
+        response = {
+            "count": 1,
+            "results": [
+                {
+                    "receipt_id": 5,
+                    "grandtotal": PRICE,
+                    "transactions": [{"transaction_id": 6, "listing_id": 1}],
+                    "shipments": [{"shipment_notification_timestamp": 0}],
+                }
+            ],
+        }
+        receipts = Receipt.from_results(response)
+        self.assertEqual(1, len(receipts))
+        receipt = receipts[0]
+        self.assertEqual(5, receipt.receipt_id)
+        self.assertEqual(6, receipt.transactions[0].transaction_id)
+        self.assertEqual(
+            datetime(1970, 1, 1, tzinfo=timezone.utc),
+            receipt.shipments[0].shipment_notification_timestamp,
+        )
+        self.assertEqual(Decimal("12.5"), receipt.grandtotal.value)
+
+    def test_ledger_entry(self):
+        entry = LedgerEntry({"entry_id": 1, "amount": -30, "create_date": 946684800})
+        self.assertEqual(-30, entry.amount)
+        self.assertEqual(2000, entry.create_date.year)
@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import requests
+
+from etsyv3 import EtsyAPI
+from etsyv3.etsy_api import InternalError, ServiceUnavailable, TooManyRequests
+from etsyv3.util import RetryPolicy
+from etsyv3.util.retry import parse_retry_after
+from tests.mock_helpers import MockResponse
+
+EXPIRY_FUTURE = datetime.utcnow() + timedelta(hours=1)
+
+
+def get_api(retry_policy):
+    return EtsyAPI("", "", "", "", EXPIRY_FUTURE, retry_policy=retry_policy)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff_is_capped(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=4)
+        for attempt in range(10):
+            self.assertLessEqual(policy.backoff(attempt), 4)
+
+    def test_backoff_honours_retry_after(self):
+        policy = RetryPolicy(backoff_base=0.01)
+        self.assertGreaterEqual(policy.backoff(0, "10"), 10)
+
+    def test_non_idempotent_method_not_retried(self):
+        policy = RetryPolicy()
+        self.assertIsNone(policy.next_delay("POST", 0, policy.clock(), 503))
+
+    def test_non_retryable_status_not_retried(self):
+        policy = RetryPolicy()
+        self.assertIsNone(policy.next_delay("GET", 0, policy.clock(), 404))
+
+    def test_max_retries(self):
+        policy = RetryPolicy(max_retries=2)
+        self.assertIsNotNone(policy.next_delay("GET", 1, policy.clock(), 503))
+        self.assertIsNone(policy.next_delay("GET", 2, policy.clock(), 503))
+
+    def test_max_total_time(self):
+        policy = RetryPolicy(max_total_time=5)
+        self.assertIsNone(policy.next_delay("GET", 0, policy.clock(), 429, "30"))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(3, parse_retry_after("3"))
+        self.assertEqual(0, parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestEtsyAPIRetries(unittest.TestCase):
+    @mock.patch(
+        "requests.Session.get",
+        side_effect=[
+            MockResponse({"error": "oops"}, 500),
+            MockResponse(None, 503),
+            MockResponse({"ping": "ok"}, 200),
+        ],
+    )
+    def test_retries_until_success(self, mock_get):
+        policy = RetryPolicy(backoff_base=0)
+        self.assertEqual({"ping": "ok"}, get_api(policy).ping())
+        self.assertEqual(3, mock_get.call_count)
+        self.assertEqual(2, policy.stats.retries)
+        self.assertEqual({2: 1}, policy.stats.retries_per_call)
+
+    @mock.patch(
+        "requests.Session.get",
+        side_effect=[
+            requests.ConnectionError("Connection reset by peer"),
+            MockResponse({"ping": "ok"}, 200),
+        ],
+    )
+    def test_retries_connection_reset(self, mock_get):
+        policy = RetryPolicy(backoff_base=0)
+        self.assertEqual({"ping": "ok"}, get_api(policy).ping())
+        self.assertEqual(1, policy.stats.retried_calls)
+
+    @mock.patch(
+        "requests.Session.get", return_value=MockResponse({"error": "oops"}, 500)
+    )
+    def test_gives_up_after_max_retries(self, mock_get):
+        policy = RetryPolicy(max_retries=2, backoff_base=0)
+        with self.assertRaises(InternalError):
+            get_api(policy).ping()
+        self.assertEqual(3, mock_get.call_count)
+
+    @mock.patch(
+        "requests.Session.get",
+        return_value=MockResponse(None, 429, {"retry-after": "0"}, content=b""),
+    )
+    def test_empty_too_many_requests(self, mock_get):
+        policy = RetryPolicy(max_retries=1, backoff_base=0)
+        with self.assertRaises(TooManyRequests) as raised:
+            get_api(policy).ping()
+        self.assertEqual({}, raised.exception.args[0])
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch(
+        "requests.Session.get",
+        return_value=MockResponse(None, 503, content=b"<html>Bad gateway</html>"),
+    )
+    def test_html_service_unavailable(self, mock_get):
+        with self.assertRaises(ServiceUnavailable) as raised:
+            get_api(RetryPolicy(max_retries=0)).ping()
+        self.assertEqual("<html>Bad gateway</html>", raised.exception.args[0])
@@ -0,0 +1,99 @@
+import unittest
+from collections import OrderedDict
+from enum import IntEnum
+
+from etsyv3.enums import ItemWeightUnit, ListingType, WhenMade, WhoMade
+from etsyv3.models import UpdateListingRequest
+from etsyv3.models.listing_request import (
+    CreateDraftListingRequest,
+    UpdateListingInventoryRequest,
+)
+from etsyv3.models.product import Product
+from etsyv3.models.shop_request import UpdateShopRequest
+from etsyv3.util import todict
+from etsyv3.util.serializer import serialize_value
+
+
+class Rank(IntEnum):
+    NONE = 0
+    FIRST = 1
+
+
+class Title(str):
+    pass
+
+
+class ExtendedListingRequest(UpdateListingRequest):
+    # without __slots__ of its own, so it can have any attribute
+    pass
+
+
+def reflective(request):
+    return todict(request, nullable=request.get_nulled())
+
+
+def products(n):
+    return [
+        Product(
+            f"SKU-{i}",
+            [{"property_id": 513, "value_ids": [i], "values": [str(i)]}],
+            [{"price": 10.0 + i, "quantity": i % 3, "is_enabled": bool(i % 2)}],
+        )
+        for i in range(n)
+    ]
+
+
+class TestSerializer(unittest.TestCase):
+    def test_create_draft_listing(self):
+        request = CreateDraftListingRequest(
+            quantity=1,
+            title="Mug",
+            description="",
+            price=10.5,
+            who_made=WhoMade.I_DID,
+            when_made=WhenMade.MADE_TO_ORDER,
+            taxonomy_id=1,
+            materials=[],
+            processing_min=0,
+            tags=["a", "b"],
+            item_weight_unit=ItemWeightUnit.G,
+            is_supply=False,
+            is_taxable=True,
+            listing_type=ListingType.PHYSICAL,
+        )
+        self.assertEqual(reflective(request), request.get_dict())
+        self.assertEqual(list(reflective(request)), list(request.get_dict()))
+
+    def test_update_listing(self):
+        request = UpdateListingRequest(
+            title="",
+            shop_section_id=0,
+            tags=[],
+            featured_rank=-1,
+            is_personalizable=False,
+            production_partner_ids=[1, 2],
+            listing_type=ListingType.DOWNLOAD,
+        )
+        self.assertEqual(reflective(request), request.get_dict())
+
+    def test_update_listing_inventory(self):
+        request = UpdateListingInventoryRequest(products(50), [513], [], [513])
+        self.assertEqual(reflective(request), request.get_dict())
+
+    def test_update_shop(self):
+        request = UpdateShopRequest(title="Shop", announcement="")
+        self.assertEqual(reflective(request), request.get_dict())
+
+    def test_unusual_values(self):
+        request = ExtendedListingRequest(title=Title("Mug"))
+        request.extra = OrderedDict(a=(1, Rank.FIRST), b=ListingType.BOTH)
+        request.rank = Rank.NONE
+        request.data = b"ab"
+        request.callback = lambda: None
+        request._private = 1
+        request.product = Product("", [], [{"quantity": 0}])
+        self.assertEqual(reflective(request), request.get_dict())
+
+    def test_serialize_value(self):
+        value = [{"unit": ItemWeightUnit.KG, "products": products(2)}]
+        self.assertEqual(todict(value), serialize_value(value))
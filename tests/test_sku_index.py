@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from etsyv3 import EtsyAPI
+from etsyv3.enums import ListingState
+from etsyv3.util.sku_index import SkuIndex
+from tests.mock_helpers import MockResponse
+
+
+def listing(listing_id, *skus):
+    products = [
+        {
+            "product_id": listing_id * 10 + i,
+            "sku": sku,
+            "is_deleted": False,
+            "offerings": [{"offering_id": listing_id * 100 + i, "is_deleted": False}],
+            "property_values": [{"property_id": 200, "values": [sku.lower()]}],
+        }
+        for i, sku in enumerate(skus)
+    ]
+    return {"listing_id": listing_id, "inventory": {"products": products}}
+
+
+def page(*listings):
+    return MockResponse({"count": len(listings), "results": list(listings)}, 200)
+
+
+def shop_listings(uri, **kwargs):
+    if "state=active" in uri:
+        return page(listing(1, "MUG-B", "MUG-R"), listing(2, ""))
+    if "state=sold_out" in uri:
+        return page(listing(3, "BOWL"))
+    return page()
+
+
+class TestSkuIndex(unittest.TestCase):
+    def setUp(self):
+        self.etsy = EtsyAPI("", "", "1.token", "", datetime.now() + timedelta(hours=1))
+
+    @mock.patch("requests.Session.get", side_effect=shop_listings)
+    def test_from_shop(self, mock_get):
+        index = SkuIndex.from_shop(self.etsy, 9)
+        self.assertEqual(5, mock_get.call_count)
+        self.assertIn("includes=Inventory", mock_get.call_args[0][0])
+        self.assertEqual(3, len(index))
+        entry = index["MUG-R"]
+        self.assertEqual((1, 11, 101), entry[1:4])
+        self.assertEqual([{"property_id": 200, "values": ["mug-r"]}], entry[4])
+        self.assertEqual(3, index.get("BOWL").listing_id)
+        self.assertIsNone(index.get("PLATE"))
+        self.assertNotIn("", index)
+        self.assertEqual(["MUG-B", "MUG-R"], index.skus(1))
+
+    def test_update_and_remove_listing(self):
+        index = SkuIndex()
+        index.update_listing(1, listing(1, "MUG-B", "MUG-R")["inventory"])
+        index.update_listing(1, listing(1, "MUG-G")["inventory"])
+        self.assertEqual(["MUG-G"], index.skus(1))
+        self.assertNotIn("MUG-B", index)
+        index.update_listing(2, listing(2, "MUG-G")["inventory"])
+        self.assertEqual([1, 2], [e.listing_id for e in index.find("MUG-G")])
+        index.remove_listing(1)
+        self.assertEqual(2, index["MUG-G"].listing_id)
+        with self.assertRaises(KeyError):
+            index["MUG-B"]
+
+    def test_refresh(self):
+        index = SkuIndex()
+        index.update_listing(1, listing(1, "MUG-B")["inventory"])
+        index.update_listing(2, listing(2, "BOWL")["inventory"])
+        index.update_listing(3, listing(3, "PLATE")["inventory"])
+        with mock.patch(
+            "requests.Session.get", return_value=page(listing(1, "MUG-R"))
+        ) as mock_get:
+            index.refresh_listings(self.etsy, [1, 2])
+        self.assertIn("listing_ids=1,2", mock_get.call_args[0][0])
+        self.assertEqual(["MUG-R", "PLATE"], sorted(index.skus(1) + index.skus(3)))
+        self.assertEqual([], index.skus(2))
+        with mock.patch(
+            "requests.Session.get",
+            return_value=MockResponse({"error": "Not found"}, 404),
+        ):
+            index.refresh_listing(self.etsy, 3)
+        self.assertEqual(1, len(index))
+
+    def test_null_inventory(self):
+        unlisted = {"listing_id": 2, "inventory": None}
+        bare = {"listing_id": 3, "inventory": {"products": None}}
+        with mock.patch(
+            "requests.Session.get",
+            return_value=page(listing(1, "MUG-B"), unlisted, bare),
+        ):
+            index = SkuIndex.from_shop(self.etsy, 9, states=[ListingState.ACTIVE])
+            index.refresh_listings(self.etsy, [1, 2, 3])
+        self.assertEqual(1, len(index))
+        self.assertEqual(1, index["MUG-B"].listing_id)
+
+    def test_persists(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "skus.sqlite3")
+            index = SkuIndex(path)
+            index.update_listing(1, listing(1, "MUG-B")["inventory"])
+            index.close()
+            index = SkuIndex(path)
+            self.assertEqual(1, index["MUG-B"].listing_id)
+            index.close()
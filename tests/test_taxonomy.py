@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+from etsyv3.util.taxonomy import TaxonomyIndex
+
+
+def node(taxonomy_id, name, children=None):
+    return {"id": taxonomy_id, "name": name, "children": children or []}
+
+
+RESPONSE = {
+    "count": 2,
+    "results": [
+        node(
+            1,
+            "Accessories",
+            [
+                node(2, "Hats & Caps", [node(3, "Baseball & Trucker Caps")]),
+                node(4, "Hair Accessories"),
+            ],
+        ),
+        node(5, "Art & Collectibles", [node(6, "Collectibles")]),
+    ],
+}
+
+
+class TestTaxonomyIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TaxonomyIndex(RESPONSE)
+
+    def test_lookup_by_id(self):
+        self.assertEqual(6, len(self.index))
+        self.assertEqual("Hats & Caps", self.index.get(2)["name"])
+        self.assertIn(3, self.index)
+
+    def test_parent_and_ancestors(self):
+        self.assertEqual(2, self.index.parent(3)["id"])
+        self.assertIsNone(self.index.parent(1))
+        self.assertEqual([1, 2], [x["id"] for x in self.index.ancestors(3)])
+        self.assertEqual(
+            ["Accessories", "Hats & Caps", "Baseball & Trucker Caps"],
+            self.index.path(3),
+        )
+        self.assertTrue(self.index.is_descendant(3, 1))
+        self.assertFalse(self.index.is_descendant(3, 5))
+
+    def test_descendants(self):
+        self.assertEqual([2, 3, 4], [x["id"] for x in self.index.descendants(1)])
+
+    def test_name_search(self):
+        self.assertEqual([1], [x["id"] for x in self.index.find_by_name("accessories")])
+        self.assertEqual([1, 5], [x["id"] for x in self.index.search_prefix("a")])
+        self.assertEqual([3], [x["id"] for x in self.index.search("caps baseball")])
+        self.assertEqual([2, 3], [x["id"] for x in self.index.search("caps")])
+
+    def test_properties_are_fetched_once(self):
+        api = mock.Mock()
+        api.get_properties_by_taxonomy_id.return_value = {"count": 0, "results": []}
+        index = TaxonomyIndex(RESPONSE, api)
+        index.properties(3)
+        index.properties(3)
+        api.get_properties_by_taxonomy_id.assert_called_once_with(3)
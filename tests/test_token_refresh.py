@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+
+from etsyv3 import EtsyAPI
+from tests.mock_helpers import MockResponse
+
+REFRESHED = {"access_token": "new", "refresh_token": "rotated", "expires_in": 3600}
+
+
+class TestTokenRefresh(unittest.TestCase):
+    def get_api(self, expiry):
+        return EtsyAPI("", "", "1.token", "refresh", expiry)
+
+    @mock.patch("requests.Session.get", return_value=MockResponse({}, 200))
+    @mock.patch("requests.Session.post")
+    def test_concurrent_refresh_is_single_flight(self, mock_post, mock_get):
+        etsy = self.get_api(datetime.utcnow() - timedelta(hours=1))
+
+        def slow_refresh(*args, **kwargs):
+            # the session keeps the old token while the refresh is in flight
+            self.assertEqual("Bearer 1.token", etsy.session.headers["Authorization"])
+            time.sleep(0.05)
+            return MockResponse(REFRESHED, 200)
+
+        mock_post.side_effect = slow_refresh
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: etsy.ping(), range(8)))
+        mock_post.assert_called_once()
+        self.assertEqual({"Authorization": None}, mock_post.call_args[1]["headers"])
+        self.assertEqual("Bearer new", etsy.session.headers["Authorization"])
+        self.assertEqual(8, mock_get.call_count)
+
+    @mock.patch("requests.Session.get", return_value=MockResponse({}, 200))
+    @mock.patch("requests.Session.post")
+    def test_token_renewed_in_background_before_expiry(self, mock_post, mock_get):
+        refreshed = threading.Event()
+
+        def refresh(*args, **kwargs):
+            refreshed.set()
+            return MockResponse(REFRESHED, 200)
+
+        mock_post.side_effect = refresh
+        etsy = self.get_api(datetime.utcnow() + timedelta(minutes=1))
+        etsy.ping()
+        self.assertTrue(refreshed.wait(timeout=5))
+        etsy._background_refresh.join(timeout=5)
+        self.assertEqual("new", etsy.token)
+        mock_post.assert_called_once()
+
+    @mock.patch("requests.Session.get", return_value=MockResponse({}, 200))
+    @mock.patch("requests.Session.post")
+    def test_no_refresh_outside_margin(self, mock_post, mock_get):
+        etsy = self.get_api(datetime.utcnow() + timedelta(hours=1))
+        etsy.ping()
+        mock_post.assert_not_called()
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from etsyv3 import AsyncEtsyAPI, EtsyAPI
+from etsyv3.util import FileTokenStore, SQLiteTokenStore, Token, TokenStore
+from tests.mock_helpers import MockResponse
+
+REFRESHED = {"access_token": "1.new", "refresh_token": "rotated", "expires_in": 3600}
+
+
+class TokenStoreTests:
+    def get_store(self, directory):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = self.get_store(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_missing(self):
+        self.assertIsNone(self.store.load("1"))
+
+    def test_save_and_load(self):
+        expires_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        self.store.save("1", Token("1.token", "refresh", expires_at))
+        self.assertEqual(Token("1.token", "refresh", expires_at), self.store.load("1"))
+        self.assertIsNone(self.store.load("2"))
+
+    def test_lock_is_exclusive(self):
+        order = []
+        held = threading.Event()
+
+        def holder():
+            store = self.get_store(self.tmp.name)
+            with store.lock("1"):
+                held.set()
+                time.sleep(0.1)
+                order.append("holder")
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        held.wait(timeout=5)
+        with self.store.lock("1"):
+            order.append("waiter")
+        thread.join()
+        self.assertEqual(["holder", "waiter"], order)
+
+    @mock.patch("requests.Session.get", return_value=MockResponse({}, 200))
+    @mock.patch("requests.Session.post", return_value=MockResponse(REFRESHED, 200))
+    def test_workers_share_one_refresh(self, mock_post, mock_get):
+        # two clients holding the same expired token, as two worker
+        # processes would after starting from the same credentials
+        expired = datetime.utcnow() - timedelta(hours=1)
+        first = EtsyAPI("", "", "1.token", "refresh", expired, token_store=self.store)
+        second = EtsyAPI(
+            "",
+            "",
+            "1.token",
+            "refresh",
+            expired,
+            token_store=self.get_store(self.tmp.name),
+        )
+        first.ping()
+        second.ping()
+        mock_post.assert_called_once()
+        self.assertEqual("1.new", second.token)
+        self.assertEqual("rotated", second.refresh_token)
+        self.assertEqual(first.expiry, second.expiry)
+        self.assertEqual("Bearer 1.new", second.session.headers["Authorization"])
+
+    @mock.patch("requests.Session.post", return_value=MockResponse(REFRESHED, 200))
+    def test_explicit_refresh_uses_latest_refresh_token(self, mock_post):
+        expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        self.store.save("1", Token("1.other", "latest", expiry))
+        etsy = EtsyAPI(
+            "",
+            "",
+            "1.token",
+            "stale",
+            expiry - timedelta(minutes=30),
+            token_store=self.store,
+        )
+        etsy.refresh()
+        self.assertEqual("latest", mock_post.call_args[1]["json"]["refresh_token"])
+        self.assertEqual("rotated", self.store.load("1").refresh_token)
+
+    @mock.patch("httpx.AsyncClient.get")
+    @mock.patch("httpx.AsyncClient.send")
+    def test_async_clients_share_one_refresh(self, mock_send, mock_get):
+        # two AsyncEtsyAPI clients on one event loop, sharing a store
+        async def refresh(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return MockResponse(REFRESHED, 200)
+
+        async def get(*args, **kwargs):
+            return MockResponse({}, 200)
+
+        mock_send.side_effect = refresh
+        mock_get.side_effect = get
+        expired = datetime.utcnow() - timedelta(hours=1)
+
+        async def run():
+            clients = [
+                AsyncEtsyAPI(
+                    "", "", "1.token", "refresh", expired, token_store=self.store
+                )
+                for _ in range(2)
+            ]
+            await asyncio.wait_for(
+                asyncio.gather(*[client.ping() for client in clients]), 5
+            )
+            return clients
+
+        clients = asyncio.run(run())
+        mock_send.assert_called_once()
+        self.assertEqual(["1.new", "1.new"], [client.token for client in clients])
+        self.assertEqual("rotated", self.store.load("1").refresh_token)
+
+
+class TestFileTokenStore(TokenStoreTests, unittest.TestCase):
+    def get_store(self, directory):
+        return FileTokenStore(directory)
+
+
+class TestSQLiteTokenStore(TokenStoreTests, unittest.TestCase):
+    def get_store(self, directory):
+        return SQLiteTokenStore(os.path.join(directory, "tokens.db"))
+
+
+class TestTokenStore(unittest.TestCase):
+    def test_incomplete_store_cannot_be_created(self):
+        class NoLock(TokenStore):
+            def load(self, key):
+                return None
+
+            def save(self, key, token):
+                pass
+
+        with self.assertRaises(TypeError):
+            NoLock()